@@ -11,17 +11,40 @@
                                  -designs    DESIGN_FILENAME 
                                 [-regulation REG_FILENAME]
                                  -output     OUT_FILENAME
-"""
+                                [-stats      STATS_FILENAME (.json or .prom)]
+                                [-tight_layout]
 
-# Set the backend to use (important for headless servers)
-import matplotlib
-matplotlib.use('Agg')
+    To stream a large library, drawing NUM_DESIGNS designs on each page (of a
+    multipage PDF, or numbered files for other formats such as out_0001.png):
 
+    python plot_SBOL_designs.py  -params     PARAM_FILENAME 
+                                 -parts      PART_FILENAME 
+                                 -designs    DESIGN_FILENAME 
+                                [-regulation REG_FILENAME]
+                                 -output     OUT_FILENAME
+                                 -per_page   NUM_DESIGNS
+
+    To render each design to its own file using several processes (batch mode):
+
+    python plot_SBOL_designs.py  -params     PARAM_FILENAME 
+                                 -parts      PART_FILENAME 
+                                 -designs    DESIGN_FILENAME 
+                                [-regulation REG_FILENAME]
+                                 -batch      OUT_DIRECTORY
+                                [-processes  NUM_PROCESSES]
+                                [-format     pdf|png|svg]
+                                [-cache      CACHE_DIRECTORY]
+                                [-stats      STATS_FILENAME (.json or .prom)]
+"""
+
+# Figures are drawn without pyplot, so no backend is needed
 import sys
 import getopt
-import csv
 import dnaplotlib as dpl
-import matplotlib.pyplot as plt
+from dnaplotlib import batch
+from dnaplotlib import library
+from dnaplotlib.library import load_plot_parameters, load_part_information, \
+                                load_dna_designs, load_regulatory_information
 from argparse import ArgumentParser
 import os.path
 
@@ -30,141 +53,7 @@ __author__  = 'Thomas E. Gorochowski <tom@chofski.co.uk>, Voigt Lab, MIT\n\
 __license__ = 'MIT'
 __version__ = '1.0'
 
-def make_float_if_needed (s):
-	try:
-		float(s)
-		return float(s)
-	except ValueError:
-		return s
-
-def load_plot_parameters (filename):
-	plot_params = {}
-	param_reader = csv.reader(open(filename, 'r'), delimiter=',')
-	# Ignore header
-	header = next(param_reader)
-	# Process all parameters
-	for row in param_reader:
-		if len(row) >= 2:
-			if row[1] != '':
-				plot_params[row[0]] = make_float_if_needed(row[1])
-	return plot_params
-
-def load_part_information (filename):
-	part_info = {}
-	parts_reader = csv.reader(open(filename, 'r'), delimiter=',')
-	header = next(parts_reader)
-	header_map = {}
-	for i in range(len(header)):
-		header_map[header[i]] = i
-	attrib_keys = [k for k in list(header_map.keys()) if k not in ['part_name', 'type']]
-	for row in parts_reader:
-		# Make the attributes map
-		part_attribs_map = {}
-		for k in attrib_keys:
-			if row[header_map[k]] != '':
-				if k == 'color' or k == 'label_color':
-					part_attribs_map[k] = [float(x) for x in row[header_map[k]].split(';')]
-				else:
-					part_attribs_map[k] = make_float_if_needed(row[header_map[k]])
-		part_name = row[header_map['part_name']]
-		part_type = row[header_map['type']]
-		part_info[part_name] = [part_name, part_type, part_attribs_map]
-	return part_info
-
-def load_dna_designs (filename, part_info, reverse_char='r'):
-	dna_designs = {}
-	design_reader = csv.reader(open(filename, 'r'), delimiter=',')
-	# Ignore header
-	header = next(design_reader)
-	# Process all parameters
-	for row in design_reader:
-		if len(row[0]) != '':
-			part_list = []
-			for i in range(1,len(row)):
-				# Handle reverse parts
-				fwd = True
-				part_name = row[i]
-				if len(part_name) != 0:
-					if part_name[0] == reverse_char:
-						part_name = part_name[1:]
-						fwd = False
-					# Store the design
-					part_design = {}
-					cur_part_info = part_info[part_name]
-					part_design['type'] = cur_part_info[1]
-					part_design['name'] = part_name #needed to add part name for regulation
-					part_design['fwd']  = fwd       #needed to add fwd for regulation
-					if fwd == True:
-						part_design['start'] = i
-						part_design['end'] = i+1
-					else:
-						part_design['end'] = i
-						part_design['start'] = i+1
-					part_design['opts'] = cur_part_info[2]
-					part_list.append(part_design)
-			dna_designs[row[0]] = part_list
-	return dna_designs
-
-def load_regulatory_information (filename, part_info, dna_designs):
-	regs_info = {}
-	
-	reg_reader = csv.reader(open(filename, 'r'), delimiter=',')
-	# Ignore header
-	header = next(reg_reader)
-	header_map = {}
-	for i in range(len(header)):
-		header_map[header[i]] = i
-	attrib_keys = [k for k in list(header_map.keys()) if k not in ['from_partname', 'type', 'to_partname']]
-	
-	#reg_reader can only be read once?
-	rows = []
-	for row in reg_reader:
-		rows.append(row)
-
-	design_list = sorted(dna_designs.keys())
-	num_of_designs = len(design_list)
-
-	#outer loop: for each design
-	for i in range(num_of_designs):
-		regs_info[i]=[]
-		design =  dna_designs[design_list[i]]
-
-		#middle loop: for each regulation
-		for row in rows:
-			
-			#opts
-			reg_attribs_map = {}
-			for k in attrib_keys:
-				if row[header_map[k]] != '':
-					if k == 'color':
-						reg_attribs_map[k] = [float(x) for x in row[header_map[k]].split(';')]
-					else:
-						reg_attribs_map[k] = make_float_if_needed(row[header_map[k]])
-
-			#from, type, to
-			type = row[header_map['type']]
-			from_partname = row[header_map['from_partname']]
-			to_partname   = row[header_map['to_partname']]
-			from_part = None;
-			to_part = None;
-			
-			#inner loop: loop through parts to find 'from' and 'to' parts
-			for part1 in design: #loop through once to find the cds
-				if(part1['name'] == from_partname):
-					start_part = part1
-					for part2 in design: #loop through again to find the promoter
-						if(part2['name'] == to_partname):
-							end_part = part2
-							#found from-to, save regulation arc
-							reg_info = {}
-							reg_info['from_part'] = start_part
-							reg_info['type'] = row[header_map['type']]
-							reg_info['to_part'] = end_part
-							reg_info['opts'] = reg_attribs_map
-							regs_info[i].append(reg_info)
-	return regs_info
-
-def plot_dna (dna_designs, out_filename, plot_params, regs_info):
+def draw_designs (design_names, designs, plot_params, regs_list, stats=None, tight_layout=False):
 	# Create the renderer
 	if 'axis_y' not in list(plot_params.keys()):
 		plot_params['axis_y'] = 35
@@ -196,54 +85,119 @@ def plot_dna (dna_designs, out_filename, plot_params, regs_info):
 	part_renderers = dr.SBOL_part_renderers()
 
     # Create the figure
-	fig = plt.figure(figsize=(fig_x,fig_y))
+	timer = dpl.PhaseTimer(stats)
+	fig = dpl.new_figure(figsize=(fig_x,fig_y))
+	timer.lap('create_figure')
 
 	# Cycle through the designs an plot on individual axes
-	design_list = sorted(dna_designs.keys())
-	if(regs_info != None):
-		regs_list   = sorted(regs_info.keys())
-	
-	num_of_designs = len(design_list)
+	num_of_designs = len(designs)
 	ax_list = []
+	layouts = []
 	max_dna_len = 0.0
 	for i in range(num_of_designs):
 		# Create axis for the design and plot
 		regs = None
-		if(regs_info != None):
-			regs   =  regs_info[i]
-		design =  dna_designs[design_list[i]]
+		if(regs_list != None):
+			regs   =  regs_list[i]
+		design =  designs[i]
 
 		ax = fig.add_subplot(num_of_designs,1,i+1)
 		if 'show_title' in list(plot_params.keys()) and plot_params['show_title'] == 'Y':
-			ax.set_title(design_list[i], fontsize=8)
-		start, end = dr.renderDNA(ax, design, part_renderers, regs, reg_renderers)
+			ax.set_title(design_names[i], fontsize=8)
+		result = dr.renderDNA(ax, design, part_renderers, regs, reg_renderers, stats=stats, 
+		                      return_layout=True)
+		start, end = result[:2]
+		layouts.append(result[2])
 
 		dna_len = end-start
 		if max_dna_len < dna_len:
 			max_dna_len = dna_len
 		ax_list.append(ax)
+	timer = dpl.PhaseTimer(stats)
+	xlim = [(-0.01*max_dna_len)-left_pad, max_dna_len+(0.01*max_dna_len)+right_pad]
+	ylim = [-plot_params['axis_y'],plot_params['axis_y']]
+	if tight_layout == False and len(ax_list) > 0:
+		# Widen the y-limits to show the tallest design
+		bounds = [layout.bounds(points_per_unit=72.0/70.0) for layout in layouts]
+		ylim = [min([ylim[0]]+[b[2] for b in bounds]), max([ylim[1]]+[b[3] for b in bounds])]
 	for ax in ax_list:
 		ax.set_xticks([])
 		ax.set_yticks([])
 		# Set bounds
-		ax.set_xlim([(-0.01*max_dna_len)-left_pad,
-			        max_dna_len+(0.01*max_dna_len)+right_pad])
-		ax.set_ylim([-plot_params['axis_y'],plot_params['axis_y']])
+		ax.set_xlim(xlim)
+		ax.set_ylim(ylim)
 		ax.set_aspect('equal')
 		ax.set_axis_off()
+	timer.lap('format_axes')
+
+	if tight_layout == True:
+		# Update the size of the figure to fit the constructs drawn
+		fig_x_dim = max_dna_len/70.0
+		if fig_x_dim < 1.0:
+			fig_x_dim = 1.0
+		fig_y_dim = 1.2*len(ax_list)
+		fig.set_size_inches( (fig_x_dim, fig_y_dim) )
+		fig.tight_layout()
+		timer.lap('tight_layout')
+	elif len(ax_list) > 0:
+		# Size the figure and place the axes from the bounds of the designs
+		title_size = None
+		if 'show_title' in list(plot_params.keys()) and plot_params['show_title'] == 'Y':
+			title_size = 8
+		dpl.fit_axes(fig, ax_list, xlim, ylim, bounds, units_per_inch=70.0, title_size=title_size)
+		timer.lap('fit_axes')
+	return fig
 
-	# Update the size of the figure to fit the constructs drawn
-	fig_x_dim = max_dna_len/70.0
-	if fig_x_dim < 1.0:
-		fig_x_dim = 1.0
-	fig_y_dim = 1.2*len(ax_list)
-	plt.gcf().set_size_inches( (fig_x_dim, fig_y_dim) )
+def plot_dna (dna_designs, out_filename, plot_params, regs_info, stats=None, tight_layout=False):
+	# Designs are drawn in order of their names
+	design_list = sorted(dna_designs.keys())
+	regs_list = None
+	if(regs_info != None):
+		regs_list = [regs_info[i] for i in range(len(design_list))]
+	fig = draw_designs(design_list, [dna_designs[name] for name in design_list], 
+	                   plot_params, regs_list, stats=stats, tight_layout=tight_layout)
 
 	# Save the figure
-	plt.tight_layout()
-	fig.savefig(out_filename, transparent=True, dpi=300)
-	# Clear the plotting cache
-	plt.close('all')
+	timer = dpl.PhaseTimer(stats)
+	dpl.save_figure(fig, out_filename, transparent=True, dpi=300)
+	timer.lap('savefig')
+
+def plot_dna_pages (named_designs, out_filename, plot_params, reg_rows, per_page, stats=None, 
+                    tight_layout=False):
+	# Designs are read (in file order) and drawn per_page at a time. Figures are
+	# not held by pyplot, so each page is freed once saved and memory use does not 
+	# grow with the size of the library. PDFs have a page per figure, other formats
+	# are saved to numbered files (e.g., out_0001.png).
+	base, ext = os.path.splitext(out_filename)
+	fmt = ext[1:].lower()
+	pages = library.chunks(named_designs, per_page)
+	def draw_page (page):
+		design_names = [name for name, design in page]
+		designs = [design for name, design in page]
+		regs_list = None
+		if reg_rows != None:
+			regs_list = [library.design_regulation(reg_rows, design) for design in designs]
+		return draw_designs(design_names, designs, plot_params, regs_list, stats=stats, 
+		                    tight_layout=tight_layout)
+	num_pages = 0
+	if fmt == 'pdf':
+		from matplotlib.backends.backend_pdf import PdfPages
+		with dpl.export_settings('pdf'):
+			with PdfPages(out_filename) as pdf:
+				for page in pages:
+					fig = draw_page(page)
+					timer = dpl.PhaseTimer(stats)
+					pdf.savefig(fig, transparent=True, dpi=300)
+					timer.lap('savefig')
+					num_pages += 1
+	else:
+		for page in pages:
+			fig = draw_page(page)
+			num_pages += 1
+			timer = dpl.PhaseTimer(stats)
+			dpl.save_figure(fig, '{}_{:04d}{}'.format(base, num_pages, ext), transparent=True, dpi=300)
+			timer.lap('savefig')
+	return num_pages
 
 def is_valid_file(parser, arg):
     if not os.path.exists(arg):
@@ -266,11 +220,31 @@ def main():
 	parser.add_argument("-designs", dest="designs", required=True,
 					help="dna_designs.csv", metavar="FILE",
                     type=lambda x: is_valid_file(parser, x))
-	parser.add_argument("-output", dest="output_pdf", required=True,
+	parser.add_argument("-output", dest="output_pdf", required=False,
 					help="output pdf filename")
+	parser.add_argument("-batch", dest="batch_dir", required=False,
+					help="render each design to its own file in this directory")
+	parser.add_argument("-processes", dest="processes", required=False, type=int,
+					help="number of processes to use in batch mode (default: number of CPUs)")
+	parser.add_argument("-format", dest="format", required=False, default='pdf',
+					help="output format in batch mode (default: pdf)")
+	parser.add_argument("-cache", dest="cache_dir", required=False,
+					help="directory of previously rendered designs to reuse in batch mode")
+	parser.add_argument("-stats", dest="stats_file", required=False,
+					help="save the time spent in each phase of rendering (.json or .prom)")
+	parser.add_argument("-tight_layout", dest="tight_layout", action='store_true',
+					help="fit the axes with matplotlib's tight_layout (slower) rather than from the design bounds")
+	parser.add_argument("-per_page", dest="per_page", required=False, type=int,
+					help="stream the designs, drawing this many per page (pages of a pdf, or numbered files)")
 	parser.add_argument("-reverse_char", dest="reverse_char", required=False,
 					help="character to denote reverse orientation")
 	args = parser.parse_args()
+	if args.output_pdf == None and args.batch_dir == None:
+		parser.error("one of -output or -batch is required")
+	if args.per_page != None and args.batch_dir != None:
+		parser.error("-per_page cannot be used with -batch (each design is drawn to its own file)")
+	if args.per_page != None and args.per_page < 1:
+		parser.error("-per_page must be at least 1")
 
 	# Process arguments
 	cur_reverse_char = 'r'
@@ -278,13 +252,55 @@ def main():
 		cur_reverse_char = args.reverse_char
 	plot_params = load_plot_parameters(args.params.name)
 	part_info = load_part_information(args.parts.name)
+
+	if args.per_page != None:
+		# Stream the designs rather than loading the whole library
+		named_designs = library.iter_dna_designs(args.designs.name, part_info, 
+		                                         reverse_char=cur_reverse_char)
+		reg_rows = None
+		if(args.regulation):
+			reg_rows = library.load_regulation_rows(args.regulation.name)
+		stats = None
+		if args.stats_file != None:
+			stats = dpl.RenderStats()
+		num_pages = plot_dna_pages(named_designs, args.output_pdf, plot_params, reg_rows, 
+		                           args.per_page, stats=stats, tight_layout=args.tight_layout)
+		print('Rendered %d pages' % num_pages)
+		if stats != None:
+			stats.save(args.stats_file)
+		return
+
 	dna_designs = load_dna_designs (args.designs.name, part_info, reverse_char=cur_reverse_char)
 
 	regs_info = None
 	if(args.regulation):
 		regs_info = load_regulatory_information(args.regulation.name, part_info, dna_designs)
 
-	plot_dna(dna_designs, args.output_pdf, plot_params, regs_info)
+	if args.batch_dir != None:
+		show_titles = 'show_title' in list(plot_params.keys()) and plot_params['show_title'] == 'Y'
+		cache = None
+		if args.cache_dir != None:
+			cache = dpl.RenderCache(args.cache_dir)
+		render_stats = None
+		if args.stats_file != None:
+			render_stats = dpl.RenderStats()
+		stats = batch.render_designs(dna_designs, args.batch_dir, regulations=regs_info, 
+		                             plot_params=plot_params, fmt=args.format, 
+		                             processes=args.processes, titles=show_titles, cache=cache,
+		                             render_stats=render_stats)
+		print('Rendered %d designs in %.2f s (%.1f designs/s, %d processes, %d from cache)' % 
+		      (stats['designs'], stats['seconds'], stats['designs_per_second'], stats['processes'],
+		       stats['cache_hits']))
+		if render_stats != None:
+			render_stats.save(args.stats_file)
+	else:
+		stats = None
+		if args.stats_file != None:
+			stats = dpl.RenderStats()
+		plot_dna(dna_designs, args.output_pdf, plot_params, regs_info, stats=stats, 
+		         tight_layout=args.tight_layout)
+		if stats != None:
+			stats.save(args.stats_file)
 
 if __name__ == "__main__":
  	main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+    import_time.py
+
+    Benchmark the cold start time of importing dnaplotlib
+
+    Each measurement runs a fresh Python interpreter, so module caches are
+    not shared between runs. Reports the time to import dnaplotlib, to
+    load and lay out a design (which should not import matplotlib) and to
+    draw it for the first time (which does).
+
+    Usage:
+    ------
+    python import_time.py -runs 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+__author__  = 'Thomas E. Gorochowski <tom@chofski.co.uk>'
+__license__ = 'MIT'
+__version__ = '1.0'
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GFF = os.path.join(ROOT, 'gallery', 'input_gff', 'plasmid.gff')
+
+# Code timed in a fresh interpreter for each stage
+STAGES = [
+    ('import', '''
+t = time.perf_counter()
+import dnaplotlib as dpl
+elapsed = time.perf_counter()-t
+'''),
+    ('load_and_layout', '''
+import dnaplotlib as dpl
+t = time.perf_counter()
+design = dpl.load_design_from_gff(GFF, 'chrom1', region=[1700, 15880])
+dr = dpl.DNARenderer()
+layout = dr.compute_layout(design, dr.SBOL_part_renderers())
+elapsed = time.perf_counter()-t
+'''),
+    ('first_draw', '''
+import dnaplotlib as dpl
+design = dpl.load_design_from_gff(GFF, 'chrom1', region=[1700, 15880])
+dr = dpl.DNARenderer()
+layout = dr.compute_layout(design, dr.SBOL_part_renderers())
+t = time.perf_counter()
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+fig, ax = plt.subplots()
+dr.draw(layout, ax)
+elapsed = time.perf_counter()-t
+''')]
+
+RUNNER = '''
+import sys, time, json
+sys.path.insert(0, {root!r})
+GFF = {gff!r}
+{code}
+print(json.dumps({{'elapsed': elapsed, 'matplotlib': 'matplotlib' in sys.modules}}))
+'''
+
+
+def run_stage (code):
+    """ Run code in a new interpreter and return its timing.
+    """
+    script = RUNNER.format(root=ROOT, gff=GFF, code=code)
+    output = subprocess.check_output([sys.executable, '-c', script])
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dnaplotlib cold start")
+    parser.add_argument('-runs', dest='runs', type=int, default=10, help='Runs per stage')
+    parser.add_argument('-json', dest='json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    results = {}
+    for name, code in STAGES:
+        runs = [run_stage(code) for i in range(args.runs)]
+        times = sorted(r['elapsed']*1000.0 for r in runs)
+        results[name] = {'min_ms': times[0], 'median_ms': times[len(times)//2],
+                         'imports_matplotlib': runs[0]['matplotlib']}
+    if args.json == True:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, r in results.items():
+            print('{:<16} min {:8.1f} ms  median {:8.1f} ms  matplotlib imported: {}'.format(
+                  name, r['min_ms'], r['median_ms'], r['imports_matplotlib']))
+
+
+if __name__ == "__main__":
+    main()
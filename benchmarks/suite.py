@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+"""
+    suite.py
+
+    Benchmark suite for the rendering, layout and I/O hot paths
+
+    Each benchmark is run on synthetic inputs of increasing size (generated
+    with a fixed seed, so results can be compared across commits):
+
+    - render_sbol_parts:         renderDNA with 10 to 10k SBOL parts
+    - arc_layout:                compute_layout with a growing number of regulation arcs
+    - render_trace_region:       renderDNA of trace parts over regions up to 1 Mbp
+    - load_design_from_gff:      reading large generated GFF files
+    - load_profile_from_bed:     reading large generated BED profiles
+    - load_profile_array_from_bed: as above, with the vectorised loader (no cache)
+    - save_sbol_designs:         saving a design to PDF, PNG and SVG
+    - import_time:               importing dnaplotlib in a fresh interpreter
+
+    Results are written as JSON, and can be compared to an earlier run.
+
+    Usage:
+    ------
+    python suite.py -output results.json
+    python suite.py -quick -filter render -compare results.json -threshold 0.1 -fail
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import dnaplotlib as dpl
+import import_time
+
+__author__  = 'Thomas E. Gorochowski <tom@chofski.co.uk>'
+__license__ = 'MIT'
+__version__ = '1.0'
+
+# Version of the results file format
+RESULTS_VERSION = 1
+
+SEED = 2017
+SBOL_TYPES = ['Promoter', 'RBS', 'CDS', 'Terminator', 'Ribozyme', 'Insulator', 'Operator']
+TRACE_TYPES = ['Promoter', 'RBS', 'CDS', 'Terminator']
+COLORS = [(0.6,0.6,0.6), (0.2,0.63,0.17), (1.0,0.5,0.0), (0.42,0.24,0.6), (0.12,0.47,0.71)]
+
+
+###############################################################################
+# Synthetic inputs
+###############################################################################
+
+
+def make_design (num_parts, seed=SEED):
+    """ Generate a design of SBOL parts (of mixed type, direction and color).
+    """
+    rand = random.Random(seed)
+    design = []
+    for i in range(num_parts):
+        design.append({'type': rand.choice(SBOL_TYPES), 'name': 'part{}'.format(i),
+                       'fwd': rand.random() < 0.8, 'opts': {'color': rand.choice(COLORS)}})
+    return design
+
+
+def make_regulation (design, num_regs, seed=SEED):
+    """ Generate regulation arcs between random parts of a design.
+    """
+    rand = random.Random(seed)
+    regs = []
+    for i in range(num_regs):
+        from_part, to_part = rand.sample(design, 2)
+        regs.append({'type': rand.choice(['Repression', 'Activation']),
+                     'from_part': from_part, 'to_part': to_part,
+                     'opts': {'color': rand.choice(COLORS), 'linewidth': 1.0}})
+    return regs
+
+
+def make_trace_design (region_len, spacing=500, seed=SEED):
+    """ Generate a design of trace parts (with positions) covering a region.
+    """
+    rand = random.Random(seed)
+    design = []
+    start = 0
+    while start < region_len:
+        part_type = rand.choice(TRACE_TYPES)
+        length = 40
+        if part_type == 'CDS':
+            length = rand.randint(200, 400)
+        fwd = rand.random() < 0.5
+        design.append({'type': part_type, 'name': 'part{}'.format(len(design)), 'fwd': fwd,
+                       'start': start if fwd else start+length,
+                       'end': start+length if fwd else start,
+                       'opts': {'color': rand.choice(COLORS)}})
+        start += length+rand.randint(spacing//2, spacing)
+    return design
+
+
+def write_gff (filename, num_features, chrom='chrom1', seed=SEED):
+    """ Write a GFF file of genes, promoters, terminators and RBSs.
+    """
+    rand = random.Random(seed)
+    gff_types = ['gene', 'promoter', 'terminator', 'rbs']
+    pos = 1
+    with open(filename, 'w') as gff_file:
+        for i in range(num_features):
+            length = rand.randint(20, 1000)
+            strand = rand.choice('+-')
+            gff_file.write('{}\tbench\t{}\t{}\t{}\t.\t{}\t.\tName=f{};color=(1,0,0)\n'.format(
+                           chrom, rand.choice(gff_types), pos, pos+length, strand, i))
+            pos += length+rand.randint(1, 200)
+    return pos
+
+
+def write_bed (filename, region_len, chrom='chrom1', seed=SEED):
+    """ Write a BED profile (chrom, start, end, position, value) over a region.
+    """
+    rand = random.Random(seed)
+    with open(filename, 'w') as bed_file:
+        for i in range(region_len):
+            bed_file.write('{}\t0\t{}\t{}\t{:.3f}\n'.format(chrom, region_len, i+1,
+                                                            rand.random()*100.0))
+
+
+###############################################################################
+# Benchmarks
+###############################################################################
+
+# (name, params, setup) where setup(param, work_dir) returns the function to time.
+# The function may return the seconds to report (e.g., timed in a subprocess),
+# otherwise the time taken to call it is used.
+BENCHMARKS = []
+
+
+def benchmark (params):
+    """ Register a benchmark setup function, run for each of params.
+    """
+    def register (setup):
+        BENCHMARKS.append((setup.__name__, params, setup))
+        return setup
+    return register
+
+
+def new_axes ():
+    fig = dpl.new_figure(figsize=(10,2))
+    return fig.add_subplot(1,1,1)
+
+
+@benchmark([10, 100, 1000, 10000])
+def render_sbol_parts (num_parts, work_dir):
+    design = make_design(num_parts)
+    dr = dpl.DNARenderer()
+    part_renderers = dr.SBOL_part_renderers()
+    def run ():
+        dr.renderDNA(new_axes(), design, part_renderers)
+    return run
+
+
+@benchmark([10, 100, 1000])
+def arc_layout (num_regs, work_dir):
+    design = make_design(200)
+    regs = make_regulation(design, num_regs)
+    dr = dpl.DNARenderer()
+    part_renderers = dr.SBOL_part_renderers()
+    reg_renderers = dr.std_reg_renderers()
+    def run ():
+        dr.compute_layout(design, part_renderers, regs, reg_renderers)
+    return run
+
+
+@benchmark([10000, 100000, 1000000])
+def render_trace_region (region_len, work_dir):
+    design = make_trace_design(region_len)
+    dr = dpl.DNARenderer(scale=10.0)
+    part_renderers = dr.trace_part_renderers()
+    def run ():
+        ax = new_axes()
+        ax.set_xlim([0, region_len])
+        dr.renderDNA(ax, design, part_renderers)
+        ax.figure.canvas.draw()
+    return run
+
+
+@benchmark([1000, 10000, 100000])
+def load_design_from_gff (num_features, work_dir):
+    filename = os.path.join(work_dir, 'features_{}.gff'.format(num_features))
+    end = write_gff(filename, num_features)
+    def run ():
+        dpl.load_design_from_gff(filename, 'chrom1', region=[1, end])
+    return run
+
+
+@benchmark([10000, 100000, 1000000])
+def load_profile_from_bed (region_len, work_dir):
+    filename = os.path.join(work_dir, 'profile_{}.bed'.format(region_len))
+    write_bed(filename, region_len)
+    def run ():
+        dpl.load_profile_from_bed(filename, 'chrom1', [0, region_len])
+    return run
+
+
+@benchmark([10000, 100000, 1000000])
+def load_profile_array_from_bed (region_len, work_dir):
+    filename = os.path.join(work_dir, 'profile_{}.bed'.format(region_len))
+    if not os.path.exists(filename):
+        write_bed(filename, region_len)
+    def run ():
+        dpl.load_profile_array_from_bed(filename, 'chrom1', [0, region_len], cache=False)
+    return run
+
+
+@benchmark(['pdf', 'png', 'svg'])
+def save_sbol_designs (fmt, work_dir):
+    design = make_design(50)
+    regs = make_regulation(design, 10)
+    filename = os.path.join(work_dir, 'design.'+fmt)
+    def run ():
+        dpl.save_sbol_designs(filename, [design], regulations=[regs])
+    return run
+
+
+@benchmark([None])
+def import_time_bench (param, work_dir):
+    def run ():
+        return import_time.run_stage(import_time.STAGES[0][1])['elapsed']
+    return run
+
+
+###############################################################################
+# Running and comparing
+###############################################################################
+
+
+def time_benchmark (run, repeat, min_seconds):
+    """ Time a function at least repeat times (and for at least min_seconds).
+    """
+    times = []
+    total = 0.0
+    while len(times) < repeat or total < min_seconds:
+        start_time = time.perf_counter()
+        seconds = run()
+        if seconds == None:
+            seconds = time.perf_counter()-start_time
+        times.append(seconds)
+        total += seconds
+        if total > 60.0*repeat:
+            break
+    times.sort()
+    return {'min': times[0], 'median': times[len(times)//2],
+            'mean': sum(times)/len(times), 'runs': len(times)}
+
+
+def benchmark_name (name, param):
+    if name.endswith('_bench'):
+        name = name[:-len('_bench')]
+    if param == None:
+        return name
+    return '{}[{}]'.format(name, param)
+
+
+def environment ():
+    """ Versions and commit the results were measured with.
+    """
+    import numpy
+    import matplotlib
+    commit = None
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT,
+                                         stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return {'commit': commit, 'python': platform.python_version(),
+            'numpy': numpy.__version__, 'matplotlib': matplotlib.__version__,
+            'machine': platform.machine(), 'platform': platform.platform(),
+            'cpus': os.cpu_count()}
+
+
+def warm_up ():
+    """ Import matplotlib and load its fonts, so the first benchmark does not pay for it.
+    """
+    dpl.render_sbol_designs([make_design(10)], plot_names=['warm up'], fmt='png', dpi=72)
+
+
+def run_suite (name_filter=None, quick=False, repeat=3, min_seconds=0.2, verbose=True):
+    """ Run the benchmarks (with names matching name_filter) and return the results.
+    """
+    warm_up()
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix='dnaplotlib_bench_')
+    try:
+        for name, params, setup in BENCHMARKS:
+            if quick == True:
+                params = params[:2]
+            for param in params:
+                full_name = benchmark_name(name, param)
+                if name_filter != None and re.search(name_filter, full_name) == None:
+                    continue
+                run = setup(param, work_dir)
+                results[full_name] = time_benchmark(run, repeat, min_seconds)
+                if verbose == True:
+                    print('{:<40} {:12.6f} s  ({} runs)'.format(full_name,
+                          results[full_name]['min'], results[full_name]['runs']), file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir)
+    return {'version': RESULTS_VERSION, 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'environment': environment(), 'results': results}
+
+
+def compare (baseline, current, threshold=0.1):
+    """ Compare the minimum times of two sets of results. Returns the lines of a
+    report and the names of benchmarks slower by more than threshold (a fraction).
+    """
+    lines = ['{:<40} {:>12} {:>12} {:>8}'.format('benchmark', 'baseline (s)', 'current (s)', 'ratio')]
+    regressions = []
+    for name in sorted(current['results'].keys()):
+        if name not in baseline['results']:
+            continue
+        base_time = baseline['results'][name]['min']
+        cur_time = current['results'][name]['min']
+        ratio = cur_time/base_time if base_time > 0 else float('inf')
+        flag = ''
+        if ratio > 1.0+threshold:
+            flag = '  slower'
+            regressions.append(name)
+        elif ratio < 1.0/(1.0+threshold):
+            flag = '  faster'
+        lines.append('{:<40} {:12.6f} {:12.6f} {:8.2f}{}'.format(name, base_time, cur_time, ratio, flag))
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dnaplotlib")
+    parser.add_argument('-output', dest='output', default=None, help='JSON file to write results to')
+    parser.add_argument('-filter', dest='filter', default=None, help='Only run benchmarks matching this regex')
+    parser.add_argument('-quick', dest='quick', action='store_true', help='Only run the two smallest sizes')
+    parser.add_argument('-repeat', dest='repeat', type=int, default=3, help='Minimum runs of each benchmark')
+    parser.add_argument('-compare', dest='compare', default=None, help='JSON results to compare with')
+    parser.add_argument('-threshold', dest='threshold', type=float, default=0.1,
+                        help='Fraction slower than the baseline reported as a regression')
+    parser.add_argument('-fail', dest='fail', action='store_true', help='Exit with an error if slower')
+    args = parser.parse_args()
+    results = run_suite(args.filter, args.quick, args.repeat)
+    if args.output != None:
+        with open(args.output, 'w') as out_file:
+            json.dump(results, out_file, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    if args.compare != None:
+        with open(args.compare, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+        lines, regressions = compare(baseline, results, args.threshold)
+        print('\n'.join(lines), file=sys.stderr)
+        if args.fail == True and len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+    thread_stress.py
+
+    Stress test rendering designs concurrently from threads
+
+    Renders a set of designs once in a single thread, then repeatedly from a
+    pool of threads (each render using its own renderer and pyplot-free
+    figure). Fails if any concurrent render differs from the single threaded
+    one, or if rendering changed matplotlib.rcParams. Reports the renders per
+    second for each number of threads.
+
+    Usage:
+    ------
+    python thread_stress.py -threads 1 2 4 8 -rounds 5 -format png
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import dnaplotlib as dpl
+
+__author__  = 'Thomas E. Gorochowski <tom@chofski.co.uk>'
+__license__ = 'MIT'
+__version__ = '1.0'
+
+# Designs covering the glyphs used by the quick format (with labels and reverse parts)
+SPECS = ['p.gray p.lightblue i.lightred r.green c.orange t.purple -t.black -c.yellow -p.yellow',
+         'p.red.pTac r.green c.blue.lacI t.black s.gray =.white',
+         '-t.purple -c.lightgreen.tetR -r.green -p.blue p.orange r.green c.lightred.GFP t.black',
+         'i.lightpurple r.lightorange c.red.A c.blue.B c.green.C t.gray']
+
+
+def render (design, fmt, dpi, name):
+    """ Render a design (not modifying it) and return a digest of the output.
+    """
+    data = dpl.render_sbol_designs([copy.deepcopy(design)], plot_names=[name], fmt=fmt, dpi=dpi,
+                                   metadata={'pdf': {'CreationDate': None},
+                                             'svg': {'Date': None}}.get(fmt),
+                                   rc={'svg.hashsalt': 'thread_stress'})
+    return hashlib.sha1(data).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test threaded rendering")
+    parser.add_argument('-threads', dest='threads', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Numbers of threads to test')
+    parser.add_argument('-rounds', dest='rounds', type=int, default=5, help='Renders of each design per test')
+    parser.add_argument('-format', dest='fmt', default='png', help='Output format')
+    parser.add_argument('-dpi', dest='dpi', type=int, default=100, help='Resolution of raster outputs')
+    parser.add_argument('-json', dest='json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    designs = [dpl.load_design_from_quick(spec) for spec in SPECS]
+    jobs = [(i, design) for i, design in enumerate(designs)]
+    import matplotlib
+    rc_before = dict(matplotlib.rcParams)
+    expected = [render(design, args.fmt, args.dpi, str(i)) for i, design in jobs]
+    results = {'format': args.fmt, 'renders_per_second': {}, 'mismatches': 0}
+    for threads in args.threads:
+        work = jobs*args.rounds
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            digests = list(pool.map(lambda job: render(job[1], args.fmt, args.dpi, str(job[0])), work))
+        seconds = time.perf_counter()-start_time
+        results['mismatches'] += sum(d != expected[job[0]] for d, job in zip(digests, work))
+        results['renders_per_second'][threads] = len(work)/seconds
+    rc_changed = sorted(k for k, v in matplotlib.rcParams.items() if rc_before.get(k) != v)
+    results['rcparams_changed'] = rc_changed
+    if args.json == True:
+        print(json.dumps(results, indent=2))
+    else:
+        for threads, rate in results['renders_per_second'].items():
+            print('{:>3} threads  {:8.1f} renders/s'.format(threads, rate))
+        print('mismatched renders: {}'.format(results['mismatches']))
+        print('rcParams changed: {}'.format(', '.join(rc_changed) if rc_changed else 'none'))
+    if results['mismatches'] > 0 or len(rc_changed) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
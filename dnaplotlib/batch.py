@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+DNAplotlib batch rendering
+==========================
+    Render large libraries of designs to individual files using a pool of
+    worker processes:
+
+    >  from dnaplotlib import batch
+    >  stats = batch.render_designs(designs, 'out_dir', regulations=regs,
+    >                               processes=8, fmt='png')
+
+    Each worker creates its renderer (and imports matplotlib) once, then draws
+    the designs it is sent. Every design is drawn to its own figure (without
+    pyplot) using only the design and plotting parameters, so the files 
+    produced are identical whatever the number of workers.
+"""
+
+import os
+import copy
+import re
+import time
+import multiprocessing
+import dnaplotlib as dpl
+
+__author__  = 'Thomas E. Gorochowski <tom@chofski.co.uk>'
+__license__ = 'MIT'
+__version__ = '1.0'
+
+
+# Metadata removed from saved files so that they only depend on the design
+deterministic_metadata = {'pdf': {'CreationDate': None, 'ModDate': None},
+                          'svg': {'Date': None},
+                          'png': {}}
+
+# SVG element ids are otherwise random
+deterministic_rc = {'svg.hashsalt': 'dnaplotlib'}
+
+# Renderer reused by all designs drawn in this process (see init_worker)
+worker_state = {}
+
+
+def init_worker (plot_params, cache=None):
+    """ Prepare a process for rendering: create the renderer used for every design
+    it draws (matplotlib is imported when the first design is drawn).
+    """
+    plot_params = dict(plot_params)
+    worker_state['plot_params'] = plot_params
+    worker_state['cache'] = cache
+    worker_state['renderer'] = dpl.DNARenderer(scale=plot_params.get('scale', 1.0),
+                                   linewidth=plot_params.get('linewidth', 1.0),
+                                   backbone_pad_left=plot_params.get('backbone_pad_left', 0.0),
+                                   backbone_pad_right=plot_params.get('backbone_pad_right', 0.0),
+                                   glyph_cache=dpl.GlyphCache())
+
+
+def save_design (filename, design, regs=None, name=None, dpi=300, stats=None):
+    """ Draw a single design to its own file using the renderer of this process
+    (sized as for save_sbol_designs), recording the time taken to stats (a 
+    dnaplotlib.RenderStats) if given. The design is not modified. Returns True 
+    if the file was copied from the cache of this process (see 
+    dnaplotlib.RenderCache).
+    """
+    if 'renderer' not in worker_state:
+        init_worker({})
+    plot_params = dict(worker_state['plot_params'])
+    fmt = os.path.splitext(filename)[1][1:].lower()
+    cache = worker_state['cache']
+    key = None
+    if cache != None:
+        key = dpl.design_key([design], [regs], plot_params=plot_params, plot_names=[name],
+                             fmt=fmt, dpi=dpi, helper='batch.save_design')
+    if key != None:
+        data = cache.get(key, fmt)
+        if stats != None:
+            stats.add_cache('render', int(data != None), int(data == None))
+        if data != None:
+            with open(filename, 'wb') as out_file:
+                out_file.write(data)
+            return True
+    # Drawing writes positions to the design, so a copy (sharing parts with its 
+    # regulation) is drawn
+    design, regs = copy.deepcopy((design, regs))
+    regulations = None
+    if regs != None:
+        regulations = [regs]
+    plot_names = None
+    if name != None:
+        plot_names = [name]
+    data = dpl.render_sbol_designs([design], regulations=regulations, plot_params=plot_params,
+                                   plot_names=plot_names, fmt=fmt, dpi=dpi,
+                                   metadata=deterministic_metadata.get(fmt), rc=deterministic_rc,
+                                   renderer=worker_state['renderer'], stats=stats)
+    if key != None:
+        cache.put(key, fmt, data)
+    with open(filename, 'wb') as out_file:
+        out_file.write(data)
+    return False
+
+
+def render_job (job):
+    """ Render a single job (index, filename, design, regs, name, dpi, 
+    record_stats) in a worker. Returns the index, filename, whether it was 
+    cached and the info() of its dnaplotlib.RenderStats (None unless recorded).
+    """
+    index, filename, design, regs, name, dpi, record_stats = job
+    stats = None
+    if record_stats == True:
+        stats = dpl.RenderStats()
+    cached = save_design(filename, design, regs=regs, name=name, dpi=dpi, stats=stats)
+    if stats != None:
+        stats = stats.info()
+    return index, filename, cached, stats
+
+
+def design_filename (name, fmt):
+    """ Return a safe filename for a design name.
+    """
+    return '{}.{}'.format(re.sub(r'[^A-Za-z0-9_.-]', '_', str(name)), fmt)
+
+
+def design_filenames (names, fmt):
+    """ Return a distinct safe filename for each design name. Names that would 
+    share a file (e.g., 'a b' and 'a_b', or names differing only in case) have 
+    their index added (e.g., a_b_0.png and a_b_1.png). Raises ValueError if the
+    filenames are still not distinct.
+    """
+    filenames = [design_filename(name, fmt) for name in names]
+    counts = {}
+    for filename in filenames:
+        counts[filename.lower()] = counts.get(filename.lower(), 0)+1
+    for i, filename in enumerate(filenames):
+        if counts[filename.lower()] > 1:
+            filenames[i] = design_filename('{}_{}'.format(os.path.splitext(filename)[0], i), fmt)
+    if len(set(f.lower() for f in filenames)) != len(filenames):
+        raise ValueError('Design names do not give distinct filenames')
+    return filenames
+
+
+def render_designs (dna_designs, out_dir, regulations=None, plot_params={}, names=None,
+                    fmt='pdf', dpi=300, processes=None, chunksize=16, titles=False, 
+                    cache=None, render_stats=None):
+    """ Render each design to its own file using a pool of worker processes.
+
+    Parameters
+    ----------
+    dna_designs : list(list(dict)) or dict(name: list(dict))
+        The designs to draw. If a dict, designs are drawn in sorted name order and
+        named by their keys.
+
+    out_dir : string
+        Directory the files are written to (created if needed).
+
+    regulations : list(list(dict)) (default=None)
+        Regulation of each design (in the same order as the designs).
+
+    plot_params : dict (default={})
+        General plotting parameters (as for plot_sbol_designs).
+
+    names : list(string) (default=None)
+        Name of each design, used for its filename (see design_filenames). If 
+        None, designs are named by their index (or key if dna_designs is a dict).
+
+    fmt : string (default='pdf')
+        Output format (any supported by matplotlib, e.g. 'pdf', 'png' or 'svg').
+
+    dpi : int (default=300)
+        Resolution of raster outputs.
+
+    processes : int (default=None)
+        Number of worker processes. If None, the number of CPUs is used. If 1,
+        designs are rendered in this process.
+
+    chunksize : int (default=16)
+        Number of designs sent to a worker at a time.
+
+    titles : bool (default=False)
+        Show the name of each design as its title.
+
+    cache : RenderCache (default=None)
+        Cache shared by the workers. Designs already rendered with the same 
+        parameters are copied from it rather than drawn.
+
+    render_stats : dnaplotlib.RenderStats (default=None)
+        Statistics to add the time each worker spent in each phase of rendering
+        to (summed over all designs).
+
+    Returns
+    -------
+    stats : dict
+        'files' (filename of each design, in order), 'designs', 'cache_hits',
+        'seconds', 'designs_per_second' and 'processes'.
+    """
+    if isinstance(dna_designs, dict):
+        keys = sorted(dna_designs.keys())
+        if names == None:
+            names = keys
+        dna_designs = [dna_designs[k] for k in keys]
+    if names == None:
+        names = [str(i) for i in range(len(dna_designs))]
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    filenames = design_filenames(names, fmt)
+    jobs = []
+    for i, design in enumerate(dna_designs):
+        regs = None
+        if regulations != None:
+            regs = regulations[i]
+        title = None
+        if titles == True:
+            title = names[i]
+        filename = os.path.join(out_dir, filenames[i])
+        jobs.append((i, filename, design, regs, title, dpi, render_stats != None))
+    if processes == None:
+        processes = multiprocessing.cpu_count()
+    processes = max(1, min(processes, len(jobs)))
+    files = [None]*len(jobs)
+    cache_hits = 0
+    start_time = time.perf_counter()
+    if processes == 1:
+        init_worker(plot_params, cache)
+        results = map(render_job, jobs)
+        for index, filename, cached, job_stats in results:
+            files[index] = filename
+            cache_hits += cached
+            if job_stats != None:
+                render_stats.add_info(job_stats)
+    else:
+        with multiprocessing.Pool(processes, initializer=init_worker,
+                                  initargs=(plot_params, cache)) as pool:
+            for index, filename, cached, job_stats in pool.imap_unordered(render_job, jobs, chunksize):
+                files[index] = filename
+                cache_hits += cached
+                if job_stats != None:
+                    render_stats.add_info(job_stats)
+    seconds = time.perf_counter()-start_time
+    designs_per_second = 0.0
+    if seconds > 0:
+        designs_per_second = len(jobs)/seconds
+    return {'files': files, 'designs': len(jobs), 'cache_hits': cache_hits, 'seconds': seconds,
+            'designs_per_second': designs_per_second, 'processes': processes}
@@ -42,21 +42,105 @@ DNAplotlib
     The function returns the start and end point of the design which can then
     be used for resizing the axes and figure. For more advanced use cases we 
     advise looking at the gallery distributed with this module.
+
+    The positions of parts and regulation can also be calculated without any
+    drawing taking place. The Layout returned can then be drawn to an axes:
+
+    > layout = dr.compute_layout(design, part_renderers, regs, reg_renderers)
+    > dr.draw(layout, ax)
+
+    Large designs can be held as a DesignTable (columns of values rather than a 
+    dict per part), which is drawn in the same way:
+
+    > table = dpl.DesignTable.from_parts(design)
+    > start, end = dr.renderDNA(ax, table, part_renderers)
 """
 
 
+import os
+import io
+import glob
+import json
+import hashlib
 import math
 import csv
+import warnings
+import importlib
+import itertools
+import contextlib
+import copy
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from collections.abc import Mapping
 from operator import itemgetter
-# Set the backend to use (important for headless servers)
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon, Ellipse, Wedge, Circle, PathPatch
-from matplotlib.path import Path
-from matplotlib.lines import Line2D
-from matplotlib.patheffects import Stroke
-import matplotlib.patches as patches
+
+
+class _LazyImport:
+    """ Placeholder for a module (or object in a module) that is only imported
+    when first used. On first use the module global it is bound to is replaced
+    by the real object, so later uses have no overhead. This keeps importing
+    dnaplotlib (e.g., for loading designs or layout) free of matplotlib and 
+    leaves the choice of backend to the application.
+    """
+
+    def __init__ (self, name, module, attribute=None):
+        self._name = name
+        self._module = module
+        self._attribute = attribute
+        self._target = None
+
+    def _load (self):
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            if self._attribute != None:
+                target = getattr(target, self._attribute)
+            self._target = target
+            if globals().get(self._name) is self:
+                globals()[self._name] = target
+        return self._target
+
+    def __getattr__ (self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __call__ (self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __instancecheck__ (self, obj):
+        return isinstance(obj, self._load())
+
+    def __subclasscheck__ (self, cls):
+        return issubclass(cls, self._load())
+
+    def __repr__ (self):
+        return '<lazy import of {}>'.format(self._module if self._attribute == None 
+                                            else self._module+'.'+self._attribute)
+
+
+# matplotlib is imported when something is first drawn
+matplotlib     = _LazyImport('matplotlib', 'matplotlib')
+plt            = _LazyImport('plt', 'matplotlib.pyplot')
+patches        = _LazyImport('patches', 'matplotlib.patches')
+Polygon        = _LazyImport('Polygon', 'matplotlib.patches', 'Polygon')
+Ellipse        = _LazyImport('Ellipse', 'matplotlib.patches', 'Ellipse')
+Wedge          = _LazyImport('Wedge', 'matplotlib.patches', 'Wedge')
+Circle         = _LazyImport('Circle', 'matplotlib.patches', 'Circle')
+PathPatch      = _LazyImport('PathPatch', 'matplotlib.patches', 'PathPatch')
+Path           = _LazyImport('Path', 'matplotlib.path', 'Path')
+Line2D         = _LazyImport('Line2D', 'matplotlib.lines', 'Line2D')
+Stroke         = _LazyImport('Stroke', 'matplotlib.patheffects', 'Stroke')
+PathCollection = _LazyImport('PathCollection', 'matplotlib.collections', 'PathCollection')
+LineCollection = _LazyImport('LineCollection', 'matplotlib.collections', 'LineCollection')
+PolyCollection = _LazyImport('PolyCollection', 'matplotlib.collections', 'PolyCollection')
+to_rgba        = _LazyImport('to_rgba', 'matplotlib.colors', 'to_rgba')
+to_rgba_array  = _LazyImport('to_rgba_array', 'matplotlib.colors', 'to_rgba_array')
+Figure         = _LazyImport('Figure', 'matplotlib.figure', 'Figure')
+FigureCanvasAgg = _LazyImport('FigureCanvasAgg', 'matplotlib.backends.backend_agg', 'FigureCanvasAgg')
+imsave         = _LazyImport('imsave', 'matplotlib.image', 'imsave')
+Text           = _LazyImport('Text', 'matplotlib.text', 'Text')
 
 
 __author__  = 'Thomas E. Gorochowski <tom@chofski.co.uk>\n\
@@ -66,6 +150,168 @@ __license__ = 'MIT'
 __version__ = '1.0'
 
 
+###############################################################################
+# Line styles
+###############################################################################
+
+# Styles of the lines drawn by the renderers (we want mitered edges). These are
+# set on each line, rather than in matplotlib.rcParams, so drawing does not 
+# change global state shared with other renders (e.g., in other threads).
+line_styles = {'dash_joinstyle':  'miter',
+               'dash_capstyle':   'butt',
+               'solid_joinstyle': 'miter',
+               'solid_capstyle':  'projecting'}
+
+
+def mitered_line (xdata, ydata, **kwargs):
+    """ Create a line using line_styles (unless the styles are given in kwargs).
+    """
+    for key, value in line_styles.items():
+        kwargs.setdefault(key, value)
+    return Line2D(xdata, ydata, **kwargs)
+
+
+###############################################################################
+# Renderer options
+###############################################################################
+
+
+class UnknownOptionWarning (UserWarning):
+    """ Warning raised when opts contains a key that the renderer does not use.
+    """
+    pass
+
+
+class ResolvedOptions:
+    """ Base class for the options of a renderer after resolution. Each option
+    is held in a slot of the same name (see OptionSchema).
+    """
+    __slots__ = ()
+
+    def __repr__ (self):
+        values = ', '.join(['%s=%r' % (name, getattr(self, name)) for name in self.__slots__])
+        return '%s(%s)' % (type(self).__name__, values)
+
+
+class OptionSchema:
+    """ Declarative description of the options a renderer accepts. Each option
+    is given as a keyword argument with its default value (None for options 
+    that default to an argument of the renderer, e.g., linewidth or scale).
+
+    resolve() converts an opts dictionary into a compact object holding a value
+    for every option. The result is cached per opts dictionary, so parts that
+    share the same opts (as is common for libraries) are resolved only once.
+    If an opts dictionary is modified after it was resolved it is resolved again.
+    """
+
+    # Maximum number of opts dictionaries remembered by each schema
+    cache_size = 1024
+
+    # Number of resolutions found in (or missing from) the caches of all schemas,
+    # held separately for each thread (see OptionSchema.counts)
+    _counts = threading.local()
+
+    def __init__ (self, name, extra_keys=None, **defaults):
+        """ Constructor to generate a schema.
+
+        Parameters
+        ----------
+        name : string
+            Name of the renderer (used in warnings).
+
+        extra_keys : set(string) (default=None)
+            Further keys that may be present in opts, but are used elsewhere
+            (e.g., by write_label). Any other key that is not an option gives 
+            an UnknownOptionWarning. If None, unknown keys are not reported.
+
+        **defaults
+            Default value of each option.
+        """
+        self.name = name
+        self.defaults = defaults
+        self.keys = None
+        if extra_keys != None:
+            self.keys = frozenset(defaults) | frozenset(extra_keys)
+        self.resolved_class = type(name+'_resolved_options', (ResolvedOptions,), 
+                                   {'__slots__':tuple(defaults)})
+        self.default_options = self._build(defaults)
+        self.cache = {}
+
+    @staticmethod
+    def counts ():
+        """ Return the number of resolutions made by the current thread that were
+        found in (or missing from) the caches of all schemas, as [hits, misses].
+        Resolutions made by other threads (e.g., concurrent renders) are not
+        included, so the change over a render gives the resolutions of that render.
+        """
+        counts = getattr(OptionSchema._counts, 'value', None)
+        if counts == None:
+            counts = [0, 0]
+            OptionSchema._counts.value = counts
+        return counts
+
+    def _build (self, values):
+        resolved = self.resolved_class()
+        for key, value in values.items():
+            setattr(resolved, key, value)
+        return resolved
+
+    def resolve (self, opts):
+        """ Return the resolved options for an opts dictionary (or None).
+
+        Parameters
+        ----------
+        opts : dict
+            Options of a part or regulation.
+
+        Returns
+        -------
+        resolved : ResolvedOptions
+            Object with an attribute per option set to the value in opts, or the
+            default if not present. Must not be modified.
+        """
+        if opts == None:
+            return self.default_options
+        nested = NestedPhases.current()
+        if nested != None:
+            start = NestedPhases.start()
+        entry = self.cache.get(id(opts))
+        if entry != None and entry[0] is opts:
+            try:
+                if entry[1] == opts:
+                    OptionSchema.counts()[0] += 1
+                    if nested != None:
+                        nested.add('resolve_options', start)
+                    return entry[2]
+            except ValueError:
+                # Values (e.g., numpy arrays) that can't be compared
+                pass
+        OptionSchema.counts()[1] += 1
+        values = dict(self.defaults)
+        for key in opts:
+            if key in values:
+                values[key] = opts[key]
+            elif self.keys != None and key not in self.keys:
+                warnings.warn('Option \'%s\' is not used by %s' % (key, self.name), 
+                              UnknownOptionWarning, stacklevel=3)
+        resolved = self._build(values)
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()
+        # Hold a copy of opts to spot later changes
+        self.cache[id(opts)] = (opts, dict(opts), resolved)
+        if nested != None:
+            nested.add('resolve_options', start)
+        return resolved
+
+
+label_options = OptionSchema('write_label', None,
+    zorder_add=0.0, y_offset=0.0, label_style='normal', label_size=7, label_y_offset=0,
+    label_x_offset=0, label_color=(0,0,0), label_rotation=0)
+
+# Keys used by write_label that can be included in the opts of any part
+label_keys = frozenset(label_options.defaults) | frozenset(['label'])
+
+
 ###############################################################################
 # SBOL Compliant Icon Renderers
 ###############################################################################
@@ -74,70 +320,48 @@ __version__ = '1.0'
 def write_label (ax, label_text, x_pos, opts=None):
     """ Renders labels on parts.
     """
-    zorder_add = 0.0
-    y_offset = 0.0
-    label_style = 'normal'
-    label_size = 7
-    label_y_offset = 0
-    label_x_offset = 0
-    label_color = (0,0,0)
-    label_rotation = 0
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'y_offset' in list(opts.keys()):
-            y_offset = opts['y_offset']
-        if 'label_style' in list(opts.keys()):
-            label_style = opts['label_style']
-        if 'label_size' in list(opts.keys()):
-            label_size = opts['label_size']
-        if 'label_y_offset' in list(opts.keys()):
-            label_y_offset = opts['label_y_offset']
-        if 'label_x_offset' in list(opts.keys()):
-            label_x_offset = opts['label_x_offset']
-        if 'label_color' in list(opts.keys()):
-            label_color = opts['label_color']
-        if 'label_rotation' in list(opts.keys()):
-            label_rotation = opts['label_rotation']
+    nested = NestedPhases.current()
+    if nested != None:
+        start = NestedPhases.start()
+    o = label_options.resolve(opts)
+    zorder_add = o.zorder_add
+    y_offset = o.y_offset
+    label_style = o.label_style
+    label_size = o.label_size
+    label_y_offset = o.label_y_offset
+    label_x_offset = o.label_x_offset
+    label_color = o.label_color
+    label_rotation = o.label_rotation
     ax.text(x_pos+label_x_offset, label_y_offset+y_offset, label_text, horizontalalignment='center',
             verticalalignment='center', fontsize=label_size, fontstyle=label_style, 
             color=label_color, rotation=label_rotation, zorder=30+zorder_add)
+    if nested != None:
+        nested.add('layout_labels', start)
+
+
+sbol_promoter_options = OptionSchema('sbol_promoter', label_keys,
+    zorder_add=0.0, color=(0.0,0.0,0.0), start_pad=2.0, end_pad=2.0, y_extent=10,
+    x_extent=10, arrowhead_height=2, arrowhead_length=4, linewidth=None,
+    scale=None)
 
 
 def sbol_promoter (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL promoter renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0.0,0.0,0.0)
-    start_pad = 2.0
-    end_pad = 2.0
-    y_extent = 10
-    x_extent = 10
-    arrowhead_height = 2
-    arrowhead_length = 4
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'arrowhead_height' in list(opts.keys()):
-            arrowhead_height = opts['arrowhead_height']
-        if 'arrowhead_length' in list(opts.keys()):
-            arrowhead_length = opts['arrowhead_length']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_promoter_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    y_extent = o.y_extent
+    x_extent = o.x_extent
+    arrowhead_height = o.arrowhead_height
+    arrowhead_length = o.arrowhead_length
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     dir_fac = 1.0
     final_end = end
@@ -152,11 +376,11 @@ def sbol_promoter (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         end = start+x_extent
         final_end = end+end_pad
     # Draw the promoter symbol
-    l1 = Line2D([start,start],[0,dir_fac*y_extent], linewidth=linewidth, 
-                color=color, zorder=9+zorder_add)
-    l2 = Line2D([start,start+dir_fac*x_extent-dir_fac*(arrowhead_length*0.5)],
-                [dir_fac*y_extent,dir_fac*y_extent], linewidth=linewidth, 
-                color=color, zorder=10+zorder_add)
+    l1 = mitered_line([start,start],[0,dir_fac*y_extent], linewidth=linewidth, 
+                      color=color, zorder=9+zorder_add)
+    l2 = mitered_line([start,start+dir_fac*x_extent-dir_fac*(arrowhead_length*0.5)],
+                      [dir_fac*y_extent,dir_fac*y_extent], linewidth=linewidth, 
+                      color=color, zorder=10+zorder_add)
     ax.add_line(l1)
     ax.add_line(l2)
     p1 = Polygon([(start+dir_fac*x_extent-dir_fac*arrowhead_length, 
@@ -167,7 +391,7 @@ def sbol_promoter (ax, type, num, start, end, prev_end, scale, linewidth, opts):
                   facecolor=color, edgecolor=color, linewidth=linewidth,  zorder=1+zorder_add,
                   path_effects=[Stroke(joinstyle="miter")]) # This is a work around for matplotlib < 1.4.0
     ax.add_patch(p1)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -178,46 +402,31 @@ def sbol_promoter (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         return prev_end, final_end
 
 
+sbol_cds_options = OptionSchema('sbol_cds', label_keys,
+    zorder_add=0.0, color=(0.7,0.7,0.7), hatch='', start_pad=1.0, end_pad=1.0,
+    y_extent=5, x_extent=30, arrowhead_height=4, arrowhead_length=8,
+    linewidth=None, scale=None, edge_color=(0,0,0))
+
+
 def sbol_cds (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL coding sequence renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0.7,0.7,0.7)
-    hatch = ''
-    start_pad = 1.0
-    end_pad = 1.0
-    y_extent = 5
-    x_extent = 30
-    arrowhead_height = 4
-    arrowhead_length = 8
-    edgecolor = (0,0,0)
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'hatch' in list(opts.keys()):
-            hatch = opts['hatch']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'arrowhead_height' in list(opts.keys()):
-            arrowhead_height = opts['arrowhead_height']
-        if 'arrowhead_length' in list(opts.keys()):
-            arrowhead_length = opts['arrowhead_length']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
-        if 'edge_color' in list(opts.keys()):
-            edgecolor = opts['edge_color']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_cds_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    hatch = o.hatch
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    y_extent = o.y_extent
+    x_extent = o.x_extent
+    arrowhead_height = o.arrowhead_height
+    arrowhead_length = o.arrowhead_length
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
+    edgecolor = o.edge_color
 
     # Check direction add start padding
     dir_fac = 1.0
@@ -244,7 +453,7 @@ def sbol_cds (ax, type, num, start, end, prev_end, scale, linewidth, opts):
                   hatch=hatch, zorder=11+zorder_add, 
                   path_effects=[Stroke(joinstyle="miter")]) # This is a work around for matplotlib < 1.4.0
     ax.add_patch(p1)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -255,34 +464,26 @@ def sbol_cds (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         return prev_end, final_end
 
 
+sbol_terminator_options = OptionSchema('sbol_terminator', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=2.0, y_extent=10.0,
+    x_extent=8.0, linewidth=None, scale=None)
+
+
 def sbol_terminator (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL terminator renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    y_extent = 10.0
-    x_extent = 8.0
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_terminator_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    y_extent = o.y_extent
+    x_extent = o.x_extent
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     dir_fac = 1.0
     final_end = end
@@ -297,13 +498,13 @@ def sbol_terminator (ax, type, num, start, end, prev_end, scale, linewidth, opts
         end = start+x_extent
         final_end = end+end_pad
     # Draw the terminator symbol
-    l1 = Line2D([start+dir_fac*(x_extent/2.0),start+dir_fac*(x_extent/2.0)],[0,dir_fac*y_extent], linewidth=linewidth, 
-                color=color, zorder=8+zorder_add)
-    l2 = Line2D([start,start+(dir_fac*x_extent)],[dir_fac*y_extent,dir_fac*y_extent], 
-                linewidth=linewidth, color=color, zorder=9+zorder_add)
+    l1 = mitered_line([start+dir_fac*(x_extent/2.0),start+dir_fac*(x_extent/2.0)],[0,dir_fac*y_extent], linewidth=linewidth, 
+                      color=color, zorder=8+zorder_add)
+    l2 = mitered_line([start,start+(dir_fac*x_extent)],[dir_fac*y_extent,dir_fac*y_extent], 
+                      linewidth=linewidth, color=color, zorder=9+zorder_add)
     ax.add_line(l1)
     ax.add_line(l2)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -314,34 +515,26 @@ def sbol_terminator (ax, type, num, start, end, prev_end, scale, linewidth, opts
         return prev_end, final_end
 
 
+sbol_rbs_options = OptionSchema('sbol_rbs', label_keys,
+    zorder_add=0.0, color=(0.7,0.7,0.7), start_pad=2.0, end_pad=2.0,
+    x_extent=10.0, linewidth=None, scale=None, edge_color=(0,0,0))
+
+
 def sbol_rbs (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL ribosome binding site renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0.7,0.7,0.7)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 10.0
-    edgecolor = (0,0,0)
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
-        if 'edge_color' in list(opts.keys()):
-            edgecolor = opts['edge_color']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_rbs_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
+    edgecolor = o.edge_color
     # Check direction add start padding
     dir_fac = 1.0
     final_end = end
@@ -363,7 +556,7 @@ def sbol_rbs (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         w1 = Wedge(rbs_center, x_extent/2.0, 0, 180, linewidth=linewidth, 
                    facecolor=color, edgecolor=edgecolor, zorder=8+zorder_add)
         ax.add_patch(w1)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -380,17 +573,15 @@ def sbol_ribozyme (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     return stick_figure(ax,type,num,start,end,prev_end,scale,linewidth,opts)
 
 
+stick_figure_options = OptionSchema('stick_figure', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=2.0, x_extent=5.0,
+    y_extent=10.0, linestyle='-', linewidth=None, scale=None)
+
+
 def stick_figure (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ General function for drawing stick based parts (e.g., ribozyme and protease sites).
     """
     # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 5.0
-    y_extent = 10.0
-    linestyle = '-'
     linetype  = "";
     shapetype = "";
     if(type == "Ribozyme"):
@@ -406,26 +597,19 @@ def stick_figure (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         linetype = 'solid'
         headgroup = 'X'
 
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = stick_figure_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -437,19 +621,19 @@ def stick_figure (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         rbs_center = (end+((start-end)/2.0),-y_extent)
         c1 = Circle(rbs_center, x_extent/2.0, linewidth=linewidth, edgecolor=color, 
                     facecolor=(1,1,1), zorder=8+zorder_add)
-        x1 = Line2D([start,end],[-y_extent*1.25,-y_extent/1.5], 
-                    linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
-        x2 = Line2D([start,end],[-y_extent/1.5,-y_extent*1.25], 
-                    linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
-
-        dash1  = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[0,-y_extent/4], 
-                    linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
-        dash2  = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[-y_extent/2,-y_extent+(x_extent/2.0)], 
-                    linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
-        solidO = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[0,-y_extent+(x_extent/2.0)], 
-                    linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
-        solidX = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[0,-y_extent], 
-                    linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
+        x1 = mitered_line([start,end],[-y_extent*1.25,-y_extent/1.5], 
+                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
+        x2 = mitered_line([start,end],[-y_extent/1.5,-y_extent*1.25], 
+                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
+
+        dash1  = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[0,-y_extent/4], 
+                          linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
+        dash2  = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[-y_extent/2,-y_extent+(x_extent/2.0)], 
+                          linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
+        solidO = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[0,-y_extent+(x_extent/2.0)], 
+                          linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
+        solidX = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[0,-y_extent], 
+                          linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
 
         if(headgroup == "O" and linetype == "dash"):
             ax.add_patch(c1)
@@ -474,19 +658,19 @@ def stick_figure (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         rbs_center = (start+((end-start)/2.0),y_extent)
         c1 = Circle(rbs_center, x_extent/2.0, linewidth=linewidth, edgecolor=color, 
                     facecolor=(1,1,1), zorder=8+zorder_add)
-        x1 = Line2D([start,end],[y_extent*1.25,y_extent/1.5], 
-                    linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
-        x2 = Line2D([start,end],[y_extent/1.5,y_extent*1.25], 
-                    linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
-
-        dash1 = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[0,y_extent/4], 
-                    linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
-        dash2 = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[y_extent/2,y_extent-(x_extent/2.0)], 
-                    linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
-        solidO = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[0,y_extent-(x_extent/2.0)], 
-                    linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
-        solidX = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[0,y_extent], 
-                    linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
+        x1 = mitered_line([start,end],[y_extent*1.25,y_extent/1.5], 
+                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
+        x2 = mitered_line([start,end],[y_extent/1.5,y_extent*1.25], 
+                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
+
+        dash1 = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[0,y_extent/4], 
+                          linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
+        dash2 = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[y_extent/2,y_extent-(x_extent/2.0)], 
+                          linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
+        solidO = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[0,y_extent-(x_extent/2.0)], 
+                          linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
+        solidX = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[0,y_extent], 
+                          linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
 
         if(headgroup == 'O' and linetype == 'dash'):
             ax.add_patch(c1)
@@ -505,7 +689,7 @@ def stick_figure (ax, type, num, start, end, prev_end, scale, linewidth, opts):
             ax.add_line(x2)
             ax.add_line(solidX)
     
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -516,17 +700,15 @@ def stick_figure (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     else:
         return prev_end, final_end
 
+sbol_stem_top_options = OptionSchema('sbol_stem_top', label_keys | frozenset(['stem', 'top']),
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=2.0, x_extent=5.0,
+    y_extent=10.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_stem_top (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ General function for drawing stem-top parts (e.g., ribozyme and protease sites).
     """
     # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 5.0
-    y_extent = 10.0
-    linestyle = '-'
     shapetype = "";
     if type in ["DNACleavageSite"]:
         stemtype = 'straight'
@@ -559,26 +741,19 @@ def sbol_stem_top (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         stemtype = opts['stem']
         toptype = opts['top']
 
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_stem_top_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -589,10 +764,10 @@ def sbol_stem_top (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         final_end = start+start_pad
         # Patches and lines for top glyph
         # toptype=="X"
-        x1 = Line2D([start,end],[-y_extent*1.25,-y_extent/1.25],
-                    linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
-        x2 = Line2D([start,end],[-y_extent/1.25,-y_extent*1.25],
-                    linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
+        x1 = mitered_line([start,end],[-y_extent*1.25,-y_extent/1.25],
+                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
+        x2 = mitered_line([start,end],[-y_extent/1.25,-y_extent*1.25],
+                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
         # toptype=="O"
         center = (end+((start-end)/2.0),-y_extent)
         c1 = Circle(center, x_extent/2.0, linewidth=linewidth, edgecolor=color,
@@ -609,7 +784,7 @@ def sbol_stem_top (ax, type, num, start, end, prev_end, scale, linewidth, opts):
 
         # Lines for stem glyph
         # stemtype=='straight'
-        straight_stem = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[0, -y_extent],
+        straight_stem = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[0, -y_extent],
                     linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
         # stemtype=='wavy'
         wave_height = y_extent/6
@@ -681,10 +856,10 @@ def sbol_stem_top (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         final_end = end+end_pad
         # Patches and lines for top glyph
         # toptype=="X"
-        x1 = Line2D([start,end],[y_extent*1.25,y_extent/1.25],
-                    linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
-        x2 = Line2D([start,end],[y_extent/1.25,y_extent*1.25],
-                    linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
+        x1 = mitered_line([start,end],[y_extent*1.25,y_extent/1.25],
+                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
+        x2 = mitered_line([start,end],[y_extent/1.25,y_extent*1.25],
+                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle='-')
 
         # toptype=="O"
         center = (start+((end-start)/2.0),y_extent)
@@ -702,7 +877,7 @@ def sbol_stem_top (ax, type, num, start, end, prev_end, scale, linewidth, opts):
 
         # Lines for stem glyph
         # stemtype=='straight'
-        straight_stem = Line2D([end+((start-end)/2.0),end+((start-end)/2.0)],[0,y_extent],
+        straight_stem = mitered_line([end+((start-end)/2.0),end+((start-end)/2.0)],[0,y_extent],
                     linewidth=linewidth, color=color, zorder=8+zorder_add, linestyle=linestyle)
         # stemtype=='wavy'
         wave_height = y_extent/6
@@ -785,7 +960,7 @@ def sbol_stem_top (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     elif toptype == 'P':
         ax.add_patch(p1)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -796,37 +971,27 @@ def sbol_stem_top (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     else:
         return prev_end, final_end
 
+sbol_scar_options = OptionSchema('sbol_scar', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=2.0, x_extent=6.0,
+    y_extent=1.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_scar (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL scar renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 6.0
-    y_extent = 1.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_scar_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -835,10 +1000,10 @@ def sbol_scar (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     end = start+x_extent
     final_end = end+end_pad
     
-    l_top    = Line2D([start,start+x_extent],[y_extent,y_extent], 
-                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l_bottom = Line2D([start,start+x_extent],[-1*y_extent,-1*y_extent], 
-                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l_top    = mitered_line([start,start+x_extent],[y_extent,y_extent], 
+                      linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l_bottom = mitered_line([start,start+x_extent],[-1*y_extent,-1*y_extent], 
+                      linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
     #white rectangle overlays backbone line
     p1 = Polygon([(start, y_extent), 
                   (start, -y_extent),
@@ -851,7 +1016,7 @@ def sbol_scar (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     ax.add_line(l_top)
     ax.add_line(l_bottom)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -863,23 +1028,22 @@ def sbol_scar (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         return prev_end, final_end
 
 
+sbol_empty_space_options = OptionSchema('sbol_empty_space', label_keys,
+    zorder_add=0.0, x_extent=12.0)
+
+
 def sbol_empty_space (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in empty space renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    x_extent = 12.0
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_empty_space_options.resolve(opts)
+    zorder_add = o.zorder_add
+    x_extent = o.x_extent
     # Check direction add start padding
     final_start = prev_end
     final_end = final_start+x_extent
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -890,37 +1054,27 @@ def sbol_empty_space (ax, type, num, start, end, prev_end, scale, linewidth, opt
         return prev_end, final_end
 
 
+sbol_5_overhang_options = OptionSchema('sbol_5_overhang', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=0.0, end_pad=2.0, x_extent=6.0,
+    y_extent=1.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_5_overhang (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL 5' overhang renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 0.0
-    end_pad = 2.0
-    x_extent = 6.0
-    y_extent = 1.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_5_overhang_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -929,10 +1083,10 @@ def sbol_5_overhang (ax, type, num, start, end, prev_end, scale, linewidth, opts
     end = start+x_extent
     final_end = end+end_pad
     
-    l_top    = Line2D([start,start+x_extent],[y_extent,y_extent], 
-                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l_bottom = Line2D([start+(x_extent/2.0),start+x_extent],[-1*y_extent,-1*y_extent], 
-                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l_top    = mitered_line([start,start+x_extent],[y_extent,y_extent], 
+                      linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l_bottom = mitered_line([start+(x_extent/2.0),start+x_extent],[-1*y_extent,-1*y_extent], 
+                      linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
     #white rectangle overlays backbone line
     p1 = Polygon([(start, y_extent), 
                   (start, -y_extent),
@@ -945,7 +1099,7 @@ def sbol_5_overhang (ax, type, num, start, end, prev_end, scale, linewidth, opts
     ax.add_line(l_top)
     ax.add_line(l_bottom)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -957,37 +1111,27 @@ def sbol_5_overhang (ax, type, num, start, end, prev_end, scale, linewidth, opts
         return prev_end, final_end
 
 
+sbol_3_overhang_options = OptionSchema('sbol_3_overhang', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=0.0, x_extent=6.0,
+    y_extent=1.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_3_overhang (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL 3' overhang renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 0.0
-    x_extent = 6.0
-    y_extent = 1.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_3_overhang_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -996,10 +1140,10 @@ def sbol_3_overhang (ax, type, num, start, end, prev_end, scale, linewidth, opts
     end = start+x_extent
     final_end = end+end_pad
     
-    l_top    = Line2D([start,start+x_extent],[y_extent,y_extent], 
-                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l_bottom = Line2D([start,start+(x_extent/2.0)],[-1*y_extent,-1*y_extent], 
-                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l_top    = mitered_line([start,start+x_extent],[y_extent,y_extent], 
+                      linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l_bottom = mitered_line([start,start+(x_extent/2.0)],[-1*y_extent,-1*y_extent], 
+                      linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
     #white rectangle overlays backbone line
     p1 = Polygon([(start, y_extent), 
                   (start, -y_extent),
@@ -1012,7 +1156,7 @@ def sbol_3_overhang (ax, type, num, start, end, prev_end, scale, linewidth, opts
     ax.add_line(l_top)
     ax.add_line(l_bottom)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -1024,40 +1168,28 @@ def sbol_3_overhang (ax, type, num, start, end, prev_end, scale, linewidth, opts
         return prev_end, final_end
 
 
+sbol_blunt_restriction_site_options = OptionSchema('sbol_blunt_restriction_site', label_keys,
+    zorder_add=0.0, color=(0,0,0), site_space=1.5, start_pad=2.0, end_pad=2.0,
+    x_extent=1.5, y_extent=4.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_blunt_restriction_site (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL blunt-end restriction site renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    y_extent = 4.0
-    x_extent = 1.5
-    site_space = 1.5
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'site_space' in list(opts.keys()):
-            site_space = opts['site_space']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_blunt_restriction_site_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    site_space = o.site_space
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     
     # Direction is meaningless for this part => start is always < end
     if start > end:
@@ -1072,19 +1204,19 @@ def sbol_blunt_restriction_site (ax, type, num, start, end, prev_end, scale, lin
     end = start+x_extent+site_space+x_extent
     final_end = end+end_pad
     
-    l1        = Line2D([start+x_extent,start+x_extent],[-y_extent,y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l1_top    = Line2D([start,start+x_extent],[y_extent,y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l1_bottom = Line2D([start,start+x_extent],[-y_extent,-y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-
-    l2        = Line2D([end-x_extent,end-x_extent],[-y_extent,y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l2_top    = Line2D([end,end-x_extent],[y_extent,y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l2_bottom = Line2D([end,end-x_extent],[-y_extent,-y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1        = mitered_line([start+x_extent,start+x_extent],[-y_extent,y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1_top    = mitered_line([start,start+x_extent],[y_extent,y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1_bottom = mitered_line([start,start+x_extent],[-y_extent,-y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+
+    l2        = mitered_line([end-x_extent,end-x_extent],[-y_extent,y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l2_top    = mitered_line([end,end-x_extent],[y_extent,y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l2_bottom = mitered_line([end,end-x_extent],[-y_extent,-y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
     
     ax.add_line(l1)
     ax.add_line(l1_top)
@@ -1093,49 +1225,36 @@ def sbol_blunt_restriction_site (ax, type, num, start, end, prev_end, scale, lin
     ax.add_line(l2_top)
     ax.add_line(l2_bottom)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         write_label(ax, opts['label'], final_start+((final_end-final_start)/2.0), opts=opts)
 
     return final_start, final_end
 
 
+sbol_primer_binding_site_options = OptionSchema('sbol_primer_binding_site', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=2.0, x_extent=8.0,
+    y_extent=2.0, y_offset=1.5, arrowhead_length=2.0, linestyle='-',
+    linewidth=None, scale=None)
+
+
 def sbol_primer_binding_site (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL primer binding site renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    y_extent = 2.0
-    y_offset = 1.5
-    x_extent = 8.0
-    arrowhead_length = 2.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'y_offset' in list(opts.keys()):
-            y_offset = opts['y_offset']
-        if 'arrowhead_length' in list(opts.keys()):
-            arrowhead_length = opts['arrowhead_length']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_primer_binding_site_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    y_offset = o.y_offset
+    arrowhead_length = o.arrowhead_length
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     
     direction = 'F'
     if start > end:
@@ -1171,7 +1290,7 @@ def sbol_primer_binding_site (ax, type, num, start, end, prev_end, scale, linewi
         patch = PathPatch(path, lw=linewidth, edgecolor=color, facecolor=(1,1,1), zorder=1+zorder_add)
         ax.add_patch(patch)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if start > end:
             write_label(ax, opts['label'], end+((start-end)/2.0), opts=opts)
         else:
@@ -1183,40 +1302,28 @@ def sbol_primer_binding_site (ax, type, num, start, end, prev_end, scale, linewi
         return prev_end, final_end
 
 
+sbol_5_sticky_restriction_site_options = OptionSchema('sbol_5_sticky_restriction_site', label_keys,
+    zorder_add=0.0, color=(0,0,0), end_space=1.0, start_pad=2.0, end_pad=2.0,
+    x_extent=8.0, y_extent=4.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_5_sticky_restriction_site  (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL 5' sticky-end restriction site renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    y_extent = 4.0
-    x_extent = 8.0
-    end_space = 1.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'end_space' in list(opts.keys()):
-            end_space = opts['end_space']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_5_sticky_restriction_site_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    end_space = o.end_space
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     
     # Direction is meaningless for this part => start is always < end
     if start > end:
@@ -1231,12 +1338,12 @@ def sbol_5_sticky_restriction_site  (ax, type, num, start, end, prev_end, scale,
     end = start+end_space+x_extent+end_space
     final_end = end+end_pad
     
-    l1        = Line2D([start+end_space,start+end_space+x_extent],[0,0], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l1_top    = Line2D([start+end_space,start+end_space],[0,y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l1_bottom = Line2D([start+end_space+x_extent,start+end_space+x_extent],[0,-y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1        = mitered_line([start+end_space,start+end_space+x_extent],[0,0], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1_top    = mitered_line([start+end_space,start+end_space],[0,y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1_bottom = mitered_line([start+end_space+x_extent,start+end_space+x_extent],[0,-y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
     ax.add_line(l1)
     ax.add_line(l1_top)
     ax.add_line(l1_bottom)
@@ -1251,46 +1358,34 @@ def sbol_5_sticky_restriction_site  (ax, type, num, start, end, prev_end, scale,
 
     ax.add_patch(p1)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         write_label(ax, opts['label'], final_start+((final_end-final_start)/2.0), opts=opts)
 
     return final_start, final_end
 
 
+sbol_3_sticky_restriction_site_options = OptionSchema('sbol_3_sticky_restriction_site', label_keys,
+    zorder_add=0.0, color=(0,0,0), end_space=1.0, start_pad=2.0, end_pad=2.0,
+    x_extent=8.0, y_extent=4.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_3_sticky_restriction_site  (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL 3' sticky-end restriction site renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    y_extent = 4.0
-    x_extent = 8.0
-    end_space = 1.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'end_space' in list(opts.keys()):
-            end_space = opts['end_space']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_3_sticky_restriction_site_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    end_space = o.end_space
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     
     # Direction is meaningless for this part => start is always < end
     if start > end:
@@ -1305,12 +1400,12 @@ def sbol_3_sticky_restriction_site  (ax, type, num, start, end, prev_end, scale,
     end = start+end_space+x_extent+end_space
     final_end = end+end_pad
     
-    l1        = Line2D([start+end_space,start+end_space+x_extent],[0,0], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l1_top    = Line2D([start+end_space+x_extent,start+end_space+x_extent],[0,y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-    l1_bottom = Line2D([start+end_space,start+end_space],[0,-y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1        = mitered_line([start+end_space,start+end_space+x_extent],[0,0], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1_top    = mitered_line([start+end_space+x_extent,start+end_space+x_extent],[0,y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1_bottom = mitered_line([start+end_space,start+end_space],[0,-y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
     ax.add_line(l1)
     ax.add_line(l1_top)
     ax.add_line(l1_bottom)
@@ -1325,46 +1420,35 @@ def sbol_3_sticky_restriction_site  (ax, type, num, start, end, prev_end, scale,
 
     ax.add_patch(p1)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         write_label(ax, opts['label'], final_start+((final_end-final_start)/2.0), opts=opts)
 
     return final_start, final_end
 
 
+sbol_user_defined_options = OptionSchema('sbol_user_defined', label_keys,
+    zorder_add=0.0, color=(0,0,0), fill_color=(1,1,1), start_pad=2.0,
+    end_pad=2.0, x_extent=12.0, y_extent=3.0, linestyle='-', linewidth=None,
+    scale=None)
+
+
 def sbol_user_defined  (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL user-defined element renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 12.0
-    y_extent = 3.0
-    linestyle = '-'
-    fill_color = (1,1,1)
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'fill_color' in list(opts.keys()):
-            fill_color = opts['fill_color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_user_defined_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    fill_color = o.fill_color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -1383,7 +1467,7 @@ def sbol_user_defined  (ax, type, num, start, end, prev_end, scale, linewidth, o
 
     ax.add_patch(p1)
     
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -1395,40 +1479,29 @@ def sbol_user_defined  (ax, type, num, start, end, prev_end, scale, linewidth, o
         return prev_end, final_end
 
 
+sbol_signature_options = OptionSchema('sbol_signature', label_keys,
+    zorder_add=0.0, color=(0,0,0), fill_color=(1,1,1), start_pad=2.0,
+    end_pad=2.0, x_extent=12.0, y_extent=3.0, linestyle='-', linewidth=None,
+    scale=None)
+
+
 def sbol_signature  (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL signature renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 12.0
-    y_extent = 3.0
-    linestyle = '-'
-    fill_color = (1,1,1)
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'fill_color' in list(opts.keys()):
-            fill_color = opts['fill_color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_signature_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    fill_color = o.fill_color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     
     direction = 'F'
     if start > end:
@@ -1470,14 +1543,14 @@ def sbol_signature  (ax, type, num, start, end, prev_end, scale, linewidth, opts
         bot1y = -y_extent + indent_fac
         bot2x = start + cross_width
         bot2y = -y_extent + indent_fac
-        lcross1 = Line2D([top1x,bot2x],[top1y,bot2y], 
-                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-        lcross2 = Line2D([top2x,bot1x],[top2y,bot1y], 
-                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+        lcross1 = mitered_line([top1x,bot2x],[top1y,bot2y], 
+                                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+        lcross2 = mitered_line([top2x,bot1x],[top2y,bot1y], 
+                                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
         ax.add_line(lcross1)
         ax.add_line(lcross2)
-        lsign = Line2D([bot2x+indent_fac,end-indent_fac],[-y_extent+indent_fac,-y_extent+indent_fac], 
-                       linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+        lsign = mitered_line([bot2x+indent_fac,end-indent_fac],[-y_extent+indent_fac,-y_extent+indent_fac], 
+                             linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
         ax.add_line(lsign)
     else:
         p1 = Polygon([(start, y_extent), 
@@ -1495,17 +1568,17 @@ def sbol_signature  (ax, type, num, start, end, prev_end, scale, linewidth, opts
         bot1y = -y_extent + indent_fac
         bot2x = start - cross_width
         bot2y = -y_extent + indent_fac
-        lcross1 = Line2D([top1x,bot2x],[top1y,bot2y], 
-                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
-        lcross2 = Line2D([top2x,bot1x],[top2y,bot1y], 
-                          linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+        lcross1 = mitered_line([top1x,bot2x],[top1y,bot2y], 
+                                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+        lcross2 = mitered_line([top2x,bot1x],[top2y,bot1y], 
+                                linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
         ax.add_line(lcross1)
         ax.add_line(lcross2)
-        lsign = Line2D([bot2x-indent_fac,end+indent_fac],[y_extent-indent_fac,y_extent-indent_fac], 
-                       linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+        lsign = mitered_line([bot2x-indent_fac,end+indent_fac],[y_extent-indent_fac,y_extent-indent_fac], 
+                             linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
         ax.add_line(lsign)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -1517,34 +1590,26 @@ def sbol_signature  (ax, type, num, start, end, prev_end, scale, linewidth, opts
         return prev_end, final_end
 
 
+sbol_restriction_site_options = OptionSchema('sbol_restriction_site', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=2.0, y_extent=4.0,
+    linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_restriction_site (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL restriction site renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    y_extent = 4.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_restriction_site_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -1553,11 +1618,11 @@ def sbol_restriction_site (ax, type, num, start, end, prev_end, scale, linewidth
     end = start + linewidth
     final_end = end+end_pad
     
-    l1    = Line2D([start,start],[-y_extent,y_extent], 
-                   linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
+    l1    = mitered_line([start,start],[-y_extent,y_extent], 
+                         linewidth=linewidth, color=color, zorder=12+zorder_add, linestyle=linestyle)
     ax.add_line(l1)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -1569,40 +1634,28 @@ def sbol_restriction_site (ax, type, num, start, end, prev_end, scale, linewidth
         return prev_end, final_end
 
 
+sbol_spacer_options = OptionSchema('sbol_spacer', label_keys,
+    zorder_add=0.0, edgecolor=(0,0,0), color=(1,1,1), start_pad=2.0, end_pad=2.0,
+    x_extent=6.0, y_extent=6.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_spacer (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL spacer renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (1,1,1)
-    edgecolor = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 6.0
-    y_extent = 6.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'edgecolor' in list(opts.keys()):
-            edgecolor = opts['edgecolor']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_spacer_options.resolve(opts)
+    zorder_add = o.zorder_add
+    edgecolor = o.edgecolor
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -1616,10 +1669,10 @@ def sbol_spacer (ax, type, num, start, end, prev_end, scale, linewidth, opts):
 
     delta = radius - 0.5 * radius * math.sqrt(2)
 
-    l1 = Line2D([start+delta,end-delta],[radius-delta,-1*radius+delta], 
-                linewidth=linewidth, color=edgecolor, zorder=12+zorder_add, linestyle=linestyle)
-    l2 = Line2D([start+delta,end-delta],[-1*radius+delta,radius-delta], 
-                linewidth=linewidth, color=edgecolor, zorder=12+zorder_add, linestyle=linestyle)
+    l1 = mitered_line([start+delta,end-delta],[radius-delta,-1*radius+delta], 
+                      linewidth=linewidth, color=edgecolor, zorder=12+zorder_add, linestyle=linestyle)
+    l2 = mitered_line([start+delta,end-delta],[-1*radius+delta,radius-delta], 
+                      linewidth=linewidth, color=edgecolor, zorder=12+zorder_add, linestyle=linestyle)
     c1 = Circle(rbs_center, x_extent/2.0, linewidth=linewidth, edgecolor=edgecolor, 
                 facecolor=color, zorder=12+zorder_add)
     
@@ -1627,7 +1680,7 @@ def sbol_spacer (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     ax.add_line(l1)
     ax.add_line(l2)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -1639,37 +1692,27 @@ def sbol_spacer (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         return prev_end, final_end
 
 
+sbol_origin_options = OptionSchema('sbol_origin', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=2.0, x_extent=10.0,
+    y_extent=10.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_origin (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL origin renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 10.0
-    y_extent = 10.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_origin_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -1684,7 +1727,7 @@ def sbol_origin (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     
     ax.add_patch(c1)
     
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -1696,37 +1739,27 @@ def sbol_origin (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         return prev_end, final_end
 
 
+sbol_operator_options = OptionSchema('sbol_operator', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=2.0, x_extent=6.0,
+    y_extent=3.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_operator (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL operator renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 6.0
-    y_extent = 3.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_operator_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     final_end = end
     final_start = prev_end
@@ -1745,7 +1778,7 @@ def sbol_operator (ax, type, num, start, end, prev_end, scale, linewidth, opts):
 
     ax.add_patch(p1)
     
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -1757,37 +1790,27 @@ def sbol_operator (ax, type, num, start, end, prev_end, scale, linewidth, opts):
         return prev_end, final_end
 
 
+sbol_insulator_options = OptionSchema('sbol_insulator', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=2.0, x_extent=8.0,
+    y_extent=4.0, linestyle='-', linewidth=None, scale=None)
+
+
 def sbol_insulator (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL insulator renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 2.0
-    x_extent = 8.0
-    y_extent = 4.0
-    linestyle = '-'
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_insulator_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     
     # Check direction add start padding
     final_end = end
@@ -1820,7 +1843,7 @@ def sbol_insulator (ax, type, num, start, end, prev_end, scale, linewidth, opts)
     ax.add_patch(p1)
     ax.add_patch(p2)
     
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if final_start > final_end:
             write_label(ax, opts['label'], final_end+((final_start-final_end)/2.0), opts=opts)
         else:
@@ -1832,40 +1855,28 @@ def sbol_insulator (ax, type, num, start, end, prev_end, scale, linewidth, opts)
         return prev_end, final_end
 
 
+sbol_5_chromosomal_locus_options = OptionSchema('sbol_5_chromosomal_locus', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=0.0, end_pad=2.0, x_extent=18.0,
+    y_extent=7.5, linestyle='-', linewidth=None, scale=None, dashed_end=True)
+
+
 def sbol_5_chromosomal_locus  (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL 5' chromosomal locus renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 0.0
-    end_pad = 2.0
-    y_extent = 7.5
-    x_extent = 18.0
-    linestyle = '-'
-    dashed_end = True
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
-        if 'dashed_end' in list(opts.keys()):
-            dashed_end = opts['dashed_end']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_5_chromosomal_locus_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
+    dashed_end = o.dashed_end
 
     # Direction is meaningless for this part => start is always < end
     if start > end:
@@ -1933,46 +1944,34 @@ def sbol_5_chromosomal_locus  (ax, type, num, start, end, prev_end, scale, linew
 
     ax.add_patch(p1)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         write_label(ax, opts['label'], final_start+((final_end-final_start)/2.0), opts=opts)
 
     return final_start, final_end
 
 
+sbol_3_chromosomal_locus_options = OptionSchema('sbol_3_chromosomal_locus', label_keys,
+    zorder_add=0.0, color=(0,0,0), start_pad=2.0, end_pad=0.0, x_extent=18.0,
+    y_extent=7.5, linestyle='-', linewidth=None, scale=None, dashed_end=True)
+
+
 def sbol_3_chromosomal_locus  (ax, type, num, start, end, prev_end, scale, linewidth, opts):
     """ Built-in SBOL 3' chromosomal locus renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0,0,0)
-    start_pad = 2.0
-    end_pad = 0.0
-    y_extent = 7.5
-    x_extent = 18.0
-    linestyle = '-'
-    dashed_end = True
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
-        if 'dashed_end' in list(opts.keys()):
-            dashed_end = opts['dashed_end']
+    # Resolve options (defaults are set by the schema)
+    o = sbol_3_chromosomal_locus_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    x_extent = o.x_extent
+    y_extent = o.y_extent
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
+    dashed_end = o.dashed_end
 
     # Direction is meaningless for this part => start is always < end
     if start > end:
@@ -2040,45 +2039,34 @@ def sbol_3_chromosomal_locus  (ax, type, num, start, end, prev_end, scale, linew
 
     ax.add_patch(p1)
 
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         write_label(ax, opts['label'], final_start+((final_end-final_start)/2.0), opts=opts)
 
     return final_start, final_end
 
 
+temporary_repressor_options = OptionSchema('temporary_repressor', label_keys,
+    zorder_add=0.0, color=(0.7,0.7,0.7), start_pad=2.0, end_pad=2.0, y_extent=10,
+    x_extent=10, arrowhead_height=2, arrowhead_length=4, linewidth=None,
+    scale=None)
+
+
 # Not used at present
 def temporary_repressor (ax, type, num, start, end, prev_end, scale, linewidth, opts):
-    # Default options
-    zorder_add = 0.0
-    color = (0.7,0.7,0.7)
-    start_pad = 2.0
-    end_pad = 2.0
-    y_extent = 10
-    x_extent = 10
-    arrowhead_height = 2
-    arrowhead_length = 4
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'start_pad' in list(opts.keys()):
-            start_pad = opts['start_pad']
-        if 'end_pad' in list(opts.keys()):
-            end_pad = opts['end_pad']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'arrowhead_height' in list(opts.keys()):
-            arrowhead_height = opts['arrowhead_height']
-        if 'arrowhead_length' in list(opts.keys()):
-            arrowhead_length = opts['arrowhead_length']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = temporary_repressor_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    start_pad = o.start_pad
+    end_pad = o.end_pad
+    y_extent = o.y_extent
+    x_extent = o.x_extent
+    arrowhead_height = o.arrowhead_height
+    arrowhead_length = o.arrowhead_length
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     dir_fac = 1.0
     final_end = end
@@ -2133,47 +2121,31 @@ def connect (ax, type, num, from_part, to_part, scale, linewidth, arc_height_ind
     regulation(ax, type, num, from_part, to_part, scale, linewidth, arc_height_index, opts)
 
 
+regulation_options = OptionSchema('regulation', frozenset(),
+    color=(0.0,0.0,0.0), arrowhead_length=3, linestyle='-', linewidth=None, arc_height=None,
+    arc_height_const=15, arc_height_spacing=5, arc_height_start=10, arc_height_end=15.0,
+    arc_start_x_offset=0.0, arc_end_x_offset=0.0)
+
+
 def regulation (ax, type, num, from_part, to_part, scale, linewidth, arc_height_index, opts):
     """ General function for drawing regulation arcs.
     """
-
-    color = (0.0,0.0,0.0)
-    arrowhead_length = 3
-    linestyle = '-'
-    arcHeightConst = 15
-    arcHeightSpacing = 5
-    arcHeightStart = 10
-    arcHeight = arcHeightConst + arc_height_index*arcHeightSpacing
-    arcHeightEnd = arcHeightStart*1.5
-    arc_start_x_offset = 0.0
-    arc_end_x_offset = 0.0
-    
-    # Reset defaults if provided
-    if opts != None:
-        if 'arrowhead_length' in list(opts.keys()):
-            arrowhead_length = opts['arrowhead_length']
-        if 'linestyle' in list(opts.keys()):
-            linestyle = opts['linestyle']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'arc_height' in list(opts.keys()):
-            arcHeight = opts['arc_height']
-        if 'arc_height_const' in list(opts.keys()):
-            arcHeightConst = opts['arc_height_const']
-        if 'arc_height_spacing' in list(opts.keys()):
-            arcHeightSpacing = opts['arc_height_spacing']
-        if 'arc_height_start' in list(opts.keys()):
-            arcHeightStart = opts['arc_height_start']
-        if 'arc_height_end' in list(opts.keys()):
-            arcHeightEnd = opts['arc_height_end']
-        if 'arc_start_x_offset' in list(opts.keys()):
-            arc_start_x_offset = opts['arc_start_x_offset']
-        if 'arc_end_x_offset' in list(opts.keys()):
-            arc_end_x_offset = opts['arc_end_x_offset']
-
-    if opts == None or 'arc_height' not in list(opts.keys()):
+    # Resolve options (defaults are set by the schema)
+    o = regulation_options.resolve(opts)
+    color = o.color
+    arrowhead_length = o.arrowhead_length
+    linestyle = o.linestyle
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    arcHeightConst = o.arc_height_const
+    arcHeightSpacing = o.arc_height_spacing
+    arcHeightStart = o.arc_height_start
+    arcHeightEnd = o.arc_height_end
+    arc_start_x_offset = o.arc_start_x_offset
+    arc_end_x_offset = o.arc_end_x_offset
+    if o.arc_height != None:
+        arcHeight = o.arc_height
+    else:
         arcHeight = arcHeightConst + arc_height_index*arcHeightSpacing
     startHeight = arcHeightStart
 
@@ -2193,17 +2165,17 @@ def regulation (ax, type, num, from_part, to_part, scale, linewidth, arc_height_
         corr *= -1
 
 
-    line_away   = Line2D([start,start],[base,top], 
+    line_away   = mitered_line([start,start],[base,top], 
                 linewidth=linewidth, color=color, zorder=12, linestyle=linestyle)
-    line_across = Line2D([start,end],[top,top], 
+    line_across = mitered_line([start,end],[top,top], 
                 linewidth=linewidth, color=color, zorder=12, linestyle=linestyle)
-    line_toward = Line2D([end,end],[top,arcHeightEnd+corr], 
+    line_toward = mitered_line([end,end],[top,arcHeightEnd+corr], 
                 linewidth=linewidth, color=color, zorder=12, linestyle=linestyle)
-    line_rep    = Line2D([end-arrowhead_length,end+arrowhead_length],[arcHeightEnd,arcHeightEnd], 
+    line_rep    = mitered_line([end-arrowhead_length,end+arrowhead_length],[arcHeightEnd,arcHeightEnd], 
                 linewidth=linewidth, color=color, zorder=12, linestyle='-')
-    line_ind1   = Line2D([end-arrowhead_length,end],[arcHeightEnd+indHeight,arcHeightEnd], 
+    line_ind1   = mitered_line([end-arrowhead_length,end],[arcHeightEnd+indHeight,arcHeightEnd], 
                 linewidth=linewidth, color=color, zorder=12, linestyle='-')
-    line_ind2    = Line2D([end+arrowhead_length,end],[arcHeightEnd+indHeight,arcHeightEnd], 
+    line_ind2    = mitered_line([end+arrowhead_length,end],[arcHeightEnd+indHeight,arcHeightEnd], 
                 linewidth=linewidth, color=color, zorder=12, linestyle='-')
 
     if(type == 'Repression'):
@@ -2232,51 +2204,40 @@ def regulation (ax, type, num, from_part, to_part, scale, linewidth, arc_height_
 ###############################################################################
 
 
+trace_promoter_start_options = OptionSchema('trace_promoter_start', label_keys,
+    zorder_add=0.0, color=(0.0,0.0,1.0), y_offset=0.0, y_extent=6.0,
+    x_extent=30.0, arrowhead_height=0.5, arrowhead_length=15.0,
+    highlight_y_extent=0.8, linewidth=None, scale=None)
+
+
 def trace_promoter_start (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts):
     """ Built-in trace-based promoter renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0.0,0.0,1.0)
-    y_offset = 0.0
-    y_extent = 6.0
-    x_extent = 30.0
-    arrowhead_height = 0.5
-    arrowhead_length = 15.0
-    highlight_y_extent = 0.8
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'y_offset' in list(opts.keys()):
-            y_offset = opts['y_offset']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'arrowhead_height' in list(opts.keys()):
-            arrowhead_height = opts['arrowhead_height']
-        if 'arrowhead_length' in list(opts.keys()):
-            arrowhead_length = opts['arrowhead_length']
-        if 'highlight_y_extent' in list(opts.keys()):
-            highlight_y_extent = opts['highlight_y_extent']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = trace_promoter_start_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    y_offset = o.y_offset
+    y_extent = o.y_extent
+    x_extent = o.x_extent
+    arrowhead_height = o.arrowhead_height
+    arrowhead_length = o.arrowhead_length
+    highlight_y_extent = o.highlight_y_extent
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     dir_fac = 1.0
     if start_bp > end_bp:
         dir_fac = -1.0
         y_offset = -y_offset
     # Draw the promoter symbol
-    l1 = Line2D([start_bp,start_bp],[0+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, 
-                color=color, zorder=14+zorder_add)
-    l2 = Line2D([start_bp,start_bp+dir_fac*x_extent*scale-dir_fac*arrowhead_length*0.5*scale],
-                [dir_fac*y_extent+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, 
-                color=color, zorder=14+zorder_add)
+    l1 = mitered_line([start_bp,start_bp],[0+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, 
+                      color=color, zorder=14+zorder_add)
+    l2 = mitered_line([start_bp,start_bp+dir_fac*x_extent*scale-dir_fac*arrowhead_length*0.5*scale],
+                      [dir_fac*y_extent+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, 
+                      color=color, zorder=14+zorder_add)
     ax.add_line(l1)
     ax.add_line(l2)
     p1 = Polygon([(start_bp+dir_fac*x_extent*scale-dir_fac*arrowhead_length*scale, 
@@ -2294,7 +2255,7 @@ def trace_promoter_start (ax, type, num, start_bp, end_bp, prev_end, scale, line
                   (end_bp, -highlight_y_extent+y_offset)], facecolor=color, edgecolor=color, linewidth=linewidth, zorder=14+zorder_add, 
                   path_effects=[Stroke(joinstyle="miter")]) # This is a work around for matplotlib < 1.4.0)
     ax.add_patch(p2)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if start_bp > end_bp:
             write_label(ax, opts['label'], end_bp+((start_bp-end_bp)/2.0), opts=opts)
         else:
@@ -2304,51 +2265,40 @@ def trace_promoter_start (ax, type, num, start_bp, end_bp, prev_end, scale, line
     else:
         return start_bp, end_bp
 
+trace_promoter_options = OptionSchema('trace_promoter', label_keys,
+    zorder_add=0.0, color=(0.0,0.0,1.0), y_offset=0.0, y_extent=6.0,
+    x_extent=30.0, arrowhead_height=0.5, arrowhead_length=15.0,
+    highlight_y_extent=0.8, linewidth=None, scale=None)
+
+
 def trace_promoter (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts):
     """ Built-in trace-based promoter renderer with arrow at TSS.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0.0,0.0,1.0)
-    y_offset = 0.0
-    y_extent = 6.0
-    x_extent = 30.0
-    arrowhead_height = 0.5
-    arrowhead_length = 15.0
-    highlight_y_extent = 0.8
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'y_offset' in list(opts.keys()):
-            y_offset = opts['y_offset']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'arrowhead_height' in list(opts.keys()):
-            arrowhead_height = opts['arrowhead_height']
-        if 'arrowhead_length' in list(opts.keys()):
-            arrowhead_length = opts['arrowhead_length']
-        if 'highlight_y_extent' in list(opts.keys()):
-            highlight_y_extent = opts['highlight_y_extent']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = trace_promoter_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    y_offset = o.y_offset
+    y_extent = o.y_extent
+    x_extent = o.x_extent
+    arrowhead_height = o.arrowhead_height
+    arrowhead_length = o.arrowhead_length
+    highlight_y_extent = o.highlight_y_extent
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     dir_fac = 1.0
     if start_bp > end_bp:
         dir_fac = -1.0
         y_offset = -y_offset
     # Draw the promoter symbol
-    l1 = Line2D([end_bp,end_bp],[0+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, 
-                color=color, zorder=14+zorder_add)
-    l2 = Line2D([end_bp,end_bp+dir_fac*x_extent*scale-dir_fac*arrowhead_length*0.5*scale],
-                [dir_fac*y_extent+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, 
-                color=color, zorder=14+zorder_add)
+    l1 = mitered_line([end_bp,end_bp],[0+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, 
+                      color=color, zorder=14+zorder_add)
+    l2 = mitered_line([end_bp,end_bp+dir_fac*x_extent*scale-dir_fac*arrowhead_length*0.5*scale],
+                      [dir_fac*y_extent+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, 
+                      color=color, zorder=14+zorder_add)
     ax.add_line(l1)
     ax.add_line(l2)
     p1 = Polygon([(end_bp+dir_fac*x_extent*scale-dir_fac*arrowhead_length*scale, 
@@ -2366,7 +2316,7 @@ def trace_promoter (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth,
                   (end_bp, -highlight_y_extent+y_offset)], facecolor=color, edgecolor=color, linewidth=linewidth, zorder=14+zorder_add, 
                   path_effects=[Stroke(joinstyle="miter")]) # This is a work around for matplotlib < 1.4.0)
     ax.add_patch(p2)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if start_bp > end_bp:
             write_label(ax, opts['label'], end_bp+((start_bp-end_bp)/2.0), opts=opts)
         else:
@@ -2377,40 +2327,32 @@ def trace_promoter (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth,
         return start_bp, end_bp
 
 
+trace_rbs_options = OptionSchema('trace_rbs', label_keys,
+    zorder_add=0.0, color=(0.16,0.68,0.15), y_offset=0.0, y_extent=3.5,
+    x_extent=10.0, highlight_y_extent=0.8, linewidth=None, scale=None)
+
+
 def trace_rbs (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts):
     """ Built-in trace-based ribosome binding site renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0.16,0.68,0.15)
-    y_offset = 0.0
-    y_extent = 3.5
-    x_extent = 10.0
-    highlight_y_extent = 0.8
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'y_offset' in list(opts.keys()):
-            y_offset = opts['y_offset']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'highlight_y_extent' in list(opts.keys()):
-            highlight_y_extent = opts['highlight_y_extent']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = trace_rbs_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    y_offset = o.y_offset
+    y_extent = o.y_extent
+    x_extent = o.x_extent
+    highlight_y_extent = o.highlight_y_extent
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     dir_fac = 1.0
     if start_bp > end_bp:
         dir_fac = -1.0
     # Draw the RBS symbol
-    l1 = Line2D([start_bp,start_bp],[0+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, color=color, zorder=14+zorder_add)
+    l1 = mitered_line([start_bp,start_bp],[0+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, color=color, zorder=14+zorder_add)
     ax.add_line(l1)
     c1 = Ellipse((start_bp,dir_fac*y_extent+y_offset),width=(x_extent*scale),height=y_extent*0.4,color=color, zorder=14+zorder_add)
     ax.add_artist(c1)
@@ -2421,7 +2363,7 @@ def trace_rbs (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts
                   (end_bp, -highlight_y_extent+y_offset)], facecolor=color, edgecolor=color, linewidth=linewidth, zorder=14+zorder_add, 
                   path_effects=[Stroke(joinstyle="miter")]) # This is a work around for matplotlib < 1.4.0)
     ax.add_patch(p2)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if start_bp > end_bp:
             write_label(ax, opts['label'], end_bp+((start_bp-end_bp)/2.0), opts=opts)
         else:
@@ -2432,31 +2374,25 @@ def trace_rbs (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts
         return start_bp, end_bp
 
 
+trace_user_defined_options = OptionSchema('trace_user_defined', label_keys,
+    zorder_add=0.0, color=(0.7,0.7,0.7), hatch='', y_offset=0.0, y_extent=1.5,
+    linewidth=None, scale=None)
+
+
 def trace_user_defined (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts):
     """ Built-in trace-based user defined region renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0.7,0.7,0.7)
-    hatch = ''
-    y_offset = 0.0
-    y_extent = 1.5
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'hatch' in list(opts.keys()):
-            hatch = opts['hatch']
-        if 'y_offset' in list(opts.keys()):
-            y_offset = opts['y_offset']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = trace_user_defined_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    hatch = o.hatch
+    y_offset = o.y_offset
+    y_extent = o.y_extent
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     dir_fac = 1.0
     if start_bp > end_bp:
@@ -2470,7 +2406,7 @@ def trace_user_defined (ax, type, num, start_bp, end_bp, prev_end, scale, linewi
                   hatch=hatch, zorder=15+zorder_add, 
                   path_effects=[Stroke(joinstyle="miter")]) # This is a work around for matplotlib < 1.4.0)
     ax.add_patch(p1)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if start_bp > end_bp:
             write_label(ax, opts['label'], end_bp+((start_bp-end_bp)/2.0), opts=opts)
         else:
@@ -2481,37 +2417,27 @@ def trace_user_defined (ax, type, num, start_bp, end_bp, prev_end, scale, linewi
         return start_bp, end_bp
 
 
+trace_cds_options = OptionSchema('trace_cds', label_keys,
+    zorder_add=0.0, color=(0.7,0.7,0.7), hatch='', y_offset=0.0, y_extent=1.5,
+    arrowhead_height=1.0, arrowhead_length=30.0, linewidth=None, scale=None)
+
+
 def trace_cds (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts):
     """ Built-in trace-based coding sequence renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (0.7,0.7,0.7)
-    hatch = ''
-    y_offset = 0.0
-    y_extent = 1.5
-    arrowhead_height = 1.0
-    arrowhead_length = 30.0
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'hatch' in list(opts.keys()):
-            hatch = opts['hatch']
-        if 'y_offset' in list(opts.keys()):
-            y_offset = opts['y_offset']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'arrowhead_height' in list(opts.keys()):
-            arrowhead_height = opts['arrowhead_height']
-        if 'arrowhead_length' in list(opts.keys()):
-            arrowhead_length = opts['arrowhead_length']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = trace_cds_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    hatch = o.hatch
+    y_offset = o.y_offset
+    y_extent = o.y_extent
+    arrowhead_height = o.arrowhead_height
+    arrowhead_length = o.arrowhead_length
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     dir_fac = 1.0
     if start_bp > end_bp:
@@ -2528,7 +2454,7 @@ def trace_cds (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts
                   hatch=hatch, zorder=15+zorder_add, 
                   path_effects=[Stroke(joinstyle="miter")]) # This is a work around for matplotlib < 1.4.0)
     ax.add_patch(p1)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if start_bp > end_bp:
             write_label(ax, opts['label'], end_bp+((start_bp-end_bp)/2.0), opts=opts)
         else:
@@ -2539,41 +2465,33 @@ def trace_cds (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts
         return start_bp, end_bp
 
 
+trace_terminator_options = OptionSchema('trace_terminator', label_keys,
+    zorder_add=0.0, color=(1.0,0.0,0.0), y_offset=0.0, y_extent=3.5,
+    x_extent=10.0, highlight_y_extent=0.8, linewidth=None, scale=None)
+
+
 def trace_terminator (ax, type, num, start_bp, end_bp, prev_end, scale, linewidth, opts):
     """ Built-in trace-based terminator renderer.
     """
-    # Default options
-    zorder_add = 0.0
-    color = (1.0,0.0,0.0)
-    y_offset = 0.0
-    y_extent = 3.5
-    x_extent = 10.0
-    highlight_y_extent = 0.8
-    # Reset defaults if provided
-    if opts != None:
-        if 'zorder_add' in list(opts.keys()):
-            zorder_add = opts['zorder_add']
-        if 'color' in list(opts.keys()):
-            color = opts['color']
-        if 'y_offset' in list(opts.keys()):
-            y_offset = opts['y_offset']
-        if 'y_extent' in list(opts.keys()):
-            y_extent = opts['y_extent']
-        if 'x_extent' in list(opts.keys()):
-            x_extent = opts['x_extent']
-        if 'highlight_y_extent' in list(opts.keys()):
-            highlight_y_extent = opts['highlight_y_extent']
-        if 'linewidth' in list(opts.keys()):
-            linewidth = opts['linewidth']
-        if 'scale' in list(opts.keys()):
-            scale = opts['scale']
+    # Resolve options (defaults are set by the schema)
+    o = trace_terminator_options.resolve(opts)
+    zorder_add = o.zorder_add
+    color = o.color
+    y_offset = o.y_offset
+    y_extent = o.y_extent
+    x_extent = o.x_extent
+    highlight_y_extent = o.highlight_y_extent
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
     # Check direction add start padding
     dir_fac = 1.0
     if start_bp > end_bp:
         dir_fac = -1.0
     # Draw the terminator symbol
-    l1 = Line2D([start_bp,start_bp],[0+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, color=color, zorder=8+zorder_add)
-    l2 = Line2D([start_bp-(x_extent*scale),start_bp+(x_extent*scale)],[dir_fac*y_extent+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, color=color, zorder=14+zorder_add)
+    l1 = mitered_line([start_bp,start_bp],[0+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, color=color, zorder=8+zorder_add)
+    l2 = mitered_line([start_bp-(x_extent*scale),start_bp+(x_extent*scale)],[dir_fac*y_extent+y_offset,dir_fac*y_extent+y_offset], linewidth=linewidth, color=color, zorder=14+zorder_add)
     ax.add_line(l1)
     ax.add_line(l2)
     # Shade the terminator area (normally smaller than symbol extent)
@@ -2583,7 +2501,7 @@ def trace_terminator (ax, type, num, start_bp, end_bp, prev_end, scale, linewidt
                   (end_bp, -highlight_y_extent+y_offset)], facecolor=color, edgecolor=color, linewidth=linewidth, zorder=13, 
                   path_effects=[Stroke(joinstyle="miter")]) # This is a work around for matplotlib < 1.4.0)
     ax.add_patch(p2)
-    if opts != None and 'label' in list(opts.keys()):
+    if opts != None and 'label' in opts:
         if start_bp > end_bp:
             write_label(ax, opts['label'], end_bp+((start_bp-end_bp)/2.0), opts=opts)
         else:
@@ -2594,118 +2512,2291 @@ def trace_terminator (ax, type, num, start_bp, end_bp, prev_end, scale, linewidt
         return start_bp, end_bp
 
 ###############################################################################
-# The DNA renderer
+# Bulk trace renderers (many trace parts drawn as a few collections)
 ###############################################################################
 
 
-class DNARenderer:
-    """ Class defining the DNA rendering funtionality.
+def trace_highlights (starts, ends, y_offsets, highlight_y_extent):
+    """ Return the vertices (N x 4 x 2) of the shaded areas of trace parts.
     """
+    low = y_offsets-highlight_y_extent
+    high = y_offsets+highlight_y_extent
+    return np.stack([np.column_stack([starts, low]), np.column_stack([starts, high]),
+                     np.column_stack([ends, high]), np.column_stack([ends, low])], axis=1)
 
-    # Standard part types
-    STD_PART_TYPES = ['Promoter', 
-                      'CDS', 
-                      'Terminator',
-                      'RBS',
-                      'Scar',
-                      'Spacer',
-                      'EmptySpace',
-                      'Ribozyme',
-                      'Ribonuclease',
-                      'Protease',
-                      'DNACleavageSite',
-                      'RNACleavageSite',
-                      'ProteinCleavageSite',
-                      'DNALocation',
-                      'RNALocation',
-                      'ProteinLocation',
-                      'DNAStability',
-                      'RNAStability',
-                      'ProteinStability',
-                      'StemTop',
-                      'Operator',
-                      'Origin',
-                      'Insulator',
-                      '5Overhang',
-                      '3Overhang',
-                      'RestrictionSite',
-                      'BluntRestrictionSite',
-                      'PrimerBindingSite',
-                      '5StickyRestrictionSite',
-                      '3StickyRestrictionSite',
-                      '5ChromosomalLocus',
-                      '3ChromosomalLocus',
-                      'UserDefined',
-                      'Signature']
 
-    # Standard regulatory types
-    STD_REG_TYPES = ['Repression',
-                     'Activation',
-                     'Connection']
+def trace_segments (x0, y0, x1, y1):
+    """ Return the vertices (N x 2 x 2) of line segments.
+    """
+    return np.stack([np.column_stack([x0, y0]), np.column_stack([x1, y1])], axis=1)
 
-    def __init__(self, scale=1.0, linewidth=1.0, linecolor=(0,0,0), 
-                 backbone_pad_left=0.0, backbone_pad_right=0.0, circular_depth=15.0):
-        """ Constructor to generate an empty DNARenderer.
 
-        Parameters
-        ----------
-        scale : float (default=1.0)
-            A scaling factor for the plot. Only used if rendering traces.
+def add_trace_lines (ax, segments, colors, linewidth, zorder):
+    """ Add line segments drawn in the style of the trace renderer lines.
+    """
+    col = LineCollection(segments, colors=colors, linewidths=linewidth, zorder=zorder,
+                         capstyle=line_styles['solid_capstyle'], 
+                         joinstyle=line_styles['solid_joinstyle'])
+    ax.add_collection(col)
+    return col
 
-        linewidth : float (default=1.0)
-            The default linewidth for all part drawing.
 
-        backbone_pad_left : float (default=0.0)
-            Padding to add to the left side of the backbone.
+def add_trace_polygons (ax, polys, facecolors, edgecolors, linewidth, zorder, hatch=None):
+    """ Add polygons drawn in the style of the trace renderer polygons (mitered edges).
+    """
+    if hatch == '':
+        hatch = None
+    col = PolyCollection(polys, facecolors=facecolors, edgecolors=edgecolors, 
+                         linewidths=linewidth, zorder=zorder, hatch=hatch,
+                         capstyle='butt', joinstyle='miter')
+    ax.add_collection(col)
+    return col
 
-        backbone_pad_right : float (default=0.0)
-            Padding to add to the left side of the backbone.
 
-        circular_depth : float (default=15.0)
-            Depth of the closed-loop plasmid backbone.
-        """
-        self.scale = scale
-        self.linewidth = linewidth
-        self.linecolor = linecolor
-        self.backbone_pad_left = backbone_pad_left
-        self.backbone_pad_right = backbone_pad_right
-        self.circular_depth = circular_depth
-        self.reg_height = 15
+def bulk_trace_promoter (ax, starts, ends, colors, scale, linewidth, o, at_start=False):
+    """ Bulk version of trace_promoter (or trace_promoter_start if at_start=True).
+    """
+    dir_fac = np.where(starts > ends, -1.0, 1.0)
+    y_offsets = dir_fac*o.y_offset
+    x = ends
+    if at_start == True:
+        x = starts
+    top = dir_fac*o.y_extent+y_offsets
+    tip = x+dir_fac*(o.x_extent*scale)
+    back = x+dir_fac*o.x_extent*scale-dir_fac*o.arrowhead_length*scale
+    zorder = 14+o.zorder_add
+    lines = np.concatenate([trace_segments(x, y_offsets, x, top),
+                            trace_segments(x, top, x+dir_fac*o.x_extent*scale-dir_fac*o.arrowhead_length*0.5*scale, top)])
+    heads = np.stack([np.column_stack([back, top+o.arrowhead_height]), np.column_stack([tip, top]),
+                      np.column_stack([back, top-o.arrowhead_height])], axis=1)
+    return [add_trace_lines(ax, lines, np.concatenate([colors, colors]), linewidth, zorder),
+            add_trace_polygons(ax, heads, colors, colors, linewidth, zorder),
+            add_trace_polygons(ax, trace_highlights(starts, ends, y_offsets, o.highlight_y_extent), 
+                               colors, colors, linewidth, zorder)]
+
+
+def bulk_trace_promoter_start (ax, starts, ends, colors, scale, linewidth, o):
+    """ Bulk version of trace_promoter_start.
+    """
+    return bulk_trace_promoter(ax, starts, ends, colors, scale, linewidth, o, at_start=True)
 
-    def SBOL_part_renderers (self):
-        """ Return dictionary of all standard built-in SBOL part renderers.
-        """
-        return {
-            'Promoter'           :sbol_promoter, 
-            'CDS'                :sbol_cds, 
-            'Terminator'         :sbol_terminator,
-            'RBS'                :sbol_rbs,
-            'Scar'               :sbol_scar,
-            'Spacer'             :sbol_spacer,
-            'EmptySpace'         :sbol_empty_space,
-            'Ribozyme'           :sbol_ribozyme,
-            'Ribonuclease'       :sbol_stem_top,
-            'Protease'           :sbol_stem_top,
-            'DNACleavageSite'    :sbol_stem_top,
-            'RNACleavageSite'    :sbol_stem_top,
-            'ProteinCleavageSite':sbol_stem_top,
-            'DNALocation'        :sbol_stem_top,
-            'RNALocation'        :sbol_stem_top,
-            'ProteinLocation'    :sbol_stem_top,
-            'DNAStability'       :sbol_stem_top,
-            'RNAStability'       :sbol_stem_top,
-            'ProteinStability'   :sbol_stem_top,
-            'StemTop'            :sbol_stem_top,
-            'Operator'           :sbol_operator,
-            'Origin'             :sbol_origin,
-            'Insulator'          :sbol_insulator,
-            '5Overhang'          :sbol_5_overhang,
-            '3Overhang'          :sbol_3_overhang,
-            'RestrictionSite'    :sbol_restriction_site,
-            'BluntRestrictionSite'   :sbol_blunt_restriction_site,
-            'PrimerBindingSite'      :sbol_primer_binding_site,
-            '5StickyRestrictionSite' :sbol_5_sticky_restriction_site,
-            '3StickyRestrictionSite' :sbol_3_sticky_restriction_site,
+
+def bulk_trace_rbs (ax, starts, ends, colors, scale, linewidth, o):
+    """ Bulk version of trace_rbs.
+    """
+    dir_fac = np.where(starts > ends, -1.0, 1.0)
+    y_offsets = np.full(len(starts), float(o.y_offset))
+    top = dir_fac*o.y_extent+y_offsets
+    zorder = 14+o.zorder_add
+    # Ellipses are the unit circle path scaled and moved (as drawn by Ellipse)
+    circle = Path.unit_circle()
+    radii = np.array([o.x_extent*scale/2.0, o.y_extent*0.4/2.0])
+    paths = [Path(circle.vertices*radii+(x, y), circle.codes) 
+             for x, y in zip(starts.tolist(), top.tolist())]
+    ellipses = PathCollection(paths, facecolors=colors, edgecolors=colors, zorder=zorder,
+                              linewidths=matplotlib.rcParams['patch.linewidth'],
+                              capstyle='butt', joinstyle='miter')
+    cols = [add_trace_lines(ax, trace_segments(starts, y_offsets, starts, top), colors, linewidth, zorder)]
+    ax.add_collection(ellipses)
+    cols.append(ellipses)
+    cols.append(add_trace_polygons(ax, trace_highlights(starts, ends, y_offsets, o.highlight_y_extent), 
+                                   colors, colors, linewidth, zorder))
+    return cols
+
+
+def bulk_trace_user_defined (ax, starts, ends, colors, scale, linewidth, o):
+    """ Bulk version of trace_user_defined.
+    """
+    dir_fac = np.where(starts > ends, -1.0, 1.0)
+    y_offset = o.y_offset
+    n = len(starts)
+    low = np.full(n, -o.y_extent+y_offset)
+    high = np.full(n, o.y_extent+y_offset)
+    inner = ends-dir_fac*scale
+    polys = np.stack([np.column_stack([starts, high]), np.column_stack([starts, low]),
+                      np.column_stack([inner, low]), np.column_stack([inner, high])], axis=1)
+    return [add_trace_polygons(ax, polys, colors, [(0.0,0.0,0.0)], linewidth, 
+                               15+o.zorder_add, hatch=o.hatch)]
+
+
+def bulk_trace_cds (ax, starts, ends, colors, scale, linewidth, o):
+    """ Bulk version of trace_cds.
+    """
+    dir_fac = np.where(starts > ends, -1.0, 1.0)
+    y_offset = o.y_offset
+    n = len(starts)
+    inner = ends-dir_fac*o.arrowhead_length*scale
+    def column (x, y):
+        return np.column_stack([x, np.full(n, y)])
+    polys = np.stack([column(starts, o.y_extent+y_offset), 
+                      column(starts, -o.y_extent+y_offset),
+                      column(inner, -o.y_extent+y_offset),
+                      column(inner, -o.y_extent-o.arrowhead_height+y_offset),
+                      column(ends, 0+y_offset),
+                      column(inner, o.y_extent+o.arrowhead_height+y_offset),
+                      column(inner, o.y_extent+y_offset)], axis=1)
+    return [add_trace_polygons(ax, polys, colors, [(0.0,0.0,0.0)], linewidth, 
+                               15+o.zorder_add, hatch=o.hatch)]
+
+
+def bulk_trace_terminator (ax, starts, ends, colors, scale, linewidth, o):
+    """ Bulk version of trace_terminator.
+    """
+    dir_fac = np.where(starts > ends, -1.0, 1.0)
+    y_offsets = np.full(len(starts), float(o.y_offset))
+    top = dir_fac*o.y_extent+y_offsets
+    return [add_trace_lines(ax, trace_segments(starts, y_offsets, starts, top), colors, 
+                            linewidth, 8+o.zorder_add),
+            add_trace_lines(ax, trace_segments(starts-(o.x_extent*scale), top, starts+(o.x_extent*scale), top), 
+                            colors, linewidth, 14+o.zorder_add),
+            add_trace_polygons(ax, trace_highlights(starts, ends, y_offsets, o.highlight_y_extent), 
+                               colors, colors, linewidth, 13)]
+
+
+# Bulk version and options schema of each built-in trace renderer
+bulk_trace_renderers = {
+    trace_promoter       : (bulk_trace_promoter, trace_promoter_options),
+    trace_promoter_start : (bulk_trace_promoter_start, trace_promoter_start_options),
+    trace_rbs            : (bulk_trace_rbs, trace_rbs_options),
+    trace_user_defined   : (bulk_trace_user_defined, trace_user_defined_options),
+    trace_cds            : (bulk_trace_cds, trace_cds_options),
+    trace_terminator     : (bulk_trace_terminator, trace_terminator_options)}
+
+
+def draw_traces (ax, renderer, starts, ends, strands=None, colors=None, opts=None, 
+                 scale=1.0, linewidth=1.0):
+    """ Draw many parts of the same type with a built-in trace renderer as a few 
+    collections (one per zorder and kind of element), rather than one set of 
+    artists per part. Glyphs have the same shape as those drawn by the renderer.
+    Labels are not drawn.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes
+        Axes to draw the parts to.
+
+    renderer : function
+        The trace renderer the parts would be drawn by (e.g., trace_cds). Must be
+        a key of bulk_trace_renderers.
+
+    starts : array(float)
+        Start of each part (bp).
+
+    ends : array(float)
+        End of each part (bp).
+
+    strands : array(int) (default=None)
+        Strand of each part (1 or -1). Parts on strand -1 are drawn from end to
+        start. If None, parts with a start after their end are reversed (as for
+        the trace renderers).
+
+    colors : color or list(color) (default=None)
+        Color of every part, or each part. If None, the color in opts is used.
+
+    opts : dict (default=None)
+        Options shared by all parts (as for the renderer).
+
+    scale : float (default=1.0)
+        Scale of the glyphs (if not set in opts).
+
+    linewidth : float (default=1.0)
+        Linewidth of the glyphs (if not set in opts).
+
+    Returns
+    -------
+    collections : list(matplotlib.collections.Collection)
+        The collections added to the axes.
+    """
+    bulk_renderer, options = bulk_trace_renderers[renderer]
+    o = options.resolve(opts)
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    if len(starts) == 0:
+        return []
+    if strands is not None:
+        reverse = np.asarray(strands) < 0
+        starts, ends = np.where(reverse, ends, starts), np.where(reverse, starts, ends)
+    if colors is None:
+        colors = o.color
+    colors = to_rgba_array(colors)
+    if len(colors) == 1:
+        colors = np.repeat(colors, len(starts), axis=0)
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    if o.scale != None:
+        scale = o.scale
+    return bulk_renderer(ax, starts, ends, colors, scale, linewidth, o)
+
+
+def bulk_trace_groups (layout, part_nums):
+    """ Group the parts of a layout that can be drawn by draw_traces: parts drawn
+    by a built-in trace renderer without a label. Parts are grouped by renderer
+    and options (other than color).
+
+    Returns
+    -------
+    remaining : array(int)
+        The parts that must be drawn individually.
+
+    groups : dict((renderer, options) : list(int))
+        The parts of each group (in drawing order).
+    """
+    remaining = []
+    groups = OrderedDict()
+    for part_num in part_nums.tolist():
+        part = layout.parts[part_num]
+        renderer = layout.part_renderers.get(part['type'])
+        opts = part.get('opts')
+        if 'renderer' in part or renderer not in bulk_trace_renderers or \
+           (opts != None and 'label' in opts):
+            remaining.append(part_num)
+            continue
+        options = bulk_trace_renderers[renderer][1]
+        o = options.resolve(opts)
+        key = (renderer, tuple(getattr(o, k) for k in options.defaults if k != 'color'))
+        try:
+            groups.setdefault(key, []).append(part_num)
+        except TypeError:
+            # Options that can't be compared (e.g., lists)
+            remaining.append(part_num)
+    return np.array(remaining, dtype=int), groups
+
+
+###############################################################################
+# Part layout functions (part extents computed without drawing)
+###############################################################################
+
+
+def sbol_layout (options, directional=True):
+    """ Create a layout function for an SBOL renderer whose glyph occupies 
+    start_pad+x_extent+end_pad along the backbone (options is the schema of the
+    renderer). The arithmetic mirrors the renderers so positions are identical
+    to those found when drawing.
+    """
+    def layout (type, num, start, end, prev_end, scale, linewidth, opts):
+        o = options.resolve(opts)
+        if directional and start > end:
+            return prev_end, prev_end+o.end_pad+o.x_extent+o.start_pad
+        return prev_end, prev_end+o.start_pad+o.x_extent+o.end_pad
+    return layout
+
+
+def sbol_empty_space_layout (type, num, start, end, prev_end, scale, linewidth, opts):
+    """ Layout function for the empty space renderer.
+    """
+    return prev_end, prev_end+sbol_empty_space_options.resolve(opts).x_extent
+
+
+def sbol_blunt_restriction_site_layout (type, num, start, end, prev_end, scale, linewidth, opts):
+    """ Layout function for the blunt-end restriction site renderer.
+    """
+    o = sbol_blunt_restriction_site_options.resolve(opts)
+    start = prev_end+o.start_pad
+    end = start+o.x_extent+o.site_space+o.x_extent
+    return prev_end, end+o.end_pad
+
+
+def sbol_sticky_restriction_site_layout (options):
+    """ Create a layout function for the 5' or 3' sticky-end restriction site 
+    renderer (options is the schema of the renderer).
+    """
+    def layout (type, num, start, end, prev_end, scale, linewidth, opts):
+        o = options.resolve(opts)
+        start = prev_end+o.start_pad
+        end = start+o.end_space+o.x_extent+o.end_space
+        return prev_end, end+o.end_pad
+    return layout
+
+
+def sbol_restriction_site_layout (type, num, start, end, prev_end, scale, linewidth, opts):
+    """ Layout function for the restriction site renderer (width set by linewidth).
+    """
+    o = sbol_restriction_site_options.resolve(opts)
+    if o.linewidth != None:
+        linewidth = o.linewidth
+    start = prev_end+o.start_pad
+    end = start+linewidth
+    return prev_end, end+o.end_pad
+
+
+def trace_layout (type, num, start_bp, end_bp, prev_end, scale, linewidth, opts):
+    """ Layout function for trace renderers (parts sit at their bp coordinates).
+    """
+    if start_bp > end_bp:
+        return end_bp, start_bp
+    else:
+        return start_bp, end_bp
+
+
+# Layout function for each built-in renderer. Renderers missing from this map
+# (e.g., user defined) are laid out by drawing them to a NullAxes.
+part_layouts = {
+    sbol_promoter                 : sbol_layout(sbol_promoter_options),
+    sbol_cds                      : sbol_layout(sbol_cds_options),
+    sbol_terminator               : sbol_layout(sbol_terminator_options),
+    sbol_rbs                      : sbol_layout(sbol_rbs_options),
+    sbol_ribozyme                 : sbol_layout(stick_figure_options),
+    stick_figure                  : sbol_layout(stick_figure_options),
+    sbol_stem_top                 : sbol_layout(sbol_stem_top_options),
+    sbol_scar                     : sbol_layout(sbol_scar_options, directional=False),
+    sbol_empty_space              : sbol_empty_space_layout,
+    sbol_5_overhang               : sbol_layout(sbol_5_overhang_options, directional=False),
+    sbol_3_overhang               : sbol_layout(sbol_3_overhang_options, directional=False),
+    sbol_blunt_restriction_site   : sbol_blunt_restriction_site_layout,
+    sbol_primer_binding_site      : sbol_layout(sbol_primer_binding_site_options),
+    sbol_5_sticky_restriction_site: sbol_sticky_restriction_site_layout(sbol_5_sticky_restriction_site_options),
+    sbol_3_sticky_restriction_site: sbol_sticky_restriction_site_layout(sbol_3_sticky_restriction_site_options),
+    sbol_user_defined             : sbol_layout(sbol_user_defined_options, directional=False),
+    sbol_signature                : sbol_layout(sbol_signature_options),
+    sbol_restriction_site         : sbol_restriction_site_layout,
+    sbol_spacer                   : sbol_layout(sbol_spacer_options, directional=False),
+    sbol_origin                   : sbol_layout(sbol_origin_options, directional=False),
+    sbol_operator                 : sbol_layout(sbol_operator_options, directional=False),
+    sbol_insulator                : sbol_layout(sbol_insulator_options, directional=False),
+    sbol_5_chromosomal_locus      : sbol_layout(sbol_5_chromosomal_locus_options, directional=False),
+    sbol_3_chromosomal_locus      : sbol_layout(sbol_3_chromosomal_locus_options, directional=False),
+    trace_promoter_start          : trace_layout,
+    trace_promoter                : trace_layout,
+    trace_rbs                     : trace_layout,
+    trace_user_defined            : trace_layout,
+    trace_cds                     : trace_layout,
+    trace_terminator              : trace_layout}
+
+# Options schema of each built-in renderer (used to find the color a part was drawn with)
+renderer_options = {
+    sbol_promoter                 : sbol_promoter_options,
+    sbol_cds                      : sbol_cds_options,
+    sbol_terminator               : sbol_terminator_options,
+    sbol_rbs                      : sbol_rbs_options,
+    sbol_ribozyme                 : stick_figure_options,
+    stick_figure                  : stick_figure_options,
+    sbol_stem_top                 : sbol_stem_top_options,
+    sbol_scar                     : sbol_scar_options,
+    sbol_empty_space              : sbol_empty_space_options,
+    sbol_5_overhang               : sbol_5_overhang_options,
+    sbol_3_overhang               : sbol_3_overhang_options,
+    sbol_blunt_restriction_site   : sbol_blunt_restriction_site_options,
+    sbol_primer_binding_site      : sbol_primer_binding_site_options,
+    sbol_5_sticky_restriction_site: sbol_5_sticky_restriction_site_options,
+    sbol_3_sticky_restriction_site: sbol_3_sticky_restriction_site_options,
+    sbol_user_defined             : sbol_user_defined_options,
+    sbol_signature                : sbol_signature_options,
+    sbol_restriction_site         : sbol_restriction_site_options,
+    sbol_spacer                   : sbol_spacer_options,
+    sbol_origin                   : sbol_origin_options,
+    sbol_operator                 : sbol_operator_options,
+    sbol_insulator                : sbol_insulator_options,
+    sbol_5_chromosomal_locus      : sbol_5_chromosomal_locus_options,
+    sbol_3_chromosomal_locus      : sbol_3_chromosomal_locus_options,
+    temporary_repressor           : temporary_repressor_options,
+    repress                       : regulation_options,
+    induce                        : regulation_options,
+    connect                       : regulation_options,
+    regulation                    : regulation_options,
+    trace_promoter_start          : trace_promoter_start_options,
+    trace_promoter                : trace_promoter_options,
+    trace_rbs                     : trace_rbs_options,
+    trace_user_defined            : trace_user_defined_options,
+    trace_cds                     : trace_cds_options,
+    trace_terminator              : trace_terminator_options}
+
+
+class _MaxTree:
+    """ Segment tree over integer positions 0..size-1 supporting "raise every
+    position in a range to at least v" and "max over a range" in O(log n).
+    """
+
+    def __init__ (self, size):
+        self.size = max(size, 1)
+        self.tag = [0]*(4*self.size)
+        self.best = [0]*(4*self.size)
+
+    def update (self, l, r, v, node=1, lo=0, hi=None):
+        if hi == None:
+            hi = self.size-1
+        if r < lo or hi < l:
+            return
+        if v > self.best[node]:
+            self.best[node] = v
+        if l <= lo and hi <= r:
+            if v > self.tag[node]:
+                self.tag[node] = v
+            return
+        mid = (lo+hi)//2
+        self.update(l, r, v, 2*node, lo, mid)
+        self.update(l, r, v, 2*node+1, mid+1, hi)
+
+    def query (self, l, r, node=1, lo=0, hi=None):
+        if hi == None:
+            hi = self.size-1
+        if r < lo or hi < l:
+            return 0
+        if l <= lo and hi <= r:
+            return self.best[node]
+        mid = (lo+hi)//2
+        return max(self.tag[node], self.query(l, r, 2*node, lo, mid),
+                   self.query(l, r, 2*node+1, mid+1, hi))
+
+
+def assign_arc_heights (arc_starts, arc_ends, above=None):
+    """ Assign a height index to regulation arcs so that arcs which overlap are
+    stacked rather than drawn on top of one another.
+
+    Arcs are placed from shortest to longest (ties keep their input order). An
+    arc that overlaps no previously placed arc on the same side of the backbone
+    gets index 1, otherwise it is placed one above the highest arc it overlaps.
+    Two arcs overlap if their open x-ranges intersect. Rather than checking
+    every earlier arc, placed arcs are held in segment trees over the sorted arc
+    end points, so n arcs are placed in O(n log n) time.
+
+    Parameters
+    ----------
+    arc_starts, arc_ends : array_like(float)
+        The x-points each arc starts and ends at (in either order).
+
+    above : array_like(bool) (default=None)
+        True for arcs drawn above the backbone (to_part is forward) and False for
+        those drawn below. Arcs on different sides never clash. If None, all arcs
+        are taken to be above the backbone.
+
+    Returns
+    -------
+    heights : numpy.ndarray(int)
+        The arc height index of each arc (in the input order). Arcs with a NaN
+        end point are given index 1.
+    """
+    arc_starts = np.asarray(arc_starts, dtype=float)
+    arc_ends = np.asarray(arc_ends, dtype=float)
+    arc_min = np.minimum(arc_starts, arc_ends)
+    arc_max = np.maximum(arc_starts, arc_ends)
+    if above is None:
+        above = np.ones(len(arc_min), dtype=bool)
+    else:
+        above = np.asarray(above, dtype=bool)
+    # Arcs with undefined end points never clash
+    heights = np.ones(len(arc_min), dtype=int)
+    placed = np.flatnonzero(np.isfinite(arc_min) & np.isfinite(arc_max))
+    if len(placed) == 0:
+        return heights
+    # Compress the arc end points: point k maps to position 2k and the gap
+    # between points k and k+1 to position 2k+1
+    points = np.unique(np.concatenate([arc_min[placed], arc_max[placed]]))
+    lo = 2*np.searchsorted(points, arc_min)
+    hi = 2*np.searchsorted(points, arc_max)
+    num_pos = 2*len(points)-1
+    # Zero length arcs are only clashed with by arcs that strictly contain them,
+    # so they are tracked separately to the arcs with a length
+    trees = {}
+    for side in (True, False):
+        trees[side] = (_MaxTree(num_pos), _MaxTree(num_pos))
+    order = placed[np.argsort(arc_max[placed]-arc_min[placed], kind='stable')]
+    for i in order:
+        spans, dots = trees[bool(above[i])]
+        if lo[i] == hi[i]:
+            clash = spans.query(lo[i], lo[i])
+        else:
+            clash = max(spans.query(lo[i]+1, hi[i]-1), dots.query(lo[i]+1, hi[i]-1))
+        if clash != 0:
+            heights[i] = clash+1
+        if lo[i] == hi[i]:
+            dots.update(lo[i], lo[i], heights[i])
+        else:
+            spans.update(lo[i]+1, hi[i]-1, heights[i])
+    return heights
+
+
+class IntervalIndex:
+    """ Index of x-ranges (sorted by their left edge) to find the ranges
+    overlapping a region in O(log n + k), where k is the number of ranges 
+    starting within the widest range of the region.
+    """
+
+    def __init__ (self, intervals):
+        """ Constructor to index a set of ranges.
+
+        Parameters
+        ----------
+        intervals : numpy.ndarray(float, shape=(n, 2))
+            The ends of each range (in any order). Rows holding NaN are not indexed.
+        """
+        intervals = np.asarray(intervals, dtype=float).reshape(-1, 2)
+        left = np.fmin(intervals[:,0], intervals[:,1])
+        right = np.fmax(intervals[:,0], intervals[:,1])
+        valid = np.flatnonzero(~np.isnan(left))
+        self.order = valid[np.argsort(left[valid], kind='stable')]
+        self.left = left[self.order]
+        self.right = right[self.order]
+        self.max_width = 0.0
+        if len(self.order) > 0:
+            self.max_width = float(np.max(self.right-self.left))
+
+    def __len__ (self):
+        return len(self.order)
+
+    def overlapping (self, x_min, x_max):
+        """ Return the (sorted) indices of the ranges overlapping [x_min, x_max].
+        """
+        lo = np.searchsorted(self.left, x_min-self.max_width, side='left')
+        hi = np.searchsorted(self.left, x_max, side='right')
+        hits = self.order[lo:hi][self.right[lo:hi] >= x_min]
+        return np.sort(hits)
+
+
+class NullAxes:
+    """ Axes stand-in that discards everything drawn to it. Used to find the
+    extent of parts drawn by renderers that have no layout function.
+    """
+
+    def __getattr__(self, name):
+        return self._discard
+
+    def _discard (self, *args, **kwargs):
+        return None
+
+
+class Layout:
+    """ Immutable result of DNARenderer.compute_layout(). Holds the position of
+    every part and the arc height of every regulation of a design, computed
+    without creating any matplotlib artists. All arrays are read-only and
+    indexed in the same order as the parts and regs passed in.
+
+    Attributes
+    ----------
+    start, end : numpy.ndarray(float)
+        Coordinates of each part after layout (the values renderDNA writes back
+        to the part dicts). Reverse parts have start > end. NaN for parts
+        without a type.
+
+    strand : numpy.ndarray(int)
+        +1 for forward parts, -1 for reverse parts and 0 for parts without a type.
+
+    extent : numpy.ndarray(float, shape=(n, 2))
+        The [left, right] x-range occupied by each drawn part. NaN if not drawn.
+
+    drawn : numpy.ndarray(bool)
+        True for parts that have a renderer and are drawn.
+
+    reg_span : numpy.ndarray(float, shape=(m, 2))
+        The x-points each regulation arc starts and ends at. NaN if not drawn.
+
+    reg_heights : numpy.ndarray(int)
+        Arc height index assigned to each regulation (0 if it is not drawn).
+
+    reg_order : numpy.ndarray(int)
+        Indices of the regulation in the order they are drawn (shortest first).
+
+    design_start, design_end : float
+        The x-points where the design begins and ends.
+    """
+
+    __slots__ = ('parts', 'regs', 'part_renderers', 'reg_renderers', 'start', 'end',
+                 'strand', 'extent', 'drawn', 'reg_span', 'reg_heights', 'reg_order',
+                 'design_start', 'design_end', '_coords', '_prev_end', '_part_nums',
+                 '_reg_rank', '_part_intervals', '_reg_intervals')
+
+    def __init__ (self, **fields):
+        for name in self.__slots__:
+            value = fields[name]
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+            object.__setattr__(self, name, value)
+
+    def __setattr__ (self, name, value):
+        raise AttributeError('Layout objects are immutable')
+
+    def __len__ (self):
+        return len(self.parts)
+
+    def parts_in (self, x_min, x_max):
+        """ Return the indices of the drawn parts overlapping an x-range.
+        """
+        return self._part_intervals.overlapping(x_min, x_max)
+
+    def regs_in (self, x_min, x_max):
+        """ Return the indices of the drawn regulation whose arcs overlap an 
+        x-range (in drawing order).
+        """
+        regs = self._reg_intervals.overlapping(x_min, x_max)
+        return regs[np.argsort(self._reg_rank[regs], kind='stable')]
+
+    def bounds (self, points_per_unit=None):
+        """ Estimate the region covered by the drawn design (not including any
+        backbone padding) without drawing or measuring artists. Parts span their 
+        extent and the y_extent and arrowhead_height of their options (about 
+        y_offset), regulation arcs reach their height, and labels (if 
+        points_per_unit is given) are sized from their text and font size.
+
+        Parameters
+        ----------
+        points_per_unit : float (default=None)
+            Size of one axes unit in points (e.g., 72/70 when drawn at 70 units
+            per inch). If None, labels are not included.
+
+        Returns
+        -------
+        bounds : numpy.ndarray(float)
+            [x_min, x_max, y_min, y_max] in axes units.
+        """
+        x_min = min(self.design_start, self.design_end)
+        x_max = max(self.design_start, self.design_end)
+        y_min = 0.0
+        y_max = 0.0
+        for part_num in np.flatnonzero(self.drawn).tolist():
+            part = self.parts[part_num]
+            left, right = self.extent[part_num].tolist()
+            x_min = min(x_min, left)
+            x_max = max(x_max, right)
+            opts = part.get('opts')
+            schema = None
+            if 'renderer' not in part:
+                schema = renderer_options.get(self.part_renderers.get(part['type']))
+            if schema != None:
+                o = schema.resolve(opts)
+                height = getattr(o, 'y_extent', 0.0) + getattr(o, 'arrowhead_height', 0.0)
+                y_offset = getattr(o, 'y_offset', 0.0)
+                y_min = min(y_min, y_offset-height)
+                y_max = max(y_max, y_offset+height)
+            if points_per_unit != None and opts != None and 'label' in opts:
+                lo = label_options.resolve(opts)
+                x = (left+right)/2.0 + lo.label_x_offset
+                y = lo.label_y_offset + lo.y_offset
+                # Average character width and line height of the font
+                half_w = 0.3*lo.label_size*len(str(opts['label']))/points_per_unit
+                half_h = 0.6*lo.label_size/points_per_unit
+                if lo.label_rotation % 180 == 90:
+                    half_w, half_h = half_h, half_w
+                elif lo.label_rotation % 180 != 0:
+                    half_w = half_h = max(half_w, half_h)
+                x_min = min(x_min, x-half_w)
+                x_max = max(x_max, x+half_w)
+                y_min = min(y_min, y-half_h)
+                y_max = max(y_max, y+half_h)
+        for r in self.reg_order.tolist():
+            reg = self.regs[r]
+            schema = renderer_options.get(self.reg_renderers[reg['type']])
+            if schema == None:
+                continue
+            o = schema.resolve(reg.get('opts'))
+            if o.arc_height != None:
+                top = o.arc_height
+            else:
+                top = o.arc_height_const + int(self.reg_heights[r])*o.arc_height_spacing
+            top = max(top, o.arc_height_end+o.arrowhead_length)
+            x_min = min(x_min, float(self.reg_span[r].min())-o.arrowhead_length)
+            x_max = max(x_max, float(self.reg_span[r].max())+o.arrowhead_length)
+            if reg['to_part'].get('fwd', True) == False:
+                y_min = min(y_min, -top)
+            else:
+                y_max = max(y_max, top)
+        return np.array([x_min, x_max, y_min, y_max])
+
+
+###############################################################################
+# Collection based drawing (batches part glyphs into a few artists)
+###############################################################################
+
+
+def patch_style (p):
+    """ Style used to batch a patch into a PathCollection. The first element
+    is the key of the collection the patch belongs to.
+    """
+    key = ('patch', p.get_zorder(), p.get_capstyle(), p.get_joinstyle())
+    return key, p.get_facecolor(), p.get_edgecolor(), p.get_linewidth(), p.get_linestyle()
+
+
+def line_style (l):
+    """ Style used to batch a line into a LineCollection. The first element
+    is the key of the collection the line belongs to.
+    """
+    if l.is_dashed():
+        key = ('line', l.get_zorder(), l.get_dash_capstyle(), l.get_dash_joinstyle())
+    else:
+        key = ('line', l.get_zorder(), l.get_solid_capstyle(), l.get_solid_joinstyle())
+    return key, None, to_rgba(l.get_color(), l.get_alpha()), l.get_linewidth(), l.get_linestyle()
+
+
+class CollectionAxes:
+    """ Stand-in for a matplotlib axes that is handed to the part and regulation
+    renderers when DNARenderer is in collection mode. Patches and lines added by
+    the renderers are not attached to the axes individually, but buffered per
+    zorder and style and then drawn as a handful of PathCollection and
+    LineCollection objects by flush(). All other calls (e.g., text) are passed
+    straight through to the wrapped axes.
+
+    Artists with the same zorder are drawn in the order they are added, so a
+    path only joins an earlier group of its style if it does not overlap the
+    paths of any group started since (otherwise a new group is started).
+    Overlaps are found from the extents of the paths, ignoring the width of
+    their edges, so where edges of different styles meet the antialiasing of
+    a pixel can differ slightly from drawing each artist.
+    """
+
+    def __init__(self, ax):
+        """ Constructor to generate an empty buffer for an axes.
+
+        Parameters
+        ----------
+        ax : matplotlib.axes
+            Axes that the collections will be added to when flushed.
+        """
+        self.ax = ax
+        # Groups in the order they were started, and those of each zorder
+        self.groups = []
+        self.zorder_groups = {}
+        # If set to a list, a handle to everything drawn is appended to it
+        self.track = None
+
+    def __getattr__(self, name):
+        return getattr(self.ax, name)
+
+    def _record (self, artist):
+        if self.track != None:
+            self.track.append(artist)
+        return artist
+
+    def add_patch (self, p):
+        """ Buffer a patch (hatched patches are drawn directly as collections
+        only support a single hatch).
+        """
+        if p.get_hatch():
+            return self._record(self.ax.add_patch(p))
+        self.buffer(p.get_transform().transform_path(p.get_path()), *patch_style(p))
+        return p
+
+    def add_line (self, l):
+        """ Buffer a line (lines with markers are drawn directly).
+        """
+        if l.get_marker() not in (None, 'None', 'none', ''):
+            return self._record(self.ax.add_line(l))
+        self.buffer(l.get_xydata(), *line_style(l))
+        return l
+
+    def add_artist (self, a):
+        """ Buffer patches and lines added as generic artists.
+        """
+        if isinstance(a, patches.Patch):
+            return self.add_patch(a)
+        if isinstance(a, Line2D):
+            return self.add_line(a)
+        return self._record(self.ax.add_artist(a))
+
+    def text (self, *args, **kwargs):
+        return self._record(self.ax.text(*args, **kwargs))
+
+    def buffer (self, path, key, facecolor, edgecolor, linewidth, linestyle):
+        """ Buffer a path (patch) or array of points (line) in data coordinates
+        using a style returned by patch_style() or line_style().
+        """
+        # Extent of the vertices (and curve control points)
+        points = path
+        if isinstance(path, Path):
+            points = path.vertices
+            if path.codes is not None:
+                points = points[path.codes != Path.CLOSEPOLY]
+        group = self._group(key, np.concatenate([points.min(axis=0), points.max(axis=0)]))
+        if self.track != None:
+            handle = BufferedArtist(len(group['paths']))
+            group['handles'].append(handle)
+            self.track.append(handle)
+        group['paths'].append(path)
+        group['facecolors'].append(facecolor)
+        group['edgecolors'].append(edgecolor)
+        group['linewidths'].append(linewidth)
+        group['linestyles'].append(linestyle)
+
+    def _group (self, key, extent):
+        """ Return the group a path with a style (key) and extent [x0, y0, x1, y1]
+        is added to (the last group of this style, unless the path overlaps a 
+        group of the same zorder started after it).
+        """
+        groups = self.zorder_groups.setdefault(key[1], [])
+        group = None
+        for other in reversed(groups):
+            if other['key'] == key:
+                group = other
+                break
+            bounds = other['extent']
+            if (extent[0] <= bounds[2] and bounds[0] <= extent[2] and 
+                extent[1] <= bounds[3] and bounds[1] <= extent[3]):
+                break
+        if group == None:
+            group = {'key':key, 'extent':np.array(extent, dtype=float), 'paths':[], 
+                     'facecolors':[], 'edgecolors':[], 'linewidths':[], 'linestyles':[], 
+                     'handles':[]}
+            groups.append(group)
+            self.groups.append(group)
+        else:
+            bounds = group['extent']
+            bounds[:2] = np.minimum(bounds[:2], extent[:2])
+            bounds[2:] = np.maximum(bounds[2:], extent[2:])
+        return group
+
+    def flush (self):
+        """ Add a single collection per buffered zorder and style to the axes and
+        empty the buffer. Groups holding a single path are added as a PathPatch
+        or Line2D instead.
+
+        Returns
+        -------
+        collections : list(matplotlib.artist.Artist)
+            The collections (and single artists) added to the axes.
+        """
+        collections = []
+        for group in self.groups:
+            kind, zorder, capstyle, joinstyle = group['key']
+            if len(group['paths']) == 1:
+                col = self._add_single(group)
+            elif kind == 'patch':
+                col = PathCollection(group['paths'], facecolors=group['facecolors'],
+                                     edgecolors=group['edgecolors'],
+                                     linewidths=group['linewidths'],
+                                     linestyles=group['linestyles'],
+                                     capstyle=capstyle, joinstyle=joinstyle, zorder=zorder)
+            else:
+                col = LineCollection(group['paths'], colors=group['edgecolors'],
+                                     linewidths=group['linewidths'],
+                                     linestyles=group['linestyles'],
+                                     capstyle=capstyle, joinstyle=joinstyle, zorder=zorder)
+            if len(group['paths']) > 1:
+                self.ax.add_collection(col)
+            collections.append(col)
+            for handle in group['handles']:
+                handle.collection = col
+        self.groups = []
+        self.zorder_groups = {}
+        return collections
+
+    def _add_single (self, group):
+        """ Add the only path of a group to the axes as a PathPatch or Line2D
+        (matplotlib draws a collection of one path as a marker, with its position
+        rounded to whole pixels).
+        """
+        kind, zorder, capstyle, joinstyle = group['key']
+        path = group['paths'][0]
+        if kind == 'patch':
+            p = PathPatch(path, facecolor=group['facecolors'][0], 
+                          edgecolor=group['edgecolors'][0], 
+                          linewidth=group['linewidths'][0], 
+                          linestyle=group['linestyles'][0],
+                          capstyle=capstyle, joinstyle=joinstyle, zorder=zorder)
+            return self.ax.add_patch(p)
+        l = Line2D(path[:,0], path[:,1], color=group['edgecolors'][0],
+                   linewidth=group['linewidths'][0], linestyle=group['linestyles'][0],
+                   solid_capstyle=capstyle, dash_capstyle=capstyle,
+                   solid_joinstyle=joinstyle, dash_joinstyle=joinstyle, zorder=zorder)
+        return self.ax.add_line(l)
+
+
+class BufferedArtist:
+    """ Handle to a patch or line drawn as one element of a collection (in
+    collection mode). Paths drawn alone are held by a PathPatch or Line2D, 
+    which is then given as the collection.
+    """
+    __slots__ = ('collection', 'index')
+
+    def __init__ (self, index, collection=None):
+        self.index = index
+        self.collection = collection
+
+
+###############################################################################
+# Glyph geometry cache (reuses the geometry of identical parts)
+###############################################################################
+
+
+class GlyphRecorder:
+    """ Stand-in for a matplotlib axes that records the patches, lines and text
+    a part renderer draws, so that they can be replayed at another position.
+    Calls that cannot be recorded mark the recording as incomplete.
+    """
+
+    def __init__(self):
+        self.primitives = []
+        self.complete = True
+
+    def __getattr__(self, name):
+        self.complete = False
+        return self._discard
+
+    def _discard (self, *args, **kwargs):
+        return None
+
+    def add_patch (self, p):
+        path = p.get_transform().transform_path(p.get_path())
+        kwargs = dict(facecolor=p.get_facecolor(), edgecolor=p.get_edgecolor(),
+                      linewidth=p.get_linewidth(), linestyle=p.get_linestyle(),
+                      hatch=p.get_hatch(), fill=p.get_fill(), zorder=p.get_zorder(),
+                      capstyle=p.get_capstyle(), joinstyle=p.get_joinstyle(),
+                      antialiased=p.get_antialiased(), path_effects=p.get_path_effects())
+        style = None
+        if not p.get_hatch():
+            style = patch_style(p)
+        self.primitives.append(('patch', path.vertices, path.codes, kwargs, style))
+        return p
+
+    def add_line (self, l):
+        kwargs = dict(color=l.get_color(), alpha=l.get_alpha(), linewidth=l.get_linewidth(),
+                      linestyle=l.get_linestyle(), zorder=l.get_zorder(),
+                      solid_capstyle=l.get_solid_capstyle(), solid_joinstyle=l.get_solid_joinstyle(),
+                      dash_capstyle=l.get_dash_capstyle(), dash_joinstyle=l.get_dash_joinstyle(),
+                      drawstyle=l.get_drawstyle(), antialiased=l.get_antialiased(),
+                      path_effects=l.get_path_effects())
+        style = None
+        if l.get_marker() in (None, 'None', 'none', ''):
+            style = line_style(l)
+        else:
+            kwargs.update(marker=l.get_marker(), markersize=l.get_markersize(),
+                          markerfacecolor=l.get_markerfacecolor(), 
+                          markeredgecolor=l.get_markeredgecolor(),
+                          markeredgewidth=l.get_markeredgewidth())
+        self.primitives.append(('line', np.array(l.get_xydata()), None, kwargs, style))
+        return l
+
+    def add_artist (self, a):
+        if isinstance(a, patches.Patch):
+            return self.add_patch(a)
+        if isinstance(a, Line2D):
+            return self.add_line(a)
+        self.complete = False
+        return a
+
+    def text (self, x, y, s, *args, **kwargs):
+        self.primitives.append(('text', np.array([[x, y]], dtype=float), None, (s, args, kwargs), None))
+
+
+def glyph_key_value (value):
+    """ Convert an option value into a hashable form for use in a cache key.
+    Raises TypeError if this is not possible.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, glyph_key_value(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple([glyph_key_value(v) for v in value])
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    hash(value)
+    return value
+
+
+class GlyphCache:
+    """ Least recently used cache of the geometry drawn by the built-in part
+    renderers. A part is drawn once in local coordinates for each combination
+    of renderer, type, direction, options, scale and linewidth (and length for
+    trace renderers). Other parts with the same combination reuse the recorded
+    patches, lines and labels translated to their position, rather than running
+    the renderer again. Parts with a custom renderer are always drawn directly.
+
+    A cache can be shared by several DNARenderer objects (and designs) to
+    reuse geometry between them. It is most effective in collection mode, where
+    replayed glyphs are buffered directly without creating any artists.
+    """
+
+    def __init__(self, max_size=512):
+        """ Constructor to generate an empty cache.
+
+        Parameters
+        ----------
+        max_size : int (default=512)
+            Maximum number of glyphs held. When full, the least recently used
+            glyph is evicted.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.glyphs = OrderedDict()
+
+    def __len__ (self):
+        return len(self.glyphs)
+
+    def clear (self):
+        """ Remove all glyphs and reset the hit/miss counters.
+        """
+        self.glyphs.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info (self):
+        """ Return the hit and miss counts and current size of the cache.
+
+        Returns
+        -------
+        info : dict
+            Keys 'hits', 'misses', 'size' and 'max_size'.
+        """
+        return {'hits':self.hits, 'misses':self.misses, 
+                'size':len(self.glyphs), 'max_size':self.max_size}
+
+    def render (self, renderer, ax, type, num, start, end, prev_end, scale, linewidth, opts):
+        """ Draw a part with a part renderer (same arguments and return value as
+        the renderer), using cached geometry where possible.
+        """
+        layout = part_layouts.get(renderer)
+        if layout == None:
+            return renderer(ax, type, num, start, end, prev_end, scale, linewidth, opts=opts)
+        # SBOL glyphs are placed after the previous part, trace glyphs at their start
+        if layout == trace_layout:
+            offset = start
+            length = end-start
+        else:
+            offset = prev_end
+            length = start > end
+        try:
+            key = (renderer, type, length, glyph_key_value(opts), scale, linewidth)
+            hash(key)
+        except TypeError:
+            return renderer(ax, type, num, start, end, prev_end, scale, linewidth, opts=opts)
+        glyph = self.glyphs.get(key)
+        if glyph == None:
+            self.misses += 1
+            recorder = GlyphRecorder()
+            returned = renderer(recorder, type, num, start-offset, end-offset, 
+                                prev_end-offset, scale, linewidth, opts=opts)
+            if recorder.complete == False:
+                return renderer(ax, type, num, start, end, prev_end, scale, linewidth, opts=opts)
+            glyph = (recorder.primitives, returned)
+            self.glyphs[key] = glyph
+            if len(self.glyphs) > self.max_size:
+                self.glyphs.popitem(last=False)
+        else:
+            self.hits += 1
+            self.glyphs.move_to_end(key)
+        primitives, returned = glyph
+        draw_glyph(ax, primitives, offset)
+        return returned[0]+offset, returned[1]+offset
+
+
+def draw_glyph (ax, primitives, offset):
+    """ Draw primitives recorded by a GlyphRecorder shifted along the x-axis.
+    """
+    shift = np.array([offset, 0.0])
+    collect = isinstance(ax, CollectionAxes)
+    for kind, points, codes, kwargs, style in primitives:
+        points = points+shift
+        if kind == 'patch':
+            path = Path(points, codes)
+            if collect == True and style != None:
+                ax.buffer(path, *style)
+            else:
+                ax.add_patch(PathPatch(path, **kwargs))
+        elif kind == 'line':
+            if collect == True and style != None:
+                ax.buffer(points, *style)
+            else:
+                ax.add_line(Line2D(points[:,0], points[:,1], **kwargs))
+        else:
+            s, args, text_kwargs = kwargs
+            ax.text(points[0,0], points[0,1], s, *args, **text_kwargs)
+
+
+###############################################################################
+# Artist handles (incremental re-rendering and animation)
+###############################################################################
+
+class ArtistTracker:
+    """ Stand-in for a matplotlib axes that records the artists added by the part
+    and regulation renderers, so that they can be updated after drawing. All 
+    other calls are passed straight through to the wrapped axes.
+    """
+
+    def __init__(self, ax):
+        """ Constructor to wrap an axes.
+
+        Parameters
+        ----------
+        ax : matplotlib.axes
+            Axes that artists are added to.
+        """
+        self.ax = ax
+        # If set to a list, everything drawn is appended to it
+        self.track = None
+
+    def __getattr__(self, name):
+        return getattr(self.ax, name)
+
+    def _record (self, artist):
+        if self.track != None:
+            self.track.append(artist)
+        return artist
+
+    def add_patch (self, p):
+        return self._record(self.ax.add_patch(p))
+
+    def add_line (self, l):
+        return self._record(self.ax.add_line(l))
+
+    def add_artist (self, a):
+        return self._record(self.ax.add_artist(a))
+
+    def text (self, *args, **kwargs):
+        return self._record(self.ax.text(*args, **kwargs))
+
+
+def same_color (color, drawn):
+    """ Check if a drawn (RGBA) color was drawn using a color (None matches
+    any color). Fully transparent colors (e.g., facecolor='none') never match.
+    """
+    drawn = to_rgba(drawn)
+    if drawn[3] == 0:
+        return False
+    if color is None:
+        return True
+    return np.allclose(to_rgba(color)[:3], drawn[:3])
+
+
+def update_artist (artist, old_color=None, color=None, alpha=None, linewidth=None):
+    """ Update the color, alpha and linewidth of an artist (or element of a
+    collection) without redrawing it. Only colors matching old_color are changed,
+    so that edges and labels keep their own colors. Text only has its alpha updated.
+
+    Returns
+    -------
+    artist : matplotlib.artist.Artist
+        The artist (or collection) that was changed.
+    """
+    if isinstance(artist, BufferedArtist) and not isinstance(artist.collection, (PathCollection, LineCollection)):
+        artist = artist.collection
+    if isinstance(artist, BufferedArtist):
+        col = artist.collection
+        i = artist.index
+        if isinstance(col, LineCollection):
+            channels = [(col.get_color, col.set_color)]
+        else:
+            channels = [(col.get_facecolor, col.set_facecolor), 
+                        (col.get_edgecolor, col.set_edgecolor)]
+        for get_colors, set_colors in channels:
+            colors = np.array(get_colors())
+            if len(colors) <= i or to_rgba(colors[i])[3] == 0:
+                continue
+            if color is not None and same_color(old_color, colors[i]):
+                colors[i,:3] = to_rgba(color)[:3]
+            if alpha != None:
+                colors[i,3] = alpha
+            set_colors(colors)
+        if linewidth != None:
+            widths = np.array(np.broadcast_to(col.get_linewidth(), (len(col.get_paths()),)))
+            widths[i] = linewidth
+            col.set_linewidth(widths)
+        return col
+    if isinstance(artist, Line2D):
+        if color is not None and same_color(old_color, artist.get_color()):
+            artist.set_color(color)
+    elif isinstance(artist, patches.Patch):
+        if color is not None and same_color(old_color, artist.get_facecolor()):
+            artist.set_facecolor(color)
+        if color is not None and same_color(old_color, artist.get_edgecolor()):
+            artist.set_edgecolor(color)
+    if alpha != None:
+        artist.set_alpha(alpha)
+    if linewidth != None and isinstance(artist, (Line2D, patches.Patch)):
+        artist.set_linewidth(linewidth)
+    return artist
+
+
+class DesignHandles:
+    """ Artists drawn for each part and regulation of a design (returned by 
+    DNARenderer.draw and renderDNA when return_handles=True). Parts are keyed by 
+    their name (or position in the design if unnamed) and regulation by its 
+    position in the list of regulation passed in. Each entry is a dict holding 
+    the 'artists' drawn and the 'color' they were drawn with.
+
+    In collection mode, the artists of a part are handles to elements of the
+    shared collections (BufferedArtist) and updates change these elements only.
+    The artists returned by the update functions can be redrawn with blitting
+    (e.g., by a matplotlib.animation.FuncAnimation with blit=True).
+    """
+
+    def __init__(self):
+        """ Constructor to generate an empty set of handles.
+        """
+        self.parts = {}
+        self.regs = {}
+        self.backbone = []
+
+    def artists (self):
+        """ Return every artist (or collection in collection mode) drawn, 
+        without duplicates.
+        """
+        seen = {}
+        entries = list(self.parts.values()) + list(self.regs.values()) + [{'artists':self.backbone}]
+        for entry in entries:
+            for a in entry['artists']:
+                if isinstance(a, BufferedArtist):
+                    a = a.collection
+                seen[id(a)] = a
+        return list(seen.values())
+
+    def _update (self, entry, color, alpha, linewidth):
+        changed = {}
+        for a in entry['artists']:
+            a = update_artist(a, old_color=entry['color'], color=color, 
+                              alpha=alpha, linewidth=linewidth)
+            changed[id(a)] = a
+        if color is not None:
+            entry['color'] = color
+        return list(changed.values())
+
+    def update_part (self, name, color=None, alpha=None, linewidth=None):
+        """ Update the color, alpha and/or linewidth of a drawn part.
+
+        Parameters
+        ----------
+        name : string or int
+            Name of the part (or position in the design if unnamed).
+
+        color : matplotlib color (default=None)
+            New color for the elements drawn in the part's color. 
+
+        alpha : float (default=None)
+            New alpha for all elements of the part.
+
+        linewidth : float (default=None)
+            New linewidth for all lines and patches of the part.
+
+        Returns
+        -------
+        artists : list(matplotlib.artist.Artist)
+            Artists (or collections) that were changed and should be redrawn.
+        """
+        return self._update(self.parts[name], color, alpha, linewidth)
+
+    def update_reg (self, index, color=None, alpha=None, linewidth=None):
+        """ Update the color, alpha and/or linewidth of a drawn regulation arc
+        (see update_part).
+        """
+        return self._update(self.regs[index], color, alpha, linewidth)
+
+
+###############################################################################
+# Level of detail (zoomed out trace designs)
+###############################################################################
+
+def bin_coverage (starts, ends, x_min, bin_width, num_bins):
+    """ Count the features overlapping each of a set of equal width bins.
+
+    Parameters
+    ----------
+    starts, ends : numpy.ndarray(float)
+        The left and right edge of each feature.
+
+    x_min : float
+        Left edge of the first bin.
+
+    bin_width : float
+        Width of each bin.
+
+    num_bins : int
+        Number of bins.
+
+    Returns
+    -------
+    counts : numpy.ndarray(int)
+        Number of features overlapping each bin.
+    """
+    first = np.clip(np.floor((starts-x_min)/bin_width), 0, num_bins-1).astype(int)
+    last = np.clip(np.floor((ends-x_min)/bin_width), 0, num_bins-1).astype(int)
+    changes = np.bincount(first, minlength=num_bins+1) - np.bincount(last+1, minlength=num_bins+1)
+    return np.cumsum(changes[:num_bins])
+
+
+def merge_intervals (starts, ends, gap=0.0):
+    """ Merge features that overlap (or are separated by less than gap) into 
+    blocks.
+
+    Returns
+    -------
+    starts, ends : numpy.ndarray(float)
+        The left and right edge of each block (sorted).
+    """
+    if len(starts) == 0:
+        return np.array(starts, dtype=float), np.array(ends, dtype=float)
+    order = np.argsort(starts, kind='stable')
+    starts = starts[order]
+    reach = np.maximum.accumulate(ends[order])
+    breaks = np.flatnonzero(starts[1:] > reach[:-1]+gap)
+    block_starts = starts[np.concatenate([[0], breaks+1])]
+    block_ends = reach[np.concatenate([breaks, [len(starts)-1]])]
+    return block_starts, block_ends
+
+
+def draw_lod (ax, layout, part_nums, x_min, x_max, bin_width, mode='density'):
+    """ Draw trace parts as aggregated blocks, rather than individual glyphs. 
+    Parts are grouped by type and strand, with each group drawn as a single
+    PolyCollection in the color, height and zorder of its first part.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes
+        Axes to draw to.
+
+    layout : Layout
+        The layout of the design.
+
+    part_nums : numpy.ndarray(int)
+        Indices of the parts to aggregate.
+
+    x_min, x_max : float
+        The x-range to draw.
+
+    bin_width : float
+        Width of each bin (normally the width of a pixel) in axis coordinates.
+
+    mode : string (default='density')
+        'density' draws the number of features of each type overlapping each bin
+        as a bar (scaled to the part height), 'blocks' draws features that overlap
+        (or are within a bin of one another) as merged blocks.
+
+    Returns
+    -------
+    collections : list(matplotlib.collections.PolyCollection)
+        The collections added to the axes.
+    """
+    if mode not in ('density', 'blocks'):
+        raise ValueError("Unknown level of detail mode '{}'".format(mode))
+    part_nums = np.asarray(part_nums, dtype=int)
+    left = layout.extent[part_nums, 0]
+    right = layout.extent[part_nums, 1]
+    strand = layout.strand[part_nums]
+    num_bins = max(int(math.ceil((x_max-x_min)/bin_width)), 1)
+    groups = {}
+    for i, part_num in enumerate(part_nums.tolist()):
+        key = (layout.parts[part_num]['type'], int(strand[i]))
+        if key not in groups:
+            groups[key] = []
+        groups[key].append(i)
+    collections = []
+    for (part_type, part_strand), members in groups.items():
+        members = np.array(members)
+        first = layout.parts[part_nums[members[0]]]
+        renderer = layout.part_renderers[first['type']]
+        o = renderer_options[renderer].resolve(first.get('opts'))
+        height = part_strand*o.y_extent
+        y_offset = part_strand*o.y_offset
+        if mode == 'density':
+            counts = bin_coverage(left[members], right[members], x_min, bin_width, num_bins)
+            edges = x_min + np.arange(num_bins+1)*bin_width
+            heights = y_offset + height*counts/max(counts.max(), 1)
+            # Outline of the bars as a single step polygon
+            xs = np.repeat(edges, 2)
+            ys = np.concatenate([[y_offset], np.repeat(heights, 2), [y_offset]])
+            polys = [np.column_stack([xs, ys])]
+        else:
+            starts, ends = merge_intervals(left[members], right[members], gap=bin_width)
+            polys = [[(s, y_offset), (s, y_offset+height), (e, y_offset+height), (e, y_offset)] 
+                     for s, e in zip(starts.tolist(), ends.tolist())]
+        col = PolyCollection(polys, facecolors=[o.color], edgecolors='none', 
+                             zorder=14+o.zorder_add)
+        ax.add_collection(col)
+        collections.append(col)
+    return collections
+
+
+class HeldAxes:
+    """ Stand-in for a matplotlib axes that holds the artists added by renderers
+    (e.g., while a figure is being drawn), rather than adding them to the axes.
+    Artists are given the figure, transform and clipping the axes would give
+    them. All other calls are passed straight through to the wrapped axes.
+    """
+
+    def __init__(self, ax):
+        """ Constructor to wrap an axes.
+
+        Parameters
+        ----------
+        ax : matplotlib.axes
+            Axes the artists are drawn to.
+        """
+        self.ax = ax
+        self.artists = []
+
+    def __getattr__(self, name):
+        return getattr(self.ax, name)
+
+    def _hold (self, a):
+        a.set_figure(self.ax.figure)
+        a.axes = self.ax
+        if not a.is_transform_set():
+            a.set_transform(self.ax.transData)
+        if a.get_clip_path() is None:
+            a.set_clip_path(self.ax.patch)
+        self.artists.append(a)
+        return a
+
+    def add_patch (self, p):
+        return self._hold(p)
+
+    def add_line (self, l):
+        return self._hold(l)
+
+    def add_artist (self, a):
+        return self._hold(a)
+
+    def add_collection (self, c, autolim=True):
+        return self._hold(c)
+
+    def text (self, x, y, s, fontdict=None, **kwargs):
+        """ Hold text (with the defaults of matplotlib.axes.Axes.text).
+        """
+        text_kwargs = {'verticalalignment':'baseline', 'horizontalalignment':'left',
+                       'transform':self.ax.transData, 'clip_on':False}
+        if fontdict != None:
+            text_kwargs.update(fontdict)
+        text_kwargs.update(kwargs)
+        return self._hold(Text(x, y, s, **text_kwargs))
+
+
+class LevelOfDetail:
+    """ Trace parts of a layout drawn at the level of detail of the axes view.
+    Each time the figure is drawn, the units per pixel are found from the axes
+    x-limits and width. Above lod_bp_per_pixel, the parts are aggregated (see
+    draw_lod), otherwise the glyphs of the parts in view are drawn. Artists are
+    created when first needed and reused while the view is unchanged (glyphs
+    are kept for each part), so zooming and panning switch the level of detail
+    without drawing the design again. Added to an axes by DNARenderer.draw (as
+    an artist returned by level_of_detail_artist for each zorder the parts are
+    drawn at, so they are layered with other artists as when drawn directly).
+    """
+
+    def __init__ (self, dna_renderer, layout, part_nums):
+        """ Constructor for the parts of a layout drawn by a renderer.
+
+        Parameters
+        ----------
+        dna_renderer : DNARenderer
+            Renderer giving the level of detail threshold and mode, and used to
+            draw glyphs.
+
+        layout : Layout
+            The layout of the design.
+
+        part_nums : numpy.ndarray(int)
+            Indices of the trace parts to draw.
+        """
+        self.dna_renderer = dna_renderer
+        self.layout = layout
+        self.part_nums = np.asarray(part_nums, dtype=int)
+        self.view = None
+        self.artists = []
+        self.glyphs = {}
+        self.zorders = []
+
+    def find_zorders (self, ax):
+        """ Return the zorders the parts are drawn at (in order). The glyphs of 
+        the built-in trace renderers have zorders set by the renderer, the 
+        zorder_add option and whether the part is labelled, so the glyphs of one
+        part with each of these are drawn to find them (and kept for later).
+        """
+        zorders = set()
+        seen = set()
+        for part_num in self.part_nums.tolist():
+            part = self.layout.parts[part_num]
+            renderer = self.layout.part_renderers[part['type']]
+            opts = part.get('opts')
+            zorder_add = renderer_options[renderer].resolve(opts).zorder_add
+            key = (renderer, zorder_add, opts != None and 'label' in opts)
+            if key in seen:
+                continue
+            seen.add(key)
+            held = HeldAxes(ax)
+            self.dna_renderer._render_part(held, self.layout, part_num)
+            self.glyphs[part_num] = held.artists
+            zorders.update(a.get_zorder() for a in held.artists)
+            # Aggregated parts (see draw_lod)
+            zorders.add(14+zorder_add)
+        self.zorders = sorted(zorders)
+        return self.zorders
+
+    def detail (self, ax):
+        """ Return the units per pixel shown by an axes and if parts are aggregated.
+        """
+        x_min, x_max = sorted(ax.get_xlim())
+        bp_per_pixel = (x_max-x_min)/max(ax.bbox.width, 1.0)
+        return bp_per_pixel, bp_per_pixel > self.dna_renderer.lod_bp_per_pixel
+
+    def update (self, ax):
+        """ Create the artists for the current view of an axes (if changed).
+
+        Returns
+        -------
+        artists : list(matplotlib.artist.Artist)
+            The artists to draw (in zorder).
+        """
+        x_min, x_max = sorted(ax.get_xlim())
+        bp_per_pixel, aggregate = self.detail(ax)
+        view = (x_min, x_max, bp_per_pixel, aggregate)
+        if view == self.view:
+            return self.artists
+        extent = self.layout.extent[self.part_nums]
+        visible = self.part_nums[(extent[:,1] >= x_min) & (extent[:,0] <= x_max)]
+        if aggregate == True:
+            held = HeldAxes(ax)
+            draw_lod(held, self.layout, visible, x_min, x_max, bp_per_pixel,
+                     mode=self.dna_renderer.lod_mode)
+            artists = held.artists
+        else:
+            artists = []
+            for part_num in visible.tolist():
+                if part_num not in self.glyphs:
+                    held = HeldAxes(ax)
+                    self.dna_renderer._render_part(held, self.layout, part_num)
+                    self.glyphs[part_num] = held.artists
+                artists.extend(self.glyphs[part_num])
+        self.artists = sorted(artists, key=lambda a: a.get_zorder())
+        self.view = view
+        return self.artists
+
+    def draw (self, ax, renderer, zorder):
+        """ Draw the parts at a zorder (one of find_zorders()) to a matplotlib 
+        renderer at the detail of an axes view. Artists at other zorders are
+        drawn with the next zorder above them (or the highest).
+        """
+        i = self.zorders.index(zorder)
+        z_min = -np.inf
+        if i > 0:
+            z_min = self.zorders[i-1]
+        z_max = zorder
+        if i == len(self.zorders)-1:
+            z_max = np.inf
+        for artist in self.update(ax):
+            if z_min < artist.get_zorder() <= z_max:
+                artist.draw(renderer)
+
+
+# Artist class created when first needed (matplotlib is imported lazily)
+_lod_artist_class = []
+
+
+def level_of_detail_artist (lod, zorder):
+    """ Return a matplotlib artist that draws the parts of a LevelOfDetail at a
+    zorder (one of lod.find_zorders()) when the figure is drawn (the level of 
+    detail is then found from the axes it is added to). One is added for each
+    zorder, so the parts are layered with other artists of the axes.
+    """
+    if len(_lod_artist_class) == 0:
+        class LevelOfDetailArtist (importlib.import_module('matplotlib.artist').Artist):
+            """ Artist drawing the parts of a LevelOfDetail at its zorder.
+            """
+            def __init__ (self, lod):
+                super().__init__()
+                self.lod = lod
+
+            def draw (self, renderer):
+                if self.get_visible():
+                    self.lod.draw(self.axes, renderer, self.get_zorder())
+                self.stale = False
+
+        _lod_artist_class.append(LevelOfDetailArtist)
+    artist = _lod_artist_class[0](lod)
+    artist.set_zorder(zorder)
+    return artist
+
+
+###############################################################################
+# Columnar designs
+###############################################################################
+
+# Keys of a part held in the columns of a DesignTable
+design_table_keys = ('name', 'type', 'fwd', 'start', 'end', 'opts')
+
+
+def part_key (part):
+    """ Return a key identifying a part. Dicts are identified by the object and 
+    parts of a DesignTable by their table and position (so all views of a part
+    have the same key).
+    """
+    if isinstance(part, PartView):
+        return (id(part.table), part.index)
+    return id(part)
+
+
+class PartView (Mapping):
+    """ Read-only dict-like view of a part in a DesignTable (e.g., table[0]). It
+    has the keys of the part dict the table was created from, except that fwd 
+    is always present. Views hold no data and can be used wherever a part is 
+    read, such as the from_part and to_part of regulation.
+    """
+
+    __slots__ = ('table', 'index')
+
+    def __init__ (self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__ (self, key):
+        table = self.table
+        i = self.index
+        if key == 'name':
+            value = table.name[i]
+        elif key == 'type':
+            value = table.types[table.type_id[i]] if table.type_id[i] >= 0 else None
+        elif key == 'fwd':
+            return bool(table.fwd[i])
+        elif key == 'start' or key == 'end':
+            value = float(getattr(table, key)[i])
+            if np.isnan(value):
+                value = None
+        elif key == 'opts':
+            value = table.styles[table.style_id[i]] if table.style_id[i] >= 0 else None
+        else:
+            extras = table.extras.get(i, {})
+            if key not in extras:
+                raise KeyError(key)
+            return extras[key]
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__ (self):
+        for key in design_table_keys:
+            if key in self:
+                yield key
+        for key in self.table.extras.get(self.index, {}):
+            yield key
+
+    def __len__ (self):
+        return len(list(iter(self)))
+
+    def __contains__ (self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __repr__ (self):
+        return 'PartView({})'.format(dict(self))
+
+
+class DesignTable:
+    """ Design held as columns (a struct of arrays) rather than a list of part 
+    dicts. Part types and options are interned, so each distinct type and set
+    of options is held once and parts refer to them by index. Large libraries 
+    take a fraction of the memory of dicts and can be copied cheaply. 
+
+    Tables are drawn by renderDNA (which writes the laid out positions to the 
+    start and end columns) and converted to and from part dicts with 
+    from_parts() and to_parts(). Indexing a table returns a PartView of a part.
+
+    Attributes
+    ----------
+    name : numpy.ndarray(object)
+        Name of each part (None if not named).
+
+    type_id : numpy.ndarray(int32)
+        Index of the type of each part in types (-1 for parts without a type).
+
+    fwd : numpy.ndarray(bool)
+        Orientation of each part.
+
+    start, end : numpy.ndarray(float)
+        Position of each part (NaN if not given).
+
+    style_id : numpy.ndarray(int32)
+        Index of the options of each part in styles (-1 for no options).
+
+    types : list(string)
+        The part types used.
+
+    styles : list(dict)
+        The options used. Parts with equal options share the same dict.
+
+    extras : dict(int : dict)
+        Any other keys of a part (e.g., a custom renderer), by part index.
+    """
+
+    __slots__ = ('name', 'type_id', 'fwd', 'start', 'end', 'style_id', 'types', 
+                 'styles', 'extras', '_type_ids', '_style_ids')
+
+    def __init__ (self, types=(), names=None, fwd=None, starts=None, ends=None, opts=None):
+        """ Constructor to create a table from columns of values (see from_parts 
+        to create one from part dicts).
+
+        Parameters
+        ----------
+        types : list(string) (default=())
+            Type of each part.
+
+        names : list(string) (default=None)
+            Name of each part.
+
+        fwd : list(bool) (default=None)
+            Orientation of each part. If None, all parts are forward.
+
+        starts, ends : list(float) (default=None)
+            Position of each part (None or NaN where not given). If None, parts
+            are placed one after another.
+
+        opts : dict or list(dict) (default=None)
+            Options used by every part, or the options of each part.
+        """
+        self.types = []
+        self.styles = []
+        self.extras = {}
+        self._type_ids = {}
+        self._style_ids = {}
+        num_parts = len(types)
+        type_ids = [self.intern_type(t) for t in types]
+        if isinstance(opts, dict):
+            style_ids = np.full(num_parts, self.intern_style(opts), dtype=np.int32)
+        elif opts is None:
+            style_ids = np.full(num_parts, -1, dtype=np.int32)
+        else:
+            style_ids = [self.intern_style(o) for o in opts]
+        if fwd is None:
+            fwd = np.ones(num_parts, dtype=bool)
+        self._set_columns(num_parts, names, type_ids, fwd, starts, ends, style_ids)
+
+    def _set_columns (self, num_parts, names, type_ids, fwd, starts, ends, style_ids):
+        self.name = np.empty(num_parts, dtype=object)
+        if names is not None:
+            self.name[:] = names
+        self.type_id = np.asarray(type_ids, dtype=np.int32).reshape(num_parts)
+        self.fwd = np.asarray(fwd, dtype=bool).reshape(num_parts)
+        self.start = np.full(num_parts, np.nan)
+        self.end = np.full(num_parts, np.nan)
+        if starts is not None:
+            self.start[:] = np.array(starts, dtype=float)
+        if ends is not None:
+            self.end[:] = np.array(ends, dtype=float)
+        self.style_id = np.asarray(style_ids, dtype=np.int32).reshape(num_parts)
+
+    @classmethod
+    def from_parts (cls, parts):
+        """ Create a table from part dicts (as for renderDNA). Parts are read one 
+        at a time, so can be generated (e.g., by iter_design_from_gff) without the
+        design ever being held as dicts. Options are copied.
+        """
+        table = cls()
+        names = []
+        type_ids = []
+        fwd = []
+        starts = []
+        ends = []
+        style_ids = []
+        for part_num, part in enumerate(parts):
+            names.append(part.get('name'))
+            type_ids.append(table.intern_type(part.get('type')))
+            fwd.append(part.get('fwd', True))
+            starts.append(part.get('start'))
+            ends.append(part.get('end'))
+            style_ids.append(table.intern_style(part.get('opts')))
+            extras = dict((k, v) for k, v in part.items() if k not in design_table_keys)
+            if len(extras) > 0:
+                table.extras[part_num] = extras
+        table._set_columns(len(names), names, type_ids, fwd, starts, ends, style_ids)
+        return table
+
+    def intern_type (self, part_type):
+        """ Return the index of a part type in types (added if needed).
+        """
+        if part_type == None:
+            return -1
+        type_id = self._type_ids.get(part_type)
+        if type_id == None:
+            type_id = len(self.types)
+            self.types.append(part_type)
+            self._type_ids[part_type] = type_id
+        return type_id
+
+    def intern_style (self, opts):
+        """ Return the index of a set of options in styles (a copy is added if no
+        equal options are held).
+        """
+        if opts == None:
+            return -1
+        try:
+            key = glyph_key_value(opts)
+        except TypeError:
+            # Options that can't be compared are not shared
+            key = None
+        style_id = self._style_ids.get(key)
+        if style_id == None:
+            style_id = len(self.styles)
+            self.styles.append(dict(opts))
+            if key != None:
+                self._style_ids[key] = style_id
+        return style_id
+
+    def __len__ (self):
+        return len(self.type_id)
+
+    def __getitem__ (self, index):
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if index < 0 or index >= len(self):
+                raise IndexError('part index out of range')
+            return PartView(self, int(index))
+        return self.take(np.arange(len(self))[index])
+
+    def __iter__ (self):
+        for part_num in range(len(self)):
+            yield PartView(self, part_num)
+
+    def __repr__ (self):
+        return 'DesignTable(parts={}, types={}, styles={})'.format(len(self), len(self.types), 
+                                                                   len(self.styles))
+
+    def take (self, indices):
+        """ Return a new table of the parts at some indices (e.g., a sorted order).
+        Types and options are shared with this table.
+        """
+        indices = np.asarray(indices, dtype=int)
+        table = DesignTable()
+        table.types = list(self.types)
+        table.styles = list(self.styles)
+        table._type_ids = dict(self._type_ids)
+        table._style_ids = dict(self._style_ids)
+        table._set_columns(len(indices), self.name[indices], self.type_id[indices], 
+                           self.fwd[indices], self.start[indices], self.end[indices], 
+                           self.style_id[indices])
+        if len(self.extras) > 0:
+            for new_num, part_num in enumerate(indices.tolist()):
+                if part_num in self.extras:
+                    table.extras[new_num] = dict(self.extras[part_num])
+        return table
+
+    def copy (self):
+        """ Return a copy of the table (the columns are copied, options are shared).
+        """
+        return self.take(np.arange(len(self)))
+
+    def part_types (self):
+        """ Return the type of each part (None for parts without a type).
+        """
+        return np.array(self.types + [None], dtype=object)[self.type_id]
+
+    def records (self):
+        """ Generate the part number, type, orientation, start, end, custom renderer
+        and options of each part with a type (start and end are None if not given).
+        """
+        types = self.types
+        styles = self.styles
+        extras = self.extras
+        columns = zip(self.type_id.tolist(), self.fwd.tolist(), self.start.tolist(), 
+                      self.end.tolist(), self.style_id.tolist())
+        for part_num, (type_id, fwd, start, end, style_id) in enumerate(columns):
+            if type_id < 0:
+                continue
+            if start != start:
+                start = None
+            if end != end:
+                end = None
+            renderer = None
+            if part_num in extras:
+                renderer = extras[part_num].get('renderer')
+            opts = None
+            if style_id >= 0:
+                opts = styles[style_id]
+            yield part_num, types[type_id], fwd, start, end, renderer, opts
+
+    def to_parts (self):
+        """ Return the design as a list of part dicts (each with its own options).
+        """
+        types = self.types + [None]
+        styles = self.styles
+        parts = []
+        columns = zip(self.name.tolist(), self.type_id.tolist(), self.fwd.tolist(), 
+                      self.start.tolist(), self.end.tolist(), self.style_id.tolist())
+        for part_num, (name, type_id, fwd, start, end, style_id) in enumerate(columns):
+            part = {}
+            if name != None:
+                part['name'] = name
+            if type_id >= 0:
+                part['type'] = types[type_id]
+            part['fwd'] = fwd
+            if start == start:
+                part['start'] = start
+            if end == end:
+                part['end'] = end
+            if style_id >= 0:
+                part['opts'] = dict(styles[style_id])
+            if part_num in self.extras:
+                part.update(self.extras[part_num])
+            parts.append(part)
+        return parts
+
+    def info (self):
+        """ Return the number of parts, types and options held and the bytes used
+        by the columns.
+        """
+        nbytes = sum(getattr(self, c).nbytes for c in ('name', 'type_id', 'fwd', 'start', 
+                                                       'end', 'style_id'))
+        return {'parts': len(self), 'types': len(self.types), 'styles': len(self.styles),
+                'column_bytes': int(nbytes)}
+
+
+def part_records (parts):
+    """ Generate the part number, type, orientation, start, end, custom renderer 
+    and options of each part of a design (list of dicts or DesignTable) with a
+    type. Start and end are None if not given.
+    """
+    if isinstance(parts, DesignTable):
+        for record in parts.records():
+            yield record
+        return
+    for part_num, part in enumerate(parts):
+        if 'type' not in part:
+            continue
+        yield (part_num, part['type'], part.get('fwd', True), part.get('start'), 
+               part.get('end'), part.get('renderer'), part.get('opts'))
+
+
+###############################################################################
+# Render instrumentation
+###############################################################################
+
+
+class RenderStats:
+    """ Opt-in record of where rendering time goes. Collects the wall time and
+    number of calls of each phase (e.g., layout, drawing parts, savefig) and
+    each renderer, the number of artists created for each part type, and the
+    hits and misses of the caches used. One object can be passed to many calls
+    (e.g., when rendering a library) to accumulate totals.
+    """
+
+    def __init__ (self):
+        """ Constructor to generate empty statistics.
+        """
+        self.clear()
+
+    def clear (self):
+        """ Reset all statistics.
+        """
+        self.phases = OrderedDict()
+        self.renderers = OrderedDict()
+        self.artists = OrderedDict()
+        self.caches = OrderedDict()
+
+    def add_phase (self, name, seconds, calls=1):
+        """ Add time spent in a phase of rendering.
+        """
+        entry = self.phases.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += calls
+
+    def add_renderer (self, name, part_type, seconds, num_artists):
+        """ Add a call of a renderer (for a part type) and the artists it created.
+        """
+        entry = self.renderers.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+        self.artists[part_type] = self.artists.get(part_type, 0)+num_artists
+
+    def add_cache (self, name, hits, misses):
+        """ Add hits and misses of a cache.
+        """
+        entry = self.caches.setdefault(name, [0, 0])
+        entry[0] += hits
+        entry[1] += misses
+
+    def add_info (self, info):
+        """ Add statistics returned by info() (e.g., from another process).
+        """
+        for name, entry in info['phases'].items():
+            self.add_phase(name, entry['seconds'], entry['calls'])
+        for name, entry in info['renderers'].items():
+            totals = self.renderers.setdefault(name, [0.0, 0])
+            totals[0] += entry['seconds']
+            totals[1] += entry['calls']
+        for part_type, num_artists in info['artists'].items():
+            self.artists[part_type] = self.artists.get(part_type, 0)+num_artists
+        for name, entry in info['caches'].items():
+            self.add_cache(name, entry['hits'], entry['misses'])
+
+    def info (self):
+        """ Return the statistics.
+
+        Returns
+        -------
+        info : dict
+            Keys 'phases' and 'renderers' (dicts of name: {'seconds', 'calls'}),
+            'artists' (dict of part type: number of artists) and 'caches' (dict
+            of name: {'hits', 'misses'}).
+        """
+        return {'phases': OrderedDict((k, {'seconds':v[0], 'calls':v[1]}) for k, v in self.phases.items()),
+                'renderers': OrderedDict((k, {'seconds':v[0], 'calls':v[1]}) for k, v in self.renderers.items()),
+                'artists': OrderedDict(self.artists),
+                'caches': OrderedDict((k, {'hits':v[0], 'misses':v[1]}) for k, v in self.caches.items())}
+
+    def to_json (self, indent=None):
+        """ Return the statistics as a JSON string.
+        """
+        return json.dumps(self.info(), indent=indent)
+
+    def to_prometheus (self, prefix='dnaplotlib'):
+        """ Return the statistics in the Prometheus text exposition format (e.g., 
+        for the node exporter textfile collector).
+        """
+        metrics = [('phase_seconds_total', 'Wall time spent in each phase of rendering.', 
+                    'phase', [(k, v[0]) for k, v in self.phases.items()]),
+                   ('phase_calls_total', 'Number of times each phase of rendering ran.', 
+                    'phase', [(k, v[1]) for k, v in self.phases.items()]),
+                   ('renderer_seconds_total', 'Wall time spent in each part renderer.', 
+                    'renderer', [(k, v[0]) for k, v in self.renderers.items()]),
+                   ('renderer_calls_total', 'Number of parts drawn by each part renderer.', 
+                    'renderer', [(k, v[1]) for k, v in self.renderers.items()]),
+                   ('artists_total', 'Number of artists created for each part type.', 
+                    'part_type', list(self.artists.items())),
+                   ('cache_hits_total', 'Number of cache hits.', 
+                    'cache', [(k, v[0]) for k, v in self.caches.items()]),
+                   ('cache_misses_total', 'Number of cache misses.', 
+                    'cache', [(k, v[1]) for k, v in self.caches.items()])]
+        lines = []
+        for name, help_text, label, values in metrics:
+            lines.append('# HELP {}_{} {}'.format(prefix, name, help_text))
+            lines.append('# TYPE {}_{} counter'.format(prefix, name))
+            for key, value in values:
+                key = str(key).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                lines.append('{}_{}{{{}="{}"}} {}'.format(prefix, name, label, key, repr(value)))
+        return '\n'.join(lines)+'\n'
+
+    def save (self, filename):
+        """ Save the statistics as JSON, or in the Prometheus text format if the 
+        filename ends in .prom.
+        """
+        if filename.endswith('.prom'):
+            data = self.to_prometheus()
+        else:
+            data = self.to_json(indent=2)
+        with open(filename, 'w') as out_file:
+            out_file.write(data)
+
+
+# Nested phases being timed by each thread (see NestedPhases)
+_nested_phases = threading.local()
+
+
+class NestedPhases:
+    """ Records the time the current thread spends in phases that happen inside
+    others (resolving options and laying out labels, which happen while parts
+    are laid out and drawn) as phases of a RenderStats. Timing starts when 
+    created (if the stats are not None) and ends with stop(), which adds the
+    totals to the stats. PhaseTimer laps exclude this time, so the phases 
+    recorded do not overlap.
+    """
+
+    def __init__ (self, stats):
+        self.stats = stats
+        self.phases = OrderedDict()
+        self.outer = None
+        if stats != None:
+            self.outer = NestedPhases.current()
+            _nested_phases.current = self
+
+    @staticmethod
+    def current ():
+        """ Return the NestedPhases timed by the current thread (None if none).
+        """
+        return getattr(_nested_phases, 'current', None)
+
+    @staticmethod
+    def total ():
+        """ Return the seconds of nested phases timed by the current thread.
+        """
+        return getattr(_nested_phases, 'seconds', 0.0)
+
+    @staticmethod
+    def start ():
+        """ Return the time and total() at the start of a nested phase.
+        """
+        return time.perf_counter(), NestedPhases.total()
+
+    def add (self, name, start):
+        """ Add the time since start (returned by NestedPhases.start()) to a 
+        nested phase, excluding the time in any phases nested inside it.
+        """
+        start_time, start_total = start
+        total = NestedPhases.total()
+        seconds = time.perf_counter()-start_time-(total-start_total)
+        entry = self.phases.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+        _nested_phases.seconds = total+seconds
+
+    def stop (self):
+        """ Stop timing and add the nested phases to the stats.
+        """
+        if self.stats != None:
+            _nested_phases.current = self.outer
+            for name, (seconds, calls) in self.phases.items():
+                self.stats.add_phase(name, seconds, calls)
+
+
+class PhaseTimer:
+    """ Records the time between successive calls of lap() as phases of a 
+    RenderStats (excluding the time in any nested phases, see NestedPhases).
+    Does nothing if the stats are None.
+    """
+
+    def __init__ (self, stats):
+        self.stats = stats
+        self.last = None
+        if stats != None:
+            self.last = time.perf_counter()
+            self.last_nested = NestedPhases.total()
+
+    def lap (self, name):
+        """ Add the time since the previous lap (or creation) to a phase.
+        """
+        if self.stats != None:
+            now = time.perf_counter()
+            nested = NestedPhases.total()
+            self.stats.add_phase(name, now-self.last-(nested-self.last_nested))
+            self.last = now
+            self.last_nested = nested
+
+
+###############################################################################
+# The DNA renderer
+###############################################################################
+
+
+class DNARenderer:
+    """ Class defining the DNA rendering funtionality.
+    """
+
+    # Standard part types
+    STD_PART_TYPES = ['Promoter', 
+                      'CDS', 
+                      'Terminator',
+                      'RBS',
+                      'Scar',
+                      'Spacer',
+                      'EmptySpace',
+                      'Ribozyme',
+                      'Ribonuclease',
+                      'Protease',
+                      'DNACleavageSite',
+                      'RNACleavageSite',
+                      'ProteinCleavageSite',
+                      'DNALocation',
+                      'RNALocation',
+                      'ProteinLocation',
+                      'DNAStability',
+                      'RNAStability',
+                      'ProteinStability',
+                      'StemTop',
+                      'Operator',
+                      'Origin',
+                      'Insulator',
+                      '5Overhang',
+                      '3Overhang',
+                      'RestrictionSite',
+                      'BluntRestrictionSite',
+                      'PrimerBindingSite',
+                      '5StickyRestrictionSite',
+                      '3StickyRestrictionSite',
+                      '5ChromosomalLocus',
+                      '3ChromosomalLocus',
+                      'UserDefined',
+                      'Signature']
+
+    # Standard regulatory types
+    STD_REG_TYPES = ['Repression',
+                     'Activation',
+                     'Connection']
+
+    def __init__(self, scale=1.0, linewidth=1.0, linecolor=(0,0,0), 
+                 backbone_pad_left=0.0, backbone_pad_right=0.0, circular_depth=15.0,
+                 use_collections=False, glyph_cache=None, lod_bp_per_pixel=None,
+                 lod_mode='density', bulk_traces=False):
+        """ Constructor to generate an empty DNARenderer.
+
+        Parameters
+        ----------
+        scale : float (default=1.0)
+            A scaling factor for the plot. Only used if rendering traces.
+
+        linewidth : float (default=1.0)
+            The default linewidth for all part drawing.
+
+        backbone_pad_left : float (default=0.0)
+            Padding to add to the left side of the backbone.
+
+        backbone_pad_right : float (default=0.0)
+            Padding to add to the left side of the backbone.
+
+        circular_depth : float (default=15.0)
+            Depth of the closed-loop plasmid backbone.
+
+        use_collections : bool (default=False)
+            Collection mode. If True, the patches and lines of all parts, regulation
+            and the backbone are batched into one collection per zorder and style,
+            rather than added to the axes as individual artists. This keeps the
+            number of artists (and draw/save time) roughly constant as designs grow.
+            Artists are drawn in the same order, but where the edges of parts drawn
+            in different styles meet, pixels can be antialiased slightly differently
+            (see CollectionAxes).
+
+        glyph_cache : GlyphCache (default=None)
+            Cache used to reuse the geometry of parts drawn by the built-in
+            renderers. If None, every part is drawn by its renderer.
+
+        lod_bp_per_pixel : float (default=None)
+            Level of detail threshold. Parts drawn by the built-in trace renderers 
+            are added to the axes as an artist per zorder (see LevelOfDetail). Whenever 
+            the figure is drawn and the axes shows more than this many units (bp 
+            for traces) per pixel, they are aggregated (see draw_lod) rather than 
+            drawn as individual glyphs, so the detail follows the x-limits set 
+            after rendering and any zooming. These parts have no handles. If None, 
+            glyphs are always drawn.
+
+        lod_mode : string (default='density')
+            How aggregated parts are drawn: 'density' (bars showing the number of
+            parts of each type per pixel) or 'blocks' (merged strand blocks).
+
+        bulk_traces : bool (default=False)
+            If True, unlabelled parts drawn by the built-in trace renderers are 
+            drawn in bulk (see draw_traces), as a few collections per part type 
+            rather than artists per part. Not used when handles are returned.
+        """
+        self.scale = scale
+        self.linewidth = linewidth
+        self.linecolor = linecolor
+        self.backbone_pad_left = backbone_pad_left
+        self.backbone_pad_right = backbone_pad_right
+        self.circular_depth = circular_depth
+        self.use_collections = use_collections
+        self.glyph_cache = glyph_cache
+        self.lod_bp_per_pixel = lod_bp_per_pixel
+        self.lod_mode = lod_mode
+        self.bulk_traces = bulk_traces
+        self.reg_height = 15
+
+    def SBOL_part_renderers (self):
+        """ Return dictionary of all standard built-in SBOL part renderers.
+        """
+        return {
+            'Promoter'           :sbol_promoter, 
+            'CDS'                :sbol_cds, 
+            'Terminator'         :sbol_terminator,
+            'RBS'                :sbol_rbs,
+            'Scar'               :sbol_scar,
+            'Spacer'             :sbol_spacer,
+            'EmptySpace'         :sbol_empty_space,
+            'Ribozyme'           :sbol_ribozyme,
+            'Ribonuclease'       :sbol_stem_top,
+            'Protease'           :sbol_stem_top,
+            'DNACleavageSite'    :sbol_stem_top,
+            'RNACleavageSite'    :sbol_stem_top,
+            'ProteinCleavageSite':sbol_stem_top,
+            'DNALocation'        :sbol_stem_top,
+            'RNALocation'        :sbol_stem_top,
+            'ProteinLocation'    :sbol_stem_top,
+            'DNAStability'       :sbol_stem_top,
+            'RNAStability'       :sbol_stem_top,
+            'ProteinStability'   :sbol_stem_top,
+            'StemTop'            :sbol_stem_top,
+            'Operator'           :sbol_operator,
+            'Origin'             :sbol_origin,
+            'Insulator'          :sbol_insulator,
+            '5Overhang'          :sbol_5_overhang,
+            '3Overhang'          :sbol_3_overhang,
+            'RestrictionSite'    :sbol_restriction_site,
+            'BluntRestrictionSite'   :sbol_blunt_restriction_site,
+            'PrimerBindingSite'      :sbol_primer_binding_site,
+            '5StickyRestrictionSite' :sbol_5_sticky_restriction_site,
+            '3StickyRestrictionSite' :sbol_3_sticky_restriction_site,
             '5ChromosomalLocus'      :sbol_5_chromosomal_locus,
             '3ChromosomalLocus'      :sbol_3_chromosomal_locus,
             'UserDefined'      :sbol_user_defined,
@@ -2730,7 +4821,7 @@ class DNARenderer:
             'Activation' :induce,
             'Connection' :connect}
 
-    def renderDNA (self, ax, parts, part_renderers, regs=None, reg_renderers=None, plot_backbone=True, circular=False):
+    def renderDNA (self, ax, parts, part_renderers, regs=None, reg_renderers=None, plot_backbone=True, circular=False, return_handles=False, region=None, stats=None, return_layout=False):
         """ Render the parts on the DNA and regulation.
 
         Parameters
@@ -2738,7 +4829,7 @@ class DNARenderer:
         ax : matplotlib.axes
             Axes to draw the design to.
 
-        parts : list(dict)
+        parts : list(dict) or DesignTable
             The design to draw. This is a list of dicts, where each dict relates to
             a part and must contain the following keys:
             - name (string)
@@ -2746,7 +4837,9 @@ class DNARenderer:
             - fwd (bool)
             - start (float, optional)
             - end (float, optional)
-            These will then be drawn in accordance with the renders selected
+            These will then be drawn in accordance with the renders selected. A
+            DesignTable holding the same values can be drawn instead (regulation
+            then links parts using views of the table, e.g. table[2]).
 
         part_renderers : dict(functions)
             Dict of functions where the key in the part type and the dictionary returns
@@ -2764,6 +4857,29 @@ class DNARenderer:
             Dict of functions where the key in the regulation type and the dictionary 
             returns the function to be used to draw that regulation type.
 
+        plot_backbone : bool (default=True)
+            Draw the DNA backbone.
+
+        circular : bool (default=False)
+            Draw the backbone as a closed-loop plasmid.
+
+        return_handles : bool (default=False)
+            Also return the artists drawn for each part and regulation, which can
+            be updated without redrawing the design (see DesignHandles).
+
+        region : (float, float) (default=None)
+            Only draw the parts and regulation arcs overlapping this x-range (see 
+            draw). The whole design is still laid out and updated.
+
+        stats : RenderStats or bool (default=None)
+            Record the time spent in each phase and renderer, the artists created
+            and cache hits to these statistics (or new statistics if True), which
+            are then also returned.
+
+        return_layout : bool (default=False)
+            Also return the Layout computed for the design (e.g., to find its
+            bounds).
+
         Returns
         -------
         start : float
@@ -2771,220 +4887,331 @@ class DNARenderer:
 
         end : float
             The x-point in the axis space that drawing ends.
+
+        handles : DesignHandles
+            The artists drawn (only returned if return_handles=True).
+
+        layout : Layout
+            The layout of the design (only returned if return_layout=True).
+
+        stats : RenderStats
+            The statistics recorded (only returned if stats is given).
+        """
+        if stats == True:
+            stats = RenderStats()
+        elif stats == False:
+            stats = None
+        layout = self.compute_layout(parts, part_renderers, regs, reg_renderers, stats=stats)
+        # Positions are written back to the design (used by regulation and annotation)
+        timer = PhaseTimer(stats)
+        self._update_design(layout, regs)
+        timer.lap('update_design')
+        handles = self.draw(layout, ax, plot_backbone=plot_backbone, circular=circular,
+                            return_handles=return_handles, region=region, stats=stats)
+        result = (layout.design_start, layout.design_end)
+        if return_handles == True:
+            result += (handles,)
+        if return_layout == True:
+            result += (layout,)
+        if stats != None:
+            result += (stats,)
+        return result
+
+    def compute_layout (self, parts, part_renderers, regs=None, reg_renderers=None, stats=None):
+        """ Calculate the position of every part and the arc height of every regulation
+        without drawing anything. The design is not modified.
+
+        Parameters
+        ----------
+        parts : list(dict) or DesignTable
+            The design to lay out (see renderDNA).
+
+        part_renderers : dict(functions)
+            Dict of functions where the key in the part type and the dictionary returns
+            the function to be used to draw that part type. Built-in renderers are
+            laid out using their functions in part_layouts, other renderers are drawn 
+            to a NullAxes to find their extent.
+
+        regs : list(dict) (default=None)
+            Regulation present in the design (see renderDNA).
+
+        reg_renderers : dict(functions) (default=None)
+            Dict of functions where the key in the regulation type and the dictionary 
+            returns the function to be used to draw that regulation type.
+
+        stats : RenderStats (default=None)
+            Statistics to record the time taken laying out parts and arcs to.
+
+        Returns
+        -------
+        layout : Layout
+            Immutable layout that can be drawn using draw().
         """
-        # Update the matplotlib rendering default for drawing the parts (we want mitered edges)
-        matplotlib.rcParams['lines.dash_joinstyle']  = 'miter'
-        matplotlib.rcParams['lines.dash_capstyle']   = 'butt'
-        matplotlib.rcParams['lines.solid_joinstyle'] = 'miter'
-        matplotlib.rcParams['lines.solid_capstyle']  = 'projecting'
-        # Make text editable in Adobe Illustrator
-        matplotlib.rcParams['pdf.fonttype']          = 42 
-        # Plot the parts to the axis
-        part_num = 0
+        nested = NestedPhases(stats)
+        timer = PhaseTimer(stats)
+        option_hits, option_misses = OptionSchema.counts()
+        if regs == None:
+            regs = []
+        if reg_renderers == None:
+            reg_renderers = {}
+        num_parts = len(parts)
+        start = np.full(num_parts, np.nan)
+        end = np.full(num_parts, np.nan)
+        strand = np.zeros(num_parts, dtype=int)
+        extent = np.full((num_parts, 2), np.nan)
+        drawn = np.zeros(num_parts, dtype=bool)
+        coords = [None]*num_parts
+        prev_ends = np.zeros(num_parts)
         prev_end = 0
         first_start = 0
         first_part = True
 
-        for part in parts:
-            keys = list(part.keys())
-
-            # Check the part has minimal details required
-            if 'type' in keys:
-                if 'fwd' not in keys:
-                    part['fwd'] = True
-                elif part['fwd'] == False and 'start' in keys and 'end' in keys:
-                    start = part['start']
-                    end = part['end']
-                    part['end'] = start
-                    part['start'] = end
-                if 'start' not in keys:
-                    if part['fwd'] == True:
-                        part['start'] = part_num
-                    else:
-                        part['start'] = part_num+1
-                if 'end' not in keys:
-                    if part['fwd'] == True:
-                        part['end'] = part_num+1
-                    else:
-                        part['end'] = part_num
-                # Extract custom part options (if available)
-                part_opts = None
-                if 'opts' in list(part.keys()):
-                    part_opts = part['opts']
-                # Use the correct renderer
-                if 'renderer' in list(part.keys()):
-                    # Use custom renderer
-                    prev_start, prev_end = part['renderer'](ax, part['type'], part_num, 
-                                     part['start'], part['end'], prev_end,
-                                     self.scale, self.linewidth, 
-                                     opts=part_opts)
-
-                    #update start,end for regulation
-                    #part['start'] = prev_start
-                    #part['end'] = prev_end
-
-                    if first_part == True:
-                        first_start = prev_start
-                        first_part = False
+        for part_num, part_type, fwd, in_start, in_end, custom_renderer, part_opts in part_records(parts):
+            # Orientation and coordinates handed to the renderer
+            has_start = in_start != None
+            has_end = in_end != None
+            if fwd == False and has_start and has_end:
+                in_start, in_end = in_end, in_start
+            if has_start == False:
+                if fwd == True:
+                    in_start = part_num
                 else:
-                    # Use standard renderer, if one exists
-                    if part['type'] in list(part_renderers.keys()):
-                        prev_start, prev_end = part_renderers[part['type']](ax, 
-                                       part['type'], part_num, 
-                                       part['start'], part['end'], 
-                                       prev_end, self.scale, 
-                                       self.linewidth, opts=part_opts)
-                        
-                        #update start,end for regulation [TEG]
-                        if part['fwd'] == True:
-                            part['start'] = prev_start
-                            part['end'] = prev_end
-                        else:
-                            part['start'] = prev_end
-                            part['end'] = prev_start
-                        
-                        if first_part == True:
-                            first_start = prev_start
-                            first_part = False
-            part_num += 1
-        
-        # first pass to get all of the arcranges
-        if regs != None:
+                    in_start = part_num+1
+            if has_end == False:
+                if fwd == True:
+                    in_end = part_num+1
+                else:
+                    in_end = part_num
+            out_start = in_start
+            out_end = in_end
+            # Find the renderer to use (a custom one takes priority)
+            renderer = custom_renderer
+            if renderer == None and part_type in part_renderers:
+                renderer = part_renderers[part_type]
+            if renderer != None:
+                prev_ends[part_num] = prev_end
+                layout_fn = part_layouts.get(renderer)
+                if layout_fn != None:
+                    prev_start, prev_end = layout_fn(part_type, part_num, 
+                                           in_start, in_end, prev_end, 
+                                           self.scale, self.linewidth, part_opts)
+                else:
+                    prev_start, prev_end = renderer(NullAxes(), part_type, part_num, 
+                                           in_start, in_end, prev_end, 
+                                           self.scale, self.linewidth, opts=part_opts)
+                if custom_renderer == None:
+                    if fwd == True:
+                        out_start = prev_start
+                        out_end = prev_end
+                    else:
+                        out_start = prev_end
+                        out_end = prev_start
+                if first_part == True:
+                    first_start = prev_start
+                    first_part = False
+                drawn[part_num] = True
+                extent[part_num] = [prev_start, prev_end]
+            if fwd == True:
+                strand[part_num] = 1
+            else:
+                strand[part_num] = -1
+            start[part_num] = out_start
+            end[part_num] = out_end
+            coords[part_num] = (in_start, in_end, out_start, out_end)
+        part_index = self._index_parts(parts, regs)
+        timer.lap('layout_parts')
+
+        # Regulation arcs span the mid-points of the parts they link
+        num_regs = len(regs)
+        reg_span = np.full((num_regs, 2), np.nan)
+        reg_heights = np.zeros(num_regs, dtype=int)
+        reg_order = []
+        reg_above = {}
+        for reg_num, reg in enumerate(regs):
+            keys = list(reg.keys())
+            if 'type' in keys and 'from_part' in keys and 'to_part' in keys:
+                if reg['type'] in reg_renderers:
+                    from_start, from_end, from_fwd = self._part_position(reg['from_part'], part_index, coords)
+                    to_start, to_end, to_fwd = self._part_position(reg['to_part'], part_index, coords)
+                    reg_span[reg_num] = [(from_start + from_end) / 2, (to_start + to_end) / 2]
+                    reg_above[reg_num] = (to_fwd == True)
+                    reg_order.append(reg_num)
+
+        # Sort regs by arc ranges from shortest to longest
+        reg_order.sort(key=lambda x: math.fabs(reg_span[x][0]-reg_span[x][1]))
+
+        # Stack overlapping arcs (arcs above and below the backbone never clash)
+        if len(reg_order) > 0:
+            heights = assign_arc_heights(reg_span[reg_order, 0], reg_span[reg_order, 1],
+                                         [reg_above[r] for r in reg_order])
+            reg_heights[reg_order] = heights
+        reg_rank = np.zeros(num_regs, dtype=int)
+        reg_rank[reg_order] = np.arange(len(reg_order))
+        timer.lap('arc_layout')
+        nested.stop()
+        if stats != None:
+            option_counts = OptionSchema.counts()
+            stats.add_cache('options', option_counts[0]-option_hits, 
+                            option_counts[1]-option_misses)
+
+        if not isinstance(parts, DesignTable):
+            parts = tuple(parts)
+        return Layout(parts=parts, regs=tuple(regs), 
+                      part_renderers=part_renderers, reg_renderers=reg_renderers,
+                      start=start, end=end, strand=strand, extent=extent, drawn=drawn,
+                      reg_span=reg_span, reg_heights=reg_heights,
+                      reg_order=np.array(reg_order, dtype=int),
+                      design_start=first_start, design_end=prev_end, _coords=tuple(coords),
+                      _prev_end=prev_ends, _part_nums=part_index, _reg_rank=reg_rank,
+                      _part_intervals=IntervalIndex(extent), 
+                      _reg_intervals=IntervalIndex(reg_span))
+
+    def draw (self, layout, ax, plot_backbone=True, circular=False, return_handles=False, region=None, stats=None):
+        """ Draw a design to an axes using a layout generated by compute_layout(). 
+        The design is not modified.
+
+        Parameters
+        ----------
+        layout : Layout
+            The layout of the design to draw.
+
+        ax : matplotlib.axes
+            Axes to draw the design to.
+
+        plot_backbone : bool (default=True)
+            Draw the DNA backbone.
+
+        circular : bool (default=False)
+            Draw the backbone as a closed-loop plasmid.
+
+        return_handles : bool (default=False)
+            Record the artists drawn for each part and regulation.
+
+        region : (float, float) (default=None)
+            Only draw the parts and regulation arcs overlapping this x-range 
+            (e.g., ax.get_xlim()). Parts are found using an index held by the
+            layout, so the time taken depends on the number of parts visible.
+
+        stats : RenderStats (default=None)
+            Statistics to record the time taken by each phase and renderer, the 
+            artists created for each part type and the cache hits to.
+
+        Returns
+        -------
+        handles : DesignHandles
+            The artists drawn (only if return_handles=True, otherwise None).
+        """
+        nested = NestedPhases(stats)
+        timer = PhaseTimer(stats)
+        if stats != None:
+            option_hits, option_misses = OptionSchema.counts()
+            if self.glyph_cache != None:
+                glyph_hits, glyph_misses = self.glyph_cache.hits, self.glyph_cache.misses
+        axes = ax
+        # In collection mode renderers draw to a buffer that is flushed at the end
+        if self.use_collections == True:
+            ax = CollectionAxes(ax)
+        # Artists added by the renderers are recorded if handles (or stats) are needed
+        handles = None
+        if return_handles == True:
+            handles = DesignHandles()
+        if (handles != None or stats != None) and self.use_collections == False:
+            ax = ArtistTracker(ax)
+        # Select the parts and regulation to draw
+        if region == None:
+            part_nums = np.flatnonzero(layout.drawn)
+            reg_nums = layout.reg_order
+        else:
+            part_nums = layout.parts_in(region[0], region[1])
+            reg_nums = layout.regs_in(region[0], region[1])
+        timer.lap('select_parts')
+        # Trace parts are drawn at the level of detail of the view when the figure 
+        # is drawn
+        if self.lod_bp_per_pixel != None and len(part_nums) > 0:
+            lod = np.array([self._is_trace(layout, n) for n in part_nums.tolist()], dtype=bool)
+            if lod.any():
+                # An artist is added for each zorder the parts are drawn at
+                lod_parts = LevelOfDetail(self, layout, part_nums[lod])
+                for zorder in lod_parts.find_zorders(axes):
+                    ax.add_artist(level_of_detail_artist(lod_parts, zorder))
+                part_nums = part_nums[~lod]
+            timer.lap('draw_lod')
+        # Trace parts are drawn as columns of coordinates by a bulk renderer
+        if self.bulk_traces == True and handles == None and len(part_nums) > 0:
+            part_nums, groups = bulk_trace_groups(layout, part_nums)
+            for (renderer, key), nums in groups.items():
+                if stats != None:
+                    start_time = time.perf_counter()
+                first = layout.parts[nums[0]]
+                opts = dict(first.get('opts') or {})
+                opts.pop('color', None)
+                colors = [bulk_trace_renderers[renderer][1].resolve(layout.parts[n].get('opts')).color 
+                          for n in nums]
+                cols = draw_traces(ax, renderer, [layout._coords[n][0] for n in nums], 
+                                   [layout._coords[n][1] for n in nums], colors=colors, opts=opts,
+                                   scale=self.scale, linewidth=self.linewidth)
+                if stats != None:
+                    stats.add_renderer('bulk_'+renderer.__name__, first['type'], 
+                                       time.perf_counter()-start_time, len(cols))
+            timer.lap('draw_bulk_traces')
+        # Plot the parts to the axis (each placed after the end of the previous part)
+        for part_num in part_nums.tolist():
+            part = layout.parts[part_num]
+            part_opts = None
+            if 'opts' in list(part.keys()):
+                part_opts = part['opts']
+            if handles != None:
+                ax.track = self._handle_entry(handles.parts, part.get('name', part_num),
+                                              part.get('renderer', layout.part_renderers.get(part['type'])),
+                                              part_opts)
+            elif stats != None:
+                ax.track = []
+            if stats != None:
+                num_artists = len(ax.track)
+                start_time = time.perf_counter()
+            renderer = self._render_part(ax, layout, part_num)
+            if stats != None:
+                stats.add_renderer(renderer.__name__, part['type'], time.perf_counter()-start_time,
+                                   len(ax.track)-num_artists)
+        timer.lap('build_glyphs')
+
+        # Plot the regulation (shortest arcs first)
+        part_index = layout._part_nums
+        for r in reg_nums.tolist():
+            reg_num = int(layout._reg_rank[r])
+            reg = layout.regs[r]
+            reg_opts = None
+            if 'opts' in list(reg.keys()):
+                reg_opts = reg['opts']
+            from_part = self._placed_part(layout, reg['from_part'], part_index)
+            to_part = self._placed_part(layout, reg['to_part'], part_index)
+            if handles != None:
+                ax.track = self._handle_entry(handles.regs, r, 
+                                              layout.reg_renderers[reg['type']], reg_opts)
+            elif stats != None:
+                ax.track = []
+            if stats != None:
+                num_artists = len(ax.track)
+                start_time = time.perf_counter()
+            layout.reg_renderers[reg['type']](ax, reg['type'], 
+                                 reg_num, from_part, to_part, self.scale, 
+                                 self.linewidth, int(layout.reg_heights[r]), opts=reg_opts)
+            if stats != None:
+                stats.add_renderer(layout.reg_renderers[reg['type']].__name__, reg['type'], 
+                                   time.perf_counter()-start_time, len(ax.track)-num_artists)
+        timer.lap('draw_regulation')
 
-            for reg in regs:
-                keys = list(reg.keys())
-
-                # Check the part has minimal details required
-                if 'type' in keys and 'from_part' in keys and 'to_part' in keys:
-                    # Extract custom part options (if available)
-
-                    reg_opts = None
-                    if 'opts' in list(reg.keys()):
-                        reg_opts = reg['opts']
-                    
-                    if reg['type'] in list(reg_renderers.keys()):
-                        
-                        ##############################################################################
-                        arcstart = (reg['from_part']['start'] + reg['from_part']['end']) / 2
-                        arcend   = (reg['to_part']['start']   + reg['to_part']['end']) / 2
-                        arcrange = [arcstart,arcend]
-                        reg['arclength'] = math.fabs(arcstart-arcend)
-                        reg['arc_height_index'] = 1
-                        ##############################################################################
-
-            #sort regs by arc ranges from shortest to longest
-            regs.sort(key=lambda x: x['arclength'], reverse=False)
-
-            reg_num = 0
-            pos_arc_ranges = [] # arc above DNA backbone if to_part is fwd
-            neg_arc_ranges = [] # arc below DNA backbone if to_part is reverse
-            current_max = 1
-
-            # second pass to render all the arcs
-            for reg in regs:
-                keys = list(reg.keys())
-
-                # Check the part has minimal details required
-                if 'type' in keys and 'from_part' in keys and 'to_part' in keys:
-                    # Extract custom part options (if available)
-
-                    reg_opts = None
-                    if 'opts' in list(reg.keys()):
-                        reg_opts = reg['opts']
-                    
-                    if reg['type'] in list(reg_renderers.keys()):
-                        
-                        ##############################################################################
-                        # arc height algorithm: greedy from left-to-right on DNA design
-                        
-                        arcstart = (reg['from_part']['start'] + reg['from_part']['end']) / 2
-                        arcend   = (reg['to_part']['start']   + reg['to_part']['end']) / 2
-                        
-                        arcmin = min(arcstart,arcend)
-                        arcmax = max(arcstart,arcend)
-                        arcrange = [arcmin,arcmax,reg['arc_height_index']]
-                        arc_height_index = 1
-                        
-                        # arc above if to_part is fwd
-                        if(reg['to_part']['fwd'] == True):
-                            # find max arc height index of ONLY the prior arcs that clash with the current arc
-                            current_max = 1
-                            for r in pos_arc_ranges:
-                                if  (arcrange[0] > r[0] and arcrange[0] < r[1]):
-                                    if(r[2] > current_max):
-                                        current_max = r[2]
-                                elif(arcrange[0] > r[1] and arcrange[0] < r[0]):
-                                    if(r[2] > current_max):
-                                        current_max = r[2]
-                                elif(arcrange[1] > r[0] and arcrange[0] < r[1]):
-                                    if(r[2] > current_max):
-                                        current_max = r[2]
-                                elif(arcrange[1] > r[1] and arcrange[0] < r[0]):
-                                    if(r[2] > current_max):
-                                        current_max = r[2]
-                                    
-                            # if arcs cross over, increment the arc height index
-                            for r in pos_arc_ranges:
-                                if  (arcrange[0] > r[0] and arcrange[0] < r[1]):
-                                    reg['arc_height_index'] = current_max + 1
-                                    arcrange[2] = reg['arc_height_index']
-                                elif(arcrange[0] > r[1] and arcrange[0] < r[0]):
-                                    reg['arc_height_index'] = current_max + 1
-                                    arcrange[2] = reg['arc_height_index']
-                                elif(arcrange[1] > r[0] and arcrange[0] < r[1]):
-                                    reg['arc_height_index'] = current_max + 1
-                                    arcrange[2] = reg['arc_height_index']
-                                elif(arcrange[1] > r[1] and arcrange[0] < r[0]):
-                                    reg['arc_height_index'] = current_max + 1
-                                    arcrange[2] = reg['arc_height_index']
-                            pos_arc_ranges.append(arcrange)
-                        
-                        # arc below if to_part is reverse
-                        else:
-                            # find max arc height index
-                            current_max = 1
-                            for r in neg_arc_ranges:
-                                if  (arcrange[0] > r[0] and arcrange[0] < r[1]):
-                                    if(r[2] > current_max):
-                                        current_max = r[2]
-                                elif(arcrange[0] > r[1] and arcrange[0] < r[0]):
-                                    if(r[2] > current_max):
-                                        current_max = r[2]
-                                elif(arcrange[1] > r[0] and arcrange[0] < r[1]):
-                                    if(r[2] > current_max):
-                                        current_max = r[2]
-                                elif(arcrange[1] > r[1] and arcrange[0] < r[0]):
-                                    if(r[2] > current_max):
-                                        current_max = r[2]
-                            
-                            # if arcs cross over, increment the arc height index
-                            for r in neg_arc_ranges:
-                                if  (arcrange[0] > r[0] and arcrange[0] < r[1]):
-                                    reg['arc_height_index'] = current_max + 1
-                                    arcrange[2] = reg['arc_height_index']
-                                elif(arcrange[0] > r[1] and arcrange[0] < r[0]):
-                                    reg['arc_height_index'] = current_max + 1
-                                    arcrange[2] = reg['arc_height_index']
-                                elif(arcrange[1] > r[0] and arcrange[0] < r[1]):
-                                    reg['arc_height_index'] = current_max + 1
-                                    arcrange[2] = reg['arc_height_index']
-                                elif(arcrange[1] > r[1] and arcrange[0] < r[0]):
-                                    reg['arc_height_index'] = current_max + 1
-                                    arcrange[2] = reg['arc_height_index']
-                            neg_arc_ranges.append(arcrange)
-                        ##############################################################################
-                        reg_renderers[reg['type']](ax, reg['type'], 
-                                       reg_num, reg['from_part'], 
-                                       reg['to_part'], self.scale, 
-                                       self.linewidth, reg['arc_height_index'], opts=reg_opts)
-                reg_num += 1
         # Plot the backbone (z=1)
+        if handles != None:
+            ax.track = handles.backbone
+        elif stats != None:
+            ax.track = None
         if plot_backbone == True:
-            backbone_start = first_start-self.backbone_pad_left
-            backbone_end = prev_end+self.backbone_pad_right
+            backbone_start = layout.design_start-self.backbone_pad_left
+            backbone_end = layout.design_end+self.backbone_pad_right
             kwargs = dict(linewidth=self.linewidth, color=self.linecolor, zorder=10)
             if circular == False:
-                l1 = Line2D([backbone_start,backbone_end], [0,0], **kwargs)
+                l1 = mitered_line([backbone_start,backbone_end], [0,0], **kwargs)
                 ax.add_line(l1)
             else:
                 rad = 5
@@ -3012,7 +5239,132 @@ class DNARenderer:
                 path = Path(verts, codes)
                 patch = PathPatch(path, fill=False, **kwargs)
                 ax.add_patch(patch)
-        return first_start, prev_end
+        timer.lap('draw_backbone')
+        if self.use_collections == True:
+            ax.flush()
+            timer.lap('flush_collections')
+        nested.stop()
+        if stats != None:
+            option_counts = OptionSchema.counts()
+            stats.add_cache('options', option_counts[0]-option_hits, 
+                            option_counts[1]-option_misses)
+            if self.glyph_cache != None:
+                stats.add_cache('glyph', self.glyph_cache.hits-glyph_hits, 
+                                self.glyph_cache.misses-glyph_misses)
+        return handles
+
+    def _render_part (self, ax, layout, part_num):
+        """ Draw a part of a layout to an axes. Returns the renderer used.
+        """
+        part = layout.parts[part_num]
+        in_start, in_end, out_start, out_end = layout._coords[part_num]
+        prev_end = float(layout._prev_end[part_num])
+        part_opts = None
+        if 'opts' in list(part.keys()):
+            part_opts = part['opts']
+        if 'renderer' in list(part.keys()):
+            renderer = part['renderer']
+            renderer(ax, part['type'], part_num, in_start, in_end, prev_end, 
+                     self.scale, self.linewidth, opts=part_opts)
+        else:
+            renderer = layout.part_renderers[part['type']]
+            if self.glyph_cache != None:
+                self.glyph_cache.render(renderer, ax, part['type'], part_num, 
+                                        in_start, in_end, prev_end, 
+                                        self.scale, self.linewidth, opts=part_opts)
+            else:
+                renderer(ax, part['type'], part_num, in_start, in_end, prev_end, 
+                         self.scale, self.linewidth, opts=part_opts)
+        return renderer
+
+    def _is_trace (self, layout, part_num):
+        """ Check if a part is drawn by a built-in trace renderer.
+        """
+        part = layout.parts[part_num]
+        if 'renderer' in part:
+            return False
+        return part_layouts.get(layout.part_renderers[part['type']]) == trace_layout
+
+    def _handle_entry (self, entries, key, renderer, opts):
+        """ Return the list of artists for a part or regulation in a set of handles
+        (created if needed along with the color it is drawn with).
+        """
+        if key not in entries:
+            color = None
+            schema = renderer_options.get(renderer)
+            if schema != None:
+                color = getattr(schema.resolve(opts), 'color', None)
+            elif opts != None:
+                color = opts.get('color')
+            entries[key] = {'artists':[], 'color':color}
+        return entries[key]['artists']
+
+    def _index_parts (self, parts, regs):
+        """ Return the number of each part (with a type) that regulation can link,
+        keyed by part_key(). Only the parts of a DesignTable that are linked by 
+        regulation are included.
+        """
+        part_index = {}
+        if isinstance(parts, DesignTable):
+            for reg in regs:
+                for key in ('from_part', 'to_part'):
+                    part = reg.get(key)
+                    if isinstance(part, PartView) and part.table is parts and \
+                       parts.type_id[part.index] >= 0:
+                        part_index[part_key(part)] = part.index
+        else:
+            for part_num, part in enumerate(parts):
+                if 'type' in part:
+                    part_index[id(part)] = part_num
+        return part_index
+
+    def _part_position (self, part, part_index, coords):
+        """ Return the start, end and orientation of a part linked by regulation.
+        """
+        if part_key(part) in part_index:
+            part_num = part_index[part_key(part)]
+            fwd = True
+            if 'fwd' in part:
+                fwd = part['fwd']
+            return coords[part_num][2], coords[part_num][3], fwd
+        return part['start'], part['end'], part.get('fwd', True)
+
+    def _placed_part (self, layout, part, part_index):
+        """ Return a copy of a part linked by regulation holding its laid out position.
+        """
+        if part_key(part) not in part_index:
+            return part
+        part_num = part_index[part_key(part)]
+        placed_part = dict(part)
+        placed_part['start'] = layout._coords[part_num][2]
+        placed_part['end'] = layout._coords[part_num][3]
+        placed_part['fwd'] = part.get('fwd', True)
+        return placed_part
+
+    def _update_design (self, layout, regs):
+        """ Write a layout back to the design: parts hold their positions and regs
+        are sorted into drawing order and hold their arc heights.
+        """
+        if isinstance(layout.parts, DesignTable):
+            # Columns are updated in place (orientation is always held)
+            placed = layout.strand != 0
+            layout.parts.start[placed] = layout.start[placed]
+            layout.parts.end[placed] = layout.end[placed]
+        else:
+            for part_num, part in enumerate(layout.parts):
+                if layout.strand[part_num] != 0:
+                    if 'fwd' not in list(part.keys()):
+                        part['fwd'] = True
+                    part['start'] = layout._coords[part_num][2]
+                    part['end'] = layout._coords[part_num][3]
+        if regs != None:
+            for r in layout.reg_order:
+                reg = layout.regs[r]
+                reg['arclength'] = math.fabs(layout.reg_span[r][0]-layout.reg_span[r][1])
+                reg['arc_height_index'] = int(layout.reg_heights[r])
+            drawn_regs = set(layout.reg_order)
+            undrawn_regs = [reg for r, reg in enumerate(layout.regs) if r not in drawn_regs]
+            regs[:] = [layout.regs[r] for r in layout.reg_order] + undrawn_regs
 
     def annotate (self, ax, part_renderers, part, annotate_zorder=1000):
         """ Annotate a plot at a user specified location and offset.
@@ -3035,7 +5387,7 @@ class DNARenderer:
 ###############################################################################
 
 
-def plot_sbol_designs (axes, dna_designs, regulations=None, plot_params={}, plot_names=None):
+def plot_sbol_designs (axes, dna_designs, regulations=None, plot_params={}, plot_names=None, renderer=None, stats=None, layouts=None, handles=None):
     """ Plot SBOL designs to axes.
 
     Parameters
@@ -3055,6 +5407,20 @@ def plot_sbol_designs (axes, dna_designs, regulations=None, plot_params={}, plot
     plot_names : list(string) (default=None)
         List of names to use on each plot. If None provided then no titles displayed.
 
+    renderer : DNARenderer (default=None)
+        Renderer to draw the designs with (e.g., one reused between calls). If None,
+        a renderer is created using the scale, linewidth and padding in plot_params.
+
+    stats : RenderStats (default=None)
+        Statistics to record the rendering of each design to (see renderDNA).
+
+    layouts : list (default=None)
+        List to append the Layout of each design to (e.g., to find their bounds).
+
+    handles : list (default=None)
+        List to append the DesignHandles of each design to (e.g., to update the
+        colors of parts in an animation without drawing the designs again).
+
     Returns
     -------
     xlims : [float, float]
@@ -3080,7 +5446,9 @@ def plot_sbol_designs (axes, dna_designs, regulations=None, plot_params={}, plot
         scale = plot_params['scale']
     if 'linewidth' in list(plot_params.keys()):
         linewidth = plot_params['linewidth']
-    dr = DNARenderer(scale=scale, linewidth=linewidth,
+    dr = renderer
+    if dr == None:
+        dr = DNARenderer(scale=scale, linewidth=linewidth,
                          backbone_pad_left=left_pad, 
                          backbone_pad_right=right_pad)
 
@@ -3104,7 +5472,15 @@ def plot_sbol_designs (axes, dna_designs, regulations=None, plot_params={}, plot
         if plot_names != None:
             ax.set_title(plot_names[i], fontsize=8)
 
-        start, end = dr.renderDNA(ax, design, part_renderers, regs, reg_renderers)
+        result = dr.renderDNA(ax, design, part_renderers, regs, reg_renderers, stats=stats,
+                              return_handles=(handles != None), return_layout=True)
+        start, end = result[:2]
+        layout = result[2]
+        if handles != None:
+            handles.append(result[2])
+            layout = result[3]
+        if layouts != None:
+            layouts.append(layout)
 
         dna_len = end-start
         if max_dna_len < dna_len:
@@ -3125,15 +5501,213 @@ def plot_sbol_designs (axes, dna_designs, regulations=None, plot_params={}, plot
     return max_dna_len, [(-0.01*max_dna_len)-left_pad, max_dna_len+(0.01*max_dna_len)+right_pad], [-plot_params['axis_y'],plot_params['axis_y']]
 
 
-def save_sbol_designs (filename, dna_designs, regulations=None, plot_params={}, plot_names=None):
-    """ Plot SBOL designs to axes.
+def new_figure (figsize=(10,10)):
+    """ Create a figure with its own Agg canvas. The figure is not registered 
+    with pyplot, so it is freed once no longer used and figures can be drawn 
+    concurrently from different threads.
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# Settings used when saving figures (make text editable in Adobe Illustrator)
+export_rc = {'pdf.fonttype': 42}
+
+# Saves that need export settings applied to matplotlib.rcParams
+_export_lock = threading.Lock()
+
+
+def fit_axes (fig, axes, xlim, ylim, bounds=None, units_per_inch=70.0, pad=0.15, 
+              title_size=None, min_width=1.0):
+    """ Size a figure and place its axes (a column of designs sharing the same 
+    limits, as drawn by plot_sbol_designs) directly from the axes limits and 
+    design bounds, rather than by measuring every artist drawn (as tight_layout
+    does). Axes are drawn at units_per_inch, with space around them for the 
+    parts of the designs outside the limits (e.g., labels) and any titles.
 
     Parameters
     ----------
-    filename : string
-        Image filename to save designs to. Extention provided will determine format
-        and must be supported by matplotlib.
+    fig : matplotlib.figure.Figure
+        Figure holding the axes.
+
+    axes : list(matplotlib.axes)
+        Axes to place (top to bottom).
+
+    xlim, ylim : [float, float]
+        Limits of every axes.
+
+    bounds : list([float, float, float, float]) (default=None)
+        Region covered by the design on each axes (see Layout.bounds).
+
+    units_per_inch : float (default=70.0)
+        Axes units drawn per inch.
+
+    pad : float (default=0.15)
+        Space (inches) around the edge of the figure and between axes.
+
+    title_size : float (default=None)
+        Font size of the axes titles (None if there are no titles).
+
+    min_width : float (default=1.0)
+        Minimum width of the figure (inches). Narrower designs are centered.
+    """
+    ax_w = (xlim[1]-xlim[0])/units_per_inch
+    ax_h = (ylim[1]-ylim[0])/units_per_inch
+    title_h = 0.0
+    if title_size != None:
+        title_h = (1.2*title_size+matplotlib.rcParams['axes.titlepad'])/72.0
+    # Space needed beyond the limits of each axes
+    left = 0.0
+    right = 0.0
+    rows = []
+    for i in range(len(axes)):
+        above = title_h
+        below = 0.0
+        if bounds is not None:
+            x_min, x_max, y_min, y_max = bounds[i]
+            left = max(left, (xlim[0]-x_min)/units_per_inch)
+            right = max(right, (x_max-xlim[1])/units_per_inch)
+            above += max(0.0, (y_max-ylim[1])/units_per_inch)
+            below = max(0.0, (ylim[0]-y_min)/units_per_inch)
+        rows.append((above, below))
+    fig_w = pad+left+ax_w+right+pad
+    x_shift = 0.0
+    if fig_w < min_width:
+        x_shift = (min_width-fig_w)/2.0
+        fig_w = min_width
+    fig_h = pad*(len(axes)+1) + sum([above+ax_h+below for above, below in rows])
+    fig.set_size_inches((fig_w, fig_h))
+    y = fig_h-pad
+    for ax, (above, below) in zip(axes, rows):
+        y -= above+ax_h
+        ax.set_position([(pad+left+x_shift)/fig_w, y/fig_h, ax_w/fig_w, ax_h/fig_h])
+        y -= below+pad
+
+
+@contextlib.contextmanager
+def export_settings (fmt, rc=None):
+    """ Context in which figures are saved to a format using the export settings 
+    in export_rc, updated by rc. matplotlib only reads these from its global 
+    rcParams, so the settings for the format (e.g., 'pdf.*') are applied and 
+    restored while a lock is held. Formats without such settings (e.g., png) do
+    not change or lock the rcParams. Use this around writers that save several
+    figures (e.g., PdfPages, which embeds fonts when closed).
+    """
+    settings = dict(export_rc)
+    if rc != None:
+        settings.update(rc)
+    settings = dict((k, v) for k, v in settings.items() if k.split('.')[0] == fmt)
+    if len(settings) == 0:
+        yield
+        return
+    with _export_lock:
+        with matplotlib.rc_context(settings):
+            yield
+
+
+# Raster formats written from a shared Agg buffer by save_figure_formats
+buffer_formats = {'png':'png', 'jpg':'jpeg', 'jpeg':'jpeg', 'tif':'tiff', 'tiff':'tiff', 'webp':'webp'}
+
+
+def _output_format (fname, opts):
+    """ Return the format a file will be saved in (given by its options or name).
+    """
+    fmt = opts.get('format')
+    if fmt == None and isinstance(fname, str):
+        fmt = os.path.splitext(fname)[1][1:].lower()
+    if not fmt:
+        fmt = matplotlib.rcParams['savefig.format']
+    return fmt
+
+
+def save_figure (fig, fname, rc=None, **kwargs):
+    """ Save a figure (as for fig.savefig) using the export settings in export_rc,
+    updated by rc (see export_settings).
+    """
+    with export_settings(_output_format(fname, kwargs), rc):
+        fig.savefig(fname, **kwargs)
+
+
+def save_figure_formats (fig, outputs, rc=None, stats=None, **kwargs):
+    """ Save a figure to several files (e.g., PDF, SVG and PNG at several
+    resolutions) drawing it as few times as possible. Raster outputs with the
+    same resolution and drawing options (e.g., design.png and design.jpg at 300
+    dpi) are written from a single Agg draw. Vector formats each need their own
+    draw and are saved using save_figure.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Figure to save.
+
+    outputs : list(string or (string, dict))
+        Files to save to (filenames or binary file-like objects), each optionally
+        with savefig options for that file (e.g., ('design_hi.png', {'dpi':600})).
+
+    rc : dict (default=None)
+        matplotlib.rcParams to save with, in addition to export_rc (see save_figure).
+
+    stats : RenderStats (default=None)
+        Statistics to record the time taken drawing and writing each output.
+
+    **kwargs
+        savefig options used for every output (e.g., transparent=True), updated
+        by those given for each file.
+    """
+    timer = PhaseTimer(stats)
+    groups = OrderedDict()
+    for output in outputs:
+        if isinstance(output, tuple):
+            fname, file_opts = output
+        else:
+            fname, file_opts = output, {}
+        opts = dict(kwargs)
+        opts.update(file_opts)
+        fmt = _output_format(fname, opts)
+        if fmt not in buffer_formats or opts.get('bbox_inches') != None:
+            # Vector formats and cropped figures are drawn for each file
+            save_figure(fig, fname, rc=rc, **opts)
+            timer.lap('savefig')
+            continue
+        opts['format'] = fmt
+        if opts.get('dpi') in (None, 'figure'):
+            opts['dpi'] = matplotlib.rcParams['savefig.dpi']
+        if opts['dpi'] == 'figure':
+            opts['dpi'] = fig.dpi
+        draw_opts = dict((k, v) for k, v in opts.items() if k not in ('format', 'metadata', 'pil_kwargs'))
+        key = glyph_key_value(draw_opts)
+        if key not in groups:
+            groups[key] = (draw_opts, [])
+        groups[key][1].append((fname, opts))
+
+    for draw_opts, files in groups.values():
+        # Draw once and write each file from the RGBA buffer (as the Agg canvas does)
+        dpi = draw_opts['dpi']
+        buf = io.BytesIO()
+        fig.savefig(buf, format='rgba', **draw_opts)
+        width, height = fig.get_size_inches()*dpi
+        pixels = np.frombuffer(buf.getbuffer(), dtype=np.uint8).reshape((int(height), int(width), 4))
+        timer.lap('draw_buffer')
+        for fname, opts in files:
+            fmt = buffer_formats[opts['format']]
+            settings = {}
+            if fmt == 'jpeg':
+                # Blend semi-transparent figures against white (as for savefig)
+                settings['savefig.facecolor'] = 'white'
+            with matplotlib.rc_context(settings):
+                imsave(fname, pixels, format=fmt, origin='upper', dpi=dpi,
+                       metadata=opts.get('metadata'), pil_kwargs=opts.get('pil_kwargs'))
+            timer.lap('write_buffer')
+
+
+def render_sbol_designs (dna_designs, regulations=None, plot_params={}, plot_names=None, 
+                         fmt='png', dpi=300, out=None, metadata=None, rc=None, renderer=None,
+                         stats=None, tight_layout=False):
+    """ Render SBOL designs (laid out as for save_sbol_designs) without using pyplot.
 
+    Parameters
+    ----------
     dna_designs : list(dict(design_information))
         List of designs to plot.
 
@@ -3145,33 +5719,463 @@ def save_sbol_designs (filename, dna_designs, regulations=None, plot_params={},
 
     plot_names : list(string) (default=None)
         List of names to use on each plot. If None provided then no titles displayed.
-    """
 
+    fmt : string (default='png')
+        Output format (any supported by matplotlib, e.g. 'pdf', 'png' or 'svg').
+
+    dpi : int (default=300)
+        Resolution of raster outputs.
+
+    out : file-like object (default=None)
+        Binary file to write the output to. If None, the output is returned.
+
+    metadata : dict (default=None)
+        Metadata to save in the output (see matplotlib.figure.Figure.savefig).
+
+    rc : dict (default=None)
+        matplotlib.rcParams to save with, in addition to export_rc (see save_figure).
+
+    renderer : DNARenderer (default=None)
+        Renderer to draw the designs with. If None, a renderer is created using
+        the scale, linewidth and padding in plot_params.
+
+    stats : RenderStats (default=None)
+        Statistics to record the time taken rendering (see renderDNA), laying out
+        the figure and saving it to.
+
+    tight_layout : bool (default=False)
+        Size the figure from the length of the longest design and then fit the 
+        axes using matplotlib's tight_layout (measuring every artist drawn). By
+        default the figure is sized and the axes placed from the bounds of the 
+        designs found by their layouts (see fit_axes). The y-limits are widened
+        to show any design taller than plot_params['axis_y'].
+
+    Returns
+    -------
+    data : bytes
+        The rendered file (None if written to out).
+    """
+    timer = PhaseTimer(stats)
     # Create the figure
-    fig = plt.figure(figsize=(10,10))
+    fig = new_figure(figsize=(10,10))
     fig.patch.set_facecolor('white')
 
     # Create all the axes required
     axes = []
     for i in range(len(dna_designs)):
-        ax = fig.add_subplot(len(dna_designs),1,i+1, axisbg='white')
+        ax = fig.add_subplot(len(dna_designs),1,i+1, facecolor='white')
         axes.append(ax)
 
     # Plot design to the axes
-    max_dna_len, lims, params = plot_sbol_designs (axes, dna_designs, regulations=regulations, plot_params=plot_params, plot_names=plot_names)
+    timer.lap('create_figure')
+    layouts = []
+    max_dna_len, lims, params = plot_sbol_designs(axes, dna_designs, regulations=regulations, 
+                                    plot_params=dict(plot_params), plot_names=plot_names,
+                                    renderer=renderer, stats=stats, layouts=layouts)
+    timer = PhaseTimer(stats)
+
+    if tight_layout == True:
+        # Update the size of the figure to fit the constructs drawn
+        fig_x_dim = max_dna_len/70.0
+        if fig_x_dim < 1.0:
+            fig_x_dim = 1.0
+        fig_y_dim = 1.2*len(axes)
+        fig.set_size_inches( (fig_x_dim, fig_y_dim) )
+        fig.tight_layout()
+        timer.lap('tight_layout')
+    elif len(axes) > 0:
+        # Place the axes at 70 units per inch from the bounds of each design
+        bounds = np.array([layout.bounds(points_per_unit=72.0/70.0) for layout in layouts])
+        ylim = [min(params[0], bounds[:,2].min()), max(params[1], bounds[:,3].max())]
+        for ax in axes:
+            ax.set_ylim(ylim)
+        title_size = None
+        if plot_names != None:
+            title_size = 8
+        fit_axes(fig, axes, lims, ylim, bounds, units_per_inch=70.0, title_size=title_size)
+        timer.lap('fit_axes')
+
+    # Save the figure
+    if out != None:
+        save_figure(fig, out, rc=rc, format=fmt, transparent=True, dpi=dpi, metadata=metadata)
+        timer.lap('savefig')
+        return None
+    out_bytes = io.BytesIO()
+    save_figure(fig, out_bytes, rc=rc, format=fmt, transparent=True, dpi=dpi, metadata=metadata)
+    timer.lap('savefig')
+    return out_bytes.getvalue()
+
+
+def quick_renderer (glyph_cache=None):
+    """ Return a renderer in the style used by render_quick_design.
+    """
+    return DNARenderer(linewidth=1.15, backbone_pad_left=3, backbone_pad_right=3, 
+                       glyph_cache=glyph_cache)
+
+
+def render_quick_design (design, regs=None, fmt=None, dpi=300, out=None, metadata=None, 
+                         rc=None, renderer=None):
+    """ Render a single design (e.g., from load_design_from_quick) on its own, 
+    as drawn by apps/quick.py and the render server, without using pyplot.
+
+    Parameters
+    ----------
+    design : list(dict(part_information))
+        Design to plot.
+
+    regs : list(dict(regulation_information)) (default=None)
+        Regulation of the design.
 
-    # Update the size of the figure to fit the constructs drawn
-    fig_x_dim = max_dna_len/70.0
+    fmt : string (default=None)
+        Output format (e.g. 'pdf', 'png' or 'svg'). If None, the format is given
+        by the extension of out (or matplotlib's savefig.format).
+
+    dpi : int (default=300)
+        Resolution of raster outputs.
+
+    out : string or file-like object (default=None)
+        File to write the output to. If None, the output is returned.
+
+    metadata : dict (default=None)
+        Metadata to save in the output (see matplotlib.figure.Figure.savefig).
+
+    rc : dict (default=None)
+        matplotlib.rcParams to save with, in addition to export_rc (see save_figure).
+
+    renderer : DNARenderer (default=None)
+        Renderer to draw the design with. If None, one is created by quick_renderer.
+
+    Returns
+    -------
+    data : bytes
+        The rendered file (None if written to out).
+    """
+    if renderer == None:
+        renderer = quick_renderer()
+    if fmt == None:
+        fmt = _output_format(out, {})
+    fig = new_figure(figsize=(5.0,5.0))
+    ax = fig.add_subplot(1,1,1)
+    # Plot the design
+    dna_start, dna_end = renderer.renderDNA(ax, design, renderer.SBOL_part_renderers(),
+                                            regs, renderer.std_reg_renderers())
+    max_dna_len = dna_end-dna_start
+    # Format the axis
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_xlim([(-0.01*max_dna_len), max_dna_len+(0.01*max_dna_len)])
+    ax.set_ylim([-35,35])
+    ax.set_aspect('equal')
+    ax.set_axis_off()
+    # Update the size of the figure to fit the construct drawn
+    fig_x_dim = max_dna_len/60.0
     if fig_x_dim < 1.0:
         fig_x_dim = 1.0
-    fig_y_dim = 1.2*len(axes)
-    plt.gcf().set_size_inches( (fig_x_dim, fig_y_dim) )
-
+    fig.set_size_inches((fig_x_dim, 1.2))
+    fig.tight_layout()
     # Save the figure
-    plt.tight_layout()
-    fig.savefig(filename, transparent=True, dpi=300)
-    # Clear the plotting cache
-    plt.close('all')
+    if out != None:
+        save_figure(fig, out, rc=rc, format=fmt, transparent=True, dpi=dpi, metadata=metadata)
+        return None
+    out_bytes = io.BytesIO()
+    save_figure(fig, out_bytes, rc=rc, format=fmt, transparent=True, dpi=dpi, metadata=metadata)
+    return out_bytes.getvalue()
+
+
+def save_sbol_designs (filename, dna_designs, regulations=None, plot_params={}, plot_names=None, cache=None, stats=None, tight_layout=False):
+    """ Plot SBOL designs to axes.
+
+    Parameters
+    ----------
+    filename : string
+        Image filename to save designs to. Extention provided will determine format
+        and must be supported by matplotlib.
+
+    dna_designs : list(dict(design_information))
+        List of designs to plot.
+
+    regulations : list(dict(regulation_information)) (default=None)
+        List of regulations to use for each design.
+
+    plot_params : dict (default={})
+        General plotting parameters to use.
+
+    plot_names : list(string) (default=None)
+        List of names to use on each plot. If None provided then no titles displayed.
+
+    cache : RenderCache (default=None)
+        Cache of previously rendered files. If the same designs have already been 
+        saved in this format (with the same matplotlib rcParams), the cached file 
+        is copied without drawing. Designs holding values that can't be keyed
+        (e.g., functions) are not cached (see design_key). Cached designs are 
+        rendered from a copy, so their positions (start and end) are not updated.
+
+    stats : RenderStats (default=None)
+        Statistics to record the time taken in each phase to (see render_sbol_designs).
+
+    tight_layout : bool (default=False)
+        Fit the axes using matplotlib's tight_layout rather than from the bounds
+        of the designs (see render_sbol_designs).
+    """
+    fmt = os.path.splitext(filename)[1][1:].lower()
+    if fmt == '':
+        fmt = matplotlib.rcParams['savefig.format']
+    key = None
+    if cache != None:
+        key = design_key(dna_designs, regulations, plot_params=plot_params, 
+                         plot_names=plot_names, fmt=fmt, dpi=300, 
+                         helper='save_sbol_designs', tight_layout=tight_layout)
+    if key != None:
+        data = cache.get(key, fmt)
+        if stats != None:
+            stats.add_cache('render', int(data != None), int(data == None))
+        if data != None:
+            with open(filename, 'wb') as out_file:
+                out_file.write(data)
+            return
+        # Render a copy so the positions written by the layout do not change the key
+        dna_designs, regulations = copy.deepcopy((dna_designs, regulations))
+
+    data = render_sbol_designs(dna_designs, regulations=regulations, plot_params=plot_params, 
+                               plot_names=plot_names, fmt=fmt, dpi=300, stats=stats,
+                               tight_layout=tight_layout)
+    if key != None:
+        cache.put(key, fmt, data)
+    with open(filename, 'wb') as out_file:
+        out_file.write(data)
+
+
+###############################################################################
+# Content addressed render cache
+###############################################################################
+
+# Keys written to regulation by renderDNA (not part of a design)
+reg_output_keys = frozenset(['arclength', 'arc_height_index'])
+
+# Groups of matplotlib rcParams that do not change a rendered file
+rc_ignored_groups = frozenset(['backend', 'backend_fallback', 'interactive', 'toolbar', 
+                               'keymap', 'webagg', 'animation', 'tk', 'macosx', 'docstring'])
+
+
+def canonical_value (value, parts=None):
+    """ Convert a value in a design to a canonical JSON compatible form. Lists and
+    tuples are equivalent, as are ints and floats. Parts in the dict parts (keyed 
+    by part_key) are replaced by their position, so regulation refers to parts by where
+    they are in the designs rather than their content. Raises ValueError for values
+    whose content can't be keyed (e.g., functions or other objects).
+    """
+    if parts != None and isinstance(value, (dict, PartView)) and part_key(value) in parts:
+        return {'$part': parts[part_key(value)]}
+    if isinstance(value, DesignTable):
+        return canonical_value(value.to_parts(), parts)
+    if isinstance(value, PartView):
+        value = dict(value)
+    if isinstance(value, dict):
+        return dict((str(k), canonical_value(v, parts)) for k, v in value.items())
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [canonical_value(v, parts) for v in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return repr(float(value))
+    if value is None or isinstance(value, str):
+        return value
+    raise ValueError('Cannot key a value of type {}'.format(type(value).__name__))
+
+
+def render_rc_params ():
+    """ Return the matplotlib rcParams that can change a rendered file (e.g., 
+    font.*, lines.* and the export settings), as the repr of each value.
+    """
+    rc = matplotlib.rcParams
+    return dict((k, repr(rc[k])) for k in rc if k.split('.')[0] not in rc_ignored_groups 
+                                             and k != 'savefig.directory')
+
+
+def design_key (dna_designs, regulations=None, **params):
+    """ Return a hash (SHA-256 hex digest) identifying a rendering of some designs.
+
+    Parameters
+    ----------
+    dna_designs : list(list(dict) or DesignTable)
+        The designs drawn.
+
+    regulations : list(list(dict)) (default=None)
+        Regulation of each design.
+
+    params : 
+        Everything else that changes the output (e.g., plot_params, output 
+        format, dpi and the helper used).
+
+    Returns
+    -------
+    key : string
+        Hex digest that is the same for equivalent designs, parameters and 
+        matplotlib rcParams. None if the designs or parameters hold values that 
+        can't be keyed (e.g., functions), in which case the rendering should not
+        be cached.
+    """
+    try:
+        return _design_key(dna_designs, regulations, params)
+    except ValueError:
+        return None
+
+
+def _design_key (dna_designs, regulations, params):
+    parts = {}
+    for i, design in enumerate(dna_designs):
+        for j, part in enumerate(design):
+            parts[part_key(part)] = [i, j]
+    regs = None
+    if regulations != None:
+        regs = []
+        for i in range(len(dna_designs)):
+            design_regs = regulations[i]
+            if design_regs == None:
+                regs.append(None)
+                continue
+            regs.append([canonical_value(dict((k, v) for k, v in reg.items() 
+                                              if k not in reg_output_keys), parts) 
+                         for reg in design_regs])
+    content = {'version': RenderCache.VERSION, 'dnaplotlib': __version__,
+               'matplotlib': RenderCache.matplotlib_version(),
+               'designs': canonical_value(list(dna_designs)), 'regs': regs,
+               'params': canonical_value(params), 'rc': render_rc_params()}
+    encoded = json.dumps(content, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """ On-disk cache of rendered files (bytes), keyed by design_key(). Files are 
+    held in a directory (shared between processes) and the least recently used 
+    are removed when the total size exceeds max_bytes. Recency is tracked by the
+    modification time of each file.
+    """
+
+    # Increment if the rendered output of the same design may change
+    VERSION = 2
+
+    # Rescan the directory (for files added by other processes) every n puts
+    rescan_interval = 64
+
+    def __init__ (self, directory, max_bytes=256*1024*1024):
+        """ Constructor to open (or create) a cache.
+
+        Parameters
+        ----------
+        directory : string
+            Directory holding the cached files (created if needed).
+
+        max_bytes : int (default=256MB)
+            Maximum total size of the cached files.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.puts = 0
+        self.total_bytes = sum(size for size, mtime, path in self.entries())
+
+    @staticmethod
+    def matplotlib_version ():
+        """ Version of matplotlib installed (found without importing it).
+        """
+        try:
+            from importlib.metadata import version
+            return version('matplotlib')
+        except Exception:
+            return None
+
+    def path (self, key, fmt):
+        return os.path.join(self.directory, '{}.{}'.format(key, fmt))
+
+    def entries (self):
+        """ Return the (size, mtime, path) of every cached file.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith('.'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_size, stat.st_mtime_ns, entry.path))
+        return entries
+
+    def __len__ (self):
+        return len(self.entries())
+
+    def get (self, key, fmt):
+        """ Return the cached bytes for a key and format (None if not cached).
+        """
+        path = self.path(key, fmt)
+        try:
+            with open(path, 'rb') as cache_file:
+                data = cache_file.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put (self, key, fmt, data):
+        """ Add rendered bytes to the cache, evicting old files if needed.
+        """
+        path = self.path(key, fmt)
+        temp_path = os.path.join(self.directory, '.{}.{}.tmp'.format(key, os.getpid()))
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(data)
+        os.replace(temp_path, path)
+        self.total_bytes += len(data)
+        self.puts += 1
+        if self.total_bytes > self.max_bytes or self.puts % self.rescan_interval == 0:
+            self.evict()
+
+    def evict (self):
+        """ Remove the least recently used files until the cache fits in max_bytes.
+        """
+        entries = sorted(self.entries(), key=itemgetter(1))
+        total_bytes = sum(size for size, mtime, path in entries)
+        for size, mtime, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+            self.evictions += 1
+        self.total_bytes = total_bytes
+
+    def clear (self):
+        """ Remove all cached files and reset the statistics.
+        """
+        for size, mtime, path in self.entries():
+            os.remove(path)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info (self):
+        """ Return the hit, miss and eviction counts, hit rate and current size.
+
+        Returns
+        -------
+        info : dict
+            Keys 'hits', 'misses', 'hit_rate', 'evictions', 'bytes' and 'max_bytes'.
+        """
+        lookups = self.hits + self.misses
+        hit_rate = 0.0
+        if lookups > 0:
+            hit_rate = self.hits/float(lookups)
+        return {'hits':self.hits, 'misses':self.misses, 'hit_rate':hit_rate,
+                'evictions':self.evictions, 'bytes':self.total_bytes, 
+                'max_bytes':self.max_bytes}
 
 
 ###############################################################################
@@ -3202,58 +6206,536 @@ dpl_default_type_map = {'gene': 'CDS',
                         'rbs': 'RBS'}
 
 
-def load_design_from_gff (filename, chrom, type_map=dpl_default_type_map, region=None):
-    # Load the GFF data
-    gff = []
-    data_reader = csv.reader(open(filename, 'r'), delimiter='\t')
-    for row in data_reader:
-        if len(row) == 9:
-            cur_chrom = row[0]
-            part_type = row[2]
-            start_bp = int(row[3])
-            end_bp = int(row[4])
-            part_dir = row[6]
-            part_attribs = {}
-            split_attribs = row[8].split(';')
-            part_name = None
-            for attrib in split_attribs:
-                key_value = attrib.split('=')
-                if len(key_value) == 2:
-                    if key_value[0] == 'Name':
-                        part_name = key_value[1]
-                    else:
-                        part_attribs[key_value[0]] = convert_attrib(key_value[1])
-            if part_name != None and cur_chrom == chrom and part_type in list(type_map.keys()):
-                # Check feature start falls in region
-                if region != None and (start_bp > region[0] and start_bp < region[1]):
-                    gff.append([part_name, type_map[part_type], part_dir, start_bp, end_bp, part_attribs])
-    # Convert to DNAplotlib design (sort on start position first)
-    design = []
-    for gff_el in sorted(gff, key=itemgetter(3)):
-        new_part = {}
-        new_part['name'] = gff_el[0]
-        new_part['type'] = gff_el[1]
-        if gff_el[2] == '+':
-            new_part['fwd'] = True
-        else:
-            new_part['fwd'] = False
-        new_part['start'] = gff_el[3]
-        new_part['end'] = gff_el[4]
-        new_part['opts'] = gff_el[5]
-        design.append(new_part)
-    # Return the sorted design
+def gff_part (row, chrom, type_map):
+    """ Convert a GFF row (list of 9 fields) to a DNAplotlib part. Returns None 
+    if the row is on a different chromosome, has an unmapped type or no name.
+    """
+    cur_chrom = row[0]
+    part_type = row[2]
+    start_bp = int(row[3])
+    end_bp = int(row[4])
+    part_dir = row[6]
+    part_attribs = {}
+    split_attribs = row[8].split(';')
+    part_name = None
+    for attrib in split_attribs:
+        key_value = attrib.split('=')
+        if len(key_value) == 2:
+            if key_value[0] == 'Name':
+                part_name = key_value[1]
+            else:
+                part_attribs[key_value[0]] = convert_attrib(key_value[1])
+    if part_name == None or cur_chrom != chrom or part_type not in list(type_map.keys()):
+        return None
+    new_part = {}
+    new_part['name'] = part_name
+    new_part['type'] = type_map[part_type]
+    if part_dir == '+':
+        new_part['fwd'] = True
+    else:
+        new_part['fwd'] = False
+    new_part['start'] = start_bp
+    new_part['end'] = end_bp
+    new_part['opts'] = part_attribs
+    return new_part
+
+
+def gff_parts_in_region (filename, chrom, type_map, region):
+    """ Generate the parts of a GFF file starting inside a region (in file order),
+    or all parts on the chromosome if region is None.
+    """
+    with open(filename, 'r') as gff_file:
+        data_reader = csv.reader(gff_file, delimiter='\t')
+        for row in data_reader:
+            if len(row) == 9:
+                new_part = gff_part(row, chrom, type_map)
+                if new_part != None:
+                    # Check feature start falls in region
+                    start_bp = new_part['start']
+                    if region == None or (start_bp > region[0] and start_bp < region[1]):
+                        yield new_part
+
+
+def load_design_from_gff (filename, chrom, type_map=dpl_default_type_map, region=None, as_table=False):
+    # Load the GFF data (as a DesignTable if as_table=True, without holding part dicts)
+    # of the parts starting inside region (all parts on chrom if region is None)
+    parts = gff_parts_in_region(filename, chrom, type_map, region)
+    if as_table == True:
+        table = DesignTable.from_parts(parts)
+        return table.take(np.argsort(table.start, kind='stable'))
+    design = list(parts)
+    # Return the design (sorted on start position)
+    design.sort(key=itemgetter('start'))
     return design
 
 
+class GFFIndex:
+    """ Index of the features in a GFF file, holding the byte offset of every
+    feature sorted by chromosome and start position. Parts in a region can 
+    then be read by seeking straight to them, without scanning the file. 
+    
+    Indexes are saved beside the GFF file (filename + '.dplidx.npz') and 
+    reused until the GFF file changes. Use GFFIndex.open() to load (or build)
+    the index of a file.
+    """
+
+    # Increment if the saved format changes
+    VERSION = 1
+
+    # Indexes opened in this process, keyed by filename
+    opened = {}
+
+    def __init__ (self, filename, chroms, starts, offsets, source):
+        """ Constructor for an index (use GFFIndex.open or GFFIndex.build).
+
+        Parameters
+        ----------
+        filename : string
+            The GFF file indexed.
+
+        chroms : list(string)
+            Chromosomes in the file.
+
+        starts, offsets : list(numpy.ndarray(int))
+            Start position and byte offset of the features of each chromosome
+            (sorted by start, ties kept in file order).
+
+        source : (int, int)
+            Size and modification time (ns) of the file when indexed.
+        """
+        self.filename = filename
+        self.starts = dict(zip(chroms, starts))
+        self.offsets = dict(zip(chroms, offsets))
+        self.source = tuple(source)
+
+    @staticmethod
+    def index_filename (filename):
+        return filename + '.dplidx.npz'
+
+    @staticmethod
+    def file_source (filename):
+        stat = os.stat(filename)
+        return (int(stat.st_size), int(stat.st_mtime_ns))
+
+    @classmethod
+    def build (cls, filename):
+        """ Index a GFF file with a single pass through it.
+        """
+        source = cls.file_source(filename)
+        positions = {}
+        offset = 0
+        with open(filename, 'rb') as gff_file:
+            for line in gff_file:
+                if line.count(b'\t') == 8 and line[:1] != b'#':
+                    fields = line.split(b'\t', 4)
+                    chrom = fields[0].decode('utf-8')
+                    if chrom not in positions:
+                        positions[chrom] = ([], [])
+                    positions[chrom][0].append(int(fields[3]))
+                    positions[chrom][1].append(offset)
+                offset += len(line)
+        chroms = list(positions.keys())
+        starts = []
+        offsets = []
+        for chrom in chroms:
+            chrom_starts = np.array(positions[chrom][0], dtype=np.int64)
+            order = np.argsort(chrom_starts, kind='stable')
+            starts.append(chrom_starts[order])
+            offsets.append(np.array(positions[chrom][1], dtype=np.int64)[order])
+        return cls(filename, chroms, starts, offsets, source)
+
+    def save (self, index_filename=None):
+        """ Save the index (by default beside the GFF file).
+        """
+        if index_filename == None:
+            index_filename = self.index_filename(self.filename)
+        chroms = list(self.starts.keys())
+        arrays = {'version': np.array([self.VERSION]), 
+                  'source': np.array(self.source, dtype=np.int64),
+                  'chroms': np.array(chroms, dtype=str)}
+        for i, chrom in enumerate(chroms):
+            arrays['starts_{}'.format(i)] = self.starts[chrom]
+            arrays['offsets_{}'.format(i)] = self.offsets[chrom]
+        np.savez(index_filename, **arrays)
+
+    @classmethod
+    def load (cls, filename, index_filename=None):
+        """ Load a saved index. Returns None if there is no index or it is out of 
+        date (the GFF file has changed since it was built).
+        """
+        if index_filename == None:
+            index_filename = cls.index_filename(filename)
+        if not os.path.exists(index_filename):
+            return None
+        with np.load(index_filename) as data:
+            source = tuple(data['source'].tolist())
+            if int(data['version'][0]) != cls.VERSION or source != cls.file_source(filename):
+                return None
+            chroms = data['chroms'].tolist()
+            starts = [data['starts_{}'.format(i)] for i in range(len(chroms))]
+            offsets = [data['offsets_{}'.format(i)] for i in range(len(chroms))]
+        return cls(filename, chroms, starts, offsets, source)
+
+    @classmethod
+    def open (cls, filename, save=True):
+        """ Return the index of a GFF file. Indexes already opened by this process
+        are reused, then saved indexes, else the file is indexed (and the index 
+        saved if save=True and the directory is writable).
+        """
+        index = cls.opened.get(filename)
+        if index != None and index.source == cls.file_source(filename):
+            return index
+        index = cls.load(filename)
+        if index == None:
+            index = cls.build(filename)
+            if save == True:
+                try:
+                    index.save()
+                except OSError:
+                    pass
+        cls.opened[filename] = index
+        return index
+
+    def query (self, chrom, region=None):
+        """ Return the byte offsets (sorted by start position) of the features on
+        a chromosome, optionally only those starting inside a region (exclusive, 
+        as for load_design_from_gff).
+        """
+        if chrom not in self.starts:
+            return np.zeros(0, dtype=np.int64)
+        offsets = self.offsets[chrom]
+        if region == None:
+            return offsets
+        starts = self.starts[chrom]
+        lo = np.searchsorted(starts, region[0], side='right')
+        hi = np.searchsorted(starts, region[1], side='left')
+        return offsets[lo:hi]
+
+
+def iter_design_from_gff (filename, chrom, type_map=dpl_default_type_map, region=None, index=None):
+    """ Generate the parts of a GFF file on a chromosome (sorted by start position)
+    by reading only the features in a region. 
+
+    Parameters
+    ----------
+    filename : string
+        GFF file to read.
+
+    chrom : string
+        Chromosome the parts are on.
+
+    type_map : dict (default=dpl_default_type_map)
+        Map from GFF feature types to part types. Other features are skipped.
+
+    region : [int, int] (default=None)
+        Only parts starting inside this region (exclusive) are generated, as for 
+        load_design_from_gff. If None, all parts on the chromosome are generated.
+
+    index : GFFIndex (default=None)
+        Index of the file. If None, GFFIndex.open() is used (building and saving
+        the index the first time a file is read).
+
+    Returns
+    -------
+    parts : generator(dict)
+        The parts of the design, read as they are requested.
+    """
+    if index == None:
+        index = GFFIndex.open(filename)
+    offsets = index.query(chrom, region)
+    with open(filename, 'rb') as gff_file:
+        for offset in offsets.tolist():
+            gff_file.seek(offset)
+            line = gff_file.readline().decode('utf-8').rstrip('\r\n')
+            row = next(csv.reader([line], delimiter='\t'))
+            if len(row) == 9:
+                new_part = gff_part(row, chrom, type_map)
+                if new_part != None:
+                    yield new_part
+
+
+# Part types and colors used in quick design strings
+quick_part_types = {'p': 'Promoter',
+                    'i': 'Ribozyme',
+                    'r': 'RBS',
+                    'c': 'CDS',
+                    't': 'Terminator',
+                    's': 'Spacer',
+                    '=': 'Scar'}
+
+quick_colors = {'white':       (1.00,1.00,1.00),
+                'black':       (0.00,0.00,0.00),
+                'gray':        (0.60,0.60,0.60),
+                'red':         (0.89,0.10,0.11),
+                'orange':      (1.00,0.50,0.00),
+                'yellow':      (1.00,1.00,0.00),
+                'green':       (0.20,0.63,0.17),
+                'blue':        (0.12,0.47,0.71),
+                'purple':      (0.42,0.24,0.60),
+                'lightred':    (0.98,0.60,0.60),
+                'lightorange': (0.99,0.75,0.44),
+                'lightyellow': (1.00,1.00,0.60),
+                'lightgreen':  (0.70,0.87,0.54),
+                'lightblue':   (0.65,0.81,0.89),
+                'lightpurple': (0.79,0.70,0.84)}
+
+
+def load_design_from_quick (spec):
+    """ Generate a design from a quick design string (as used by apps/quick.py), 
+    e.g. "p.gray r.green c.orange.lightblue -t.black". Each part is given as 
+    type.color or type.label.color, with a '-' before the type for reverse parts.
+    """
+    part_list = []
+    part_idx = 1
+    for el in spec.split(' '):
+        if el != '':
+            part_parts = el.split('.')
+            if len(part_parts) != 2 and len(part_parts) != 3:
+                continue
+            part_short_type = part_parts[0]
+            part_fwd = True
+            if part_short_type[:1] == '-':
+                part_fwd = False
+                part_short_type = part_short_type[1:]
+            if part_short_type not in list(quick_part_types.keys()):
+                continue
+            part_rgb = quick_colors.get(part_parts[-1], (0,0,0))
+            part_opts = {'color': part_rgb}
+            # Type, label and colour provided
+            if len(part_parts) == 3:
+                part_opts['label'] = part_parts[1]
+                part_opts['label_size'] = 8
+                part_opts['label_y_offset'] = -17
+            part_list.append( {'name'  : str(part_idx), 
+                               'type'  : quick_part_types[part_short_type], 
+                               'fwd'   : part_fwd, 
+                               'opts'  : part_opts} )
+    return part_list
+
+
 def load_profile_from_bed (filename, chrom, region):
     region_len = region[1]-region[0]
     profile = [0]*region_len
-    data_reader = csv.reader(open(filename, 'r'), delimiter='\t')
-    for row in data_reader:
-        if len(row) == 5:
-            cur_chrom = row[0]
-            cur_start_bp = int(row[1])
-            cur_end_bp = int(row[2])
-            if cur_start_bp == region[0] and cur_end_bp == region[1]:
-                profile[int(row[3])-1] = float(row[4])
+    with open(filename, 'r') as bed_file:
+        data_reader = csv.reader(bed_file, delimiter='\t')
+        for row in data_reader:
+            if len(row) == 5:
+                cur_chrom = row[0]
+                cur_start_bp = int(row[1])
+                cur_end_bp = int(row[2])
+                if cur_start_bp == region[0] and cur_end_bp == region[1]:
+                    profile[int(row[3])-1] = float(row[4])
+    return profile
+
+
+def profile_cache_filename (filename, region):
+    """ Return the cache file for a profile region of a BED file. The name holds
+    the size and modification time of the BED file, so that caches of an older
+    version of the file are never used.
+    """
+    stat = os.stat(filename)
+    return '{}.{}-{}.{}-{}.npy'.format(filename, int(region[0]), int(region[1]),
+                                       int(stat.st_size), int(stat.st_mtime_ns))
+
+
+def load_profile_array_from_bed (filename, chrom, region, cache=True):
+    """ Load a profile from a BED file (as for load_profile_from_bed) into a 
+    float32 array using vectorized parsing. Values are read from the rows with 5
+    columns (chrom, region start, region end, position (1-based) and value); 
+    other rows (e.g., track and browser lines) are skipped.
+
+    Parameters
+    ----------
+    filename : string
+        BED file to read.
+
+    chrom : string
+        Chromosome of the profile (unused, as for load_profile_from_bed).
+
+    region : [int, int]
+        Region the profile covers (rows for other regions are ignored).
+
+    cache : bool (default=True)
+        Save the profile beside the BED file as a .npy file (see 
+        profile_cache_filename) and memory-map it when the same profile is 
+        next loaded, rather than parsing the BED file again. 
+
+    Returns
+    -------
+    profile : numpy.ndarray(float32)
+        Value at each position of the region (0 if not given). Read-only if 
+        loaded from the cache.
+    """
+    cache_filename = None
+    if cache == True:
+        cache_filename = profile_cache_filename(filename, region)
+        if os.path.exists(cache_filename):
+            return np.load(cache_filename, mmap_mode='r')
+    region_len = int(region[1]-region[0])
+    profile = np.zeros(region_len, dtype=np.float32)
+    with open(filename, 'r') as bed_file:
+        # Only rows with 5 columns hold values (e.g., skipping track lines)
+        rows = (line for line in bed_file if line.count('\t') == 4)
+        first_row = next(rows, None)
+        data = np.zeros((0, 4))
+        if first_row != None:
+            data = np.loadtxt(itertools.chain([first_row], rows), delimiter='\t', 
+                              usecols=(1, 2, 3, 4), ndmin=2)
+    in_region = (data[:,0] == region[0]) & (data[:,1] == region[1])
+    positions = data[in_region, 2].astype(np.int64)
+    profile[positions-1] = data[in_region, 3]
+    if cache_filename != None:
+        # Caches of older versions of the file are replaced. The cache is written
+        # to a temporary file and then renamed, so other processes never read a
+        # partly written cache.
+        stale = glob.glob('{}.{}-{}.*.npy'.format(glob.escape(filename), int(region[0]), int(region[1])))
+        temp_filename = '{}.{}.tmp'.format(cache_filename, os.getpid())
+        try:
+            for old_filename in stale:
+                if old_filename != cache_filename and os.path.exists(old_filename):
+                    os.remove(old_filename)
+            with open(temp_filename, 'wb') as cache_file:
+                np.save(cache_file, profile)
+            os.replace(temp_filename, cache_filename)
+        except OSError:
+            return profile
+        return np.load(cache_filename, mmap_mode='r')
     return profile
+
+
+###############################################################################
+# Multi-resolution coverage profiles
+###############################################################################
+
+class CoveragePyramid:
+    """ Zoom pyramid of a coverage profile (e.g., from load_profile_array_from_bed) 
+    holding the min, max and mean of the profile in bins of 2, 4, 8, ... 
+    positions. query() returns the coarsest level that still has at least one 
+    bin per pixel, so a profile can be drawn at any zoom with a number of points 
+    that only depends on the width of the plot.
+
+    All levels are held in a single float32 array: the profile itself (level 0),
+    followed by the min, max and mean of each level in turn. Pyramids can be 
+    saved to disk and memory-mapped when loaded.
+    """
+
+    # Increment if the saved format changes
+    VERSION = 1
+
+    def __init__ (self, data, length, x_start=0):
+        """ Constructor for a pyramid (use CoveragePyramid.build or load).
+
+        Parameters
+        ----------
+        data : numpy.ndarray(float32)
+            The profile followed by the min, max and mean of each level.
+
+        length : int
+            Length of the profile.
+
+        x_start : int (default=0)
+            x-position of the first value in the profile.
+        """
+        self.data = data
+        self.length = int(length)
+        self.x_start = int(x_start)
+        # Offset and number of bins of each level
+        self.levels = [(0, self.length)]
+        offset = self.length
+        bins = self.length
+        while bins > 1:
+            bins = (bins+1)//2
+            self.levels.append((offset, bins))
+            offset += 3*bins
+
+    @classmethod
+    def build (cls, profile, x_start=0):
+        """ Build a pyramid for a profile (the 1D array of values at each position).
+        """
+        profile = np.asarray(profile, dtype=np.float32)
+        blocks = [profile]
+        mins = maxs = profile
+        sums = profile.astype(np.float64)
+        counts = np.ones(len(profile), dtype=np.int64)
+        while len(mins) > 1:
+            if len(mins) % 2 == 1:
+                # Pad the final bin, which then only holds a single value
+                mins = np.append(mins, mins[-1])
+                maxs = np.append(maxs, maxs[-1])
+                sums = np.append(sums, 0.0)
+                counts = np.append(counts, 0)
+            mins = mins.reshape(-1, 2).min(axis=1)
+            maxs = maxs.reshape(-1, 2).max(axis=1)
+            sums = sums.reshape(-1, 2).sum(axis=1)
+            counts = counts.reshape(-1, 2).sum(axis=1)
+            blocks += [mins, maxs, (sums/counts).astype(np.float32)]
+        return cls(np.concatenate(blocks), len(profile), x_start)
+
+    @staticmethod
+    def meta_filename (filename):
+        return filename[:-len('.npy')] + '.meta.npy'
+
+    def save (self, filename):
+        """ Save the pyramid to a .npy file (and its size and position to 
+        filename.meta.npy).
+        """
+        if not filename.endswith('.npy'):
+            raise ValueError('Pyramid filename must end with .npy')
+        np.save(filename, self.data)
+        np.save(self.meta_filename(filename), 
+                np.array([self.VERSION, self.length, self.x_start], dtype=np.int64))
+
+    @classmethod
+    def load (cls, filename, mmap=True):
+        """ Load a saved pyramid (memory-mapped by default).
+        """
+        version, length, x_start = np.load(cls.meta_filename(filename)).tolist()
+        if version != cls.VERSION:
+            raise ValueError('Unsupported pyramid version {}'.format(version))
+        mmap_mode = None
+        if mmap == True:
+            mmap_mode = 'r'
+        return cls(np.load(filename, mmap_mode=mmap_mode), length, x_start)
+
+    def level (self, x_min, x_max, pixels):
+        """ Return the level (bin width 2**level) to draw a region at a given width.
+        """
+        bp_per_pixel = float(x_max-x_min)/max(pixels, 1)
+        if bp_per_pixel < 2:
+            return 0
+        return min(int(math.floor(math.log2(bp_per_pixel))), len(self.levels)-1)
+
+    def query (self, x_min, x_max, pixels):
+        """ Return the coverage of a region at the resolution needed for a given 
+        width.
+
+        Parameters
+        ----------
+        x_min, x_max : float
+            The region to return.
+
+        pixels : int
+            The width the region will be drawn at (e.g., ax.bbox.width).
+
+        Returns
+        -------
+        x : numpy.ndarray(float)
+            Start position of each bin.
+
+        mins, maxs, means : numpy.ndarray(float32)
+            The min, max and mean of the profile in each bin (all equal to the 
+            profile at level 0).
+        """
+        level = self.level(x_min, x_max, pixels)
+        bin_width = 2**level
+        offset, bins = self.levels[level]
+        lo = min(max(int(math.floor((x_min-self.x_start)/bin_width)), 0), bins)
+        hi = min(max(int(math.ceil((x_max-self.x_start)/bin_width))+1, 0), bins)
+        x = self.x_start + np.arange(lo, hi)*float(bin_width)
+        if level == 0:
+            values = self.data[lo:hi]
+            return x, values, values, values
+        mins = self.data[offset+lo:offset+hi]
+        maxs = self.data[offset+bins+lo:offset+bins+hi]
+        means = self.data[offset+2*bins+lo:offset+2*bins+hi]
+        return x, mins, maxs, means
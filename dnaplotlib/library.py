@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+"""
+DNAplotlib library files
+========================
+    Load libraries of designs described by CSV files (as used by
+    apps/library_plot.py):
+
+    >  from dnaplotlib import library
+    >  plot_params = library.load_plot_parameters('plot_parameters.csv')
+    >  part_info = library.load_part_information('part_information.csv')
+    >  dna_designs = library.load_dna_designs('dna_designs.csv', part_info)
+    >  regs_info = library.load_regulatory_information('regulation_information.csv',
+    >                                                  part_info, dna_designs)
+
+    - Plot parameters: a header, then rows of parameter,value.
+    - Part information: columns part_name and type, plus any options (colors
+      are given as r;g;b).
+    - Designs: a header, then rows of design name followed by the part names
+      (reverse parts start with reverse_char).
+    - Regulation: columns from_partname, type and to_partname, plus any options.
+
+    Libraries too large to hold in memory can be read a design at a time with
+    iter_dna_designs(), linking regulation to each using design_regulation().
+"""
+
+import csv
+import itertools
+
+__author__  = 'Thomas E. Gorochowski <tom@chofski.co.uk>, Voigt Lab, MIT\n\
+               Bryan Der <bder@mit.edu>, Voigt Lab, MIT'
+__license__ = 'MIT'
+__version__ = '1.0'
+
+
+def make_float_if_needed (s):
+    """ Convert a value to a float if it is a number.
+    """
+    try:
+        return float(s)
+    except ValueError:
+        return s
+
+
+def read_csv_rows (filename):
+    """ Return the header and rows of a CSV file.
+    """
+    with open(filename, 'r') as csv_file:
+        reader = csv.reader(csv_file, delimiter=',')
+        header = next(reader)
+        rows = list(reader)
+    return header, rows
+
+
+def parse_attributes (row, header_map, attrib_keys, color_keys):
+    """ Return the options given by a row (empty values are skipped).
+    """
+    attribs_map = {}
+    for k in attrib_keys:
+        if row[header_map[k]] != '':
+            if k in color_keys:
+                attribs_map[k] = [float(x) for x in row[header_map[k]].split(';')]
+            else:
+                attribs_map[k] = make_float_if_needed(row[header_map[k]])
+    return attribs_map
+
+
+def load_plot_parameters (filename):
+    """ Load plotting parameters (name to value) from a CSV file.
+    """
+    plot_params = {}
+    # Ignore header
+    header, rows = read_csv_rows(filename)
+    # Process all parameters
+    for row in rows:
+        if len(row) >= 2:
+            if row[1] != '':
+                plot_params[row[0]] = make_float_if_needed(row[1])
+    return plot_params
+
+
+def load_part_information (filename):
+    """ Load the type and options of each part from a CSV file. Returns a dict
+    of part name to [part_name, type, opts].
+    """
+    part_info = {}
+    header, rows = read_csv_rows(filename)
+    header_map = {}
+    for i in range(len(header)):
+        header_map[header[i]] = i
+    attrib_keys = [k for k in list(header_map.keys()) if k not in ['part_name', 'type']]
+    for row in rows:
+        # Make the attributes map
+        part_attribs_map = parse_attributes(row, header_map, attrib_keys, ('color', 'label_color'))
+        part_name = row[header_map['part_name']]
+        part_type = row[header_map['type']]
+        part_info[part_name] = [part_name, part_type, part_attribs_map]
+    return part_info
+
+
+def design_from_row (row, part_info, reverse_char='r'):
+    """ Return the design (list of parts built from part_info) given by a row of
+    a designs file (design name followed by the part names).
+    """
+    part_list = []
+    for i in range(1,len(row)):
+        # Handle reverse parts
+        fwd = True
+        part_name = row[i]
+        if len(part_name) != 0:
+            if part_name[0] == reverse_char:
+                part_name = part_name[1:]
+                fwd = False
+            # Store the design
+            part_design = {}
+            cur_part_info = part_info[part_name]
+            part_design['type'] = cur_part_info[1]
+            part_design['name'] = part_name #needed to add part name for regulation
+            part_design['fwd']  = fwd       #needed to add fwd for regulation
+            if fwd == True:
+                part_design['start'] = i
+                part_design['end'] = i+1
+            else:
+                part_design['end'] = i
+                part_design['start'] = i+1
+            part_design['opts'] = cur_part_info[2]
+            part_list.append(part_design)
+    return part_list
+
+
+def iter_dna_designs (filename, part_info, reverse_char='r'):
+    """ Generate the (name, design) of each row of a designs file in file order, 
+    reading the file as designs are requested (so only the current design is 
+    held in memory).
+    """
+    with open(filename, 'r') as csv_file:
+        design_reader = csv.reader(csv_file, delimiter=',')
+        # Ignore header
+        header = next(design_reader)
+        for row in design_reader:
+            if row and row[0] != '':
+                yield row[0], design_from_row(row, part_info, reverse_char=reverse_char)
+
+
+def load_dna_designs (filename, part_info, reverse_char='r'):
+    """ Load designs (lists of parts built from part_info) from a CSV file. Returns
+    a dict of design name to design.
+    """
+    dna_designs = {}
+    for name, design in iter_dna_designs(filename, part_info, reverse_char=reverse_char):
+        dna_designs[name] = design
+    return dna_designs
+
+
+def chunks (items, size):
+    """ Generate lists of up to size items from an iterable (e.g., the designs
+    to draw on each page), reading only one list at a time.
+    """
+    items = iter(items)
+    chunk = list(itertools.islice(items, size))
+    while len(chunk) > 0:
+        yield chunk
+        chunk = list(itertools.islice(items, size))
+
+
+def index_parts_by_name (design):
+    """ Return a dict of part name to the parts of a design with that name (in
+    design order).
+    """
+    index = {}
+    for part in design:
+        name = part.get('name')
+        if name != None:
+            index.setdefault(name, []).append(part)
+    return index
+
+
+def load_regulation_rows (filename):
+    """ Load the regulation in a CSV file as a list of (type, from_partname, 
+    to_partname, opts) that can be linked to designs by design_regulation().
+    """
+    header, rows = read_csv_rows(filename)
+    header_map = {}
+    for i in range(len(header)):
+        header_map[header[i]] = i
+    attrib_keys = [k for k in list(header_map.keys()) if k not in ['from_partname', 'type', 'to_partname']]
+    reg_rows = []
+    for row in rows:
+        reg_rows.append((row[header_map['type']], row[header_map['from_partname']],
+                         row[header_map['to_partname']],
+                         parse_attributes(row, header_map, attrib_keys, ('color',))))
+    return reg_rows
+
+
+def design_regulation (reg_rows, design):
+    """ Return the regulation of a design: each row of reg_rows (see 
+    load_regulation_rows) whose from and to parts are both in the design (once
+    for each pair of parts with these names).
+    """
+    regs = []
+    parts_by_name = index_parts_by_name(design)
+    for reg_type, from_partname, to_partname, reg_attribs_map in reg_rows:
+        from_parts = parts_by_name.get(from_partname)
+        to_parts = parts_by_name.get(to_partname)
+        if from_parts == None or to_parts == None:
+            continue
+        # Each design has its own copy of the options
+        reg_opts = dict(reg_attribs_map)
+        for start_part in from_parts:
+            for end_part in to_parts:
+                # Found from-to, save regulation arc
+                reg_info = {}
+                reg_info['from_part'] = start_part
+                reg_info['type'] = reg_type
+                reg_info['to_part'] = end_part
+                reg_info['opts'] = reg_opts
+                regs.append(reg_info)
+    return regs
+
+
+def load_regulatory_information (filename, part_info, dna_designs):
+    """ Load regulation from a CSV file and link it to the parts of each design.
+    Every regulation row is added to each design containing parts with its from
+    and to part names (once for each pair of parts with these names). Rows are
+    parsed once and parts found using an index of each design by name, so the
+    time taken grows linearly with the size of the library.
+
+    Returns
+    -------
+    regs_info : dict(int : list(dict))
+        Regulation of each design, keyed by the position of the design when
+        sorted by name.
+    """
+    regs_info = {}
+    reg_rows = load_regulation_rows(filename)
+    design_list = sorted(dna_designs.keys())
+    for i in range(len(design_list)):
+        regs_info[i] = design_regulation(reg_rows, dna_designs[design_list[i]])
+    return regs_info
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+"""
+DNAplotlib render server
+========================
+    Long running HTTP service that renders designs to PDF, PNG or SVG. Designs
+    are drawn by a pool of worker processes that import matplotlib and create
+    their renderer once, so requests do not pay for starting Python and
+    importing matplotlib (as running apps/quick.py for each request does).
+
+    Start the server (standard library WSGI server):
+
+    >  python -m dnaplotlib.server -port 8000 -processes 4 -cache render_cache
+
+    Or serve RenderApp with any WSGI server. Designs are rendered by posting to
+    /render either form fields or a JSON object containing:
+
+    - spec: A quick design string (see load_design_from_quick), or
+    - design: A list of parts (dicts as for renderDNA).
+    - regs: Regulation (optional), with from_part and to_part given as the
+            index or name of a part in the design.
+    - format: pdf (default), png or svg.
+    - dpi: Resolution of png output (default 300).
+
+    The rendered file is returned as the response body. GET /health returns
+    the number of requests served and the render cache statistics.
+"""
+
+import sys
+import json
+import threading
+import traceback
+import multiprocessing
+import concurrent.futures
+from urllib.parse import parse_qs
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import make_server, WSGIServer
+import dnaplotlib as dpl
+from dnaplotlib.batch import deterministic_metadata, deterministic_rc
+
+__author__  = 'Thomas E. Gorochowski <tom@chofski.co.uk>'
+__license__ = 'MIT'
+__version__ = '1.0'
+
+
+content_types = {'pdf': 'application/pdf',
+                 'png': 'image/png',
+                 'svg': 'image/svg+xml'}
+
+# Limit on the size of a request body
+max_request_bytes = 4*1024*1024
+
+
+class BadRequest(ValueError):
+    """ Raised for requests that cannot be rendered (returned as a 400 error).
+    """
+    pass
+
+
+def parse_request (fields):
+    """ Convert the fields of a request to a design, its regulation and the
+    output format and dpi.
+    """
+    fmt = str(fields.get('format', 'pdf')).lower()
+    if fmt not in content_types:
+        raise BadRequest('Unsupported format: {}'.format(fmt))
+    try:
+        dpi = int(fields.get('dpi', 300))
+    except (TypeError, ValueError):
+        raise BadRequest('dpi must be an integer')
+    if dpi < 1 or dpi > 1200:
+        raise BadRequest('dpi must be between 1 and 1200')
+    spec = fields.get('spec', fields.get('in_text'))
+    design = fields.get('design')
+    if spec != None:
+        design = dpl.load_design_from_quick(str(spec))
+    elif isinstance(design, str):
+        try:
+            design = json.loads(design)
+        except ValueError:
+            raise BadRequest('design is not valid JSON')
+    if not isinstance(design, list) or len(design) == 0:
+        raise BadRequest('A spec string or design (list of parts) is required')
+    for part in design:
+        if not isinstance(part, dict) or 'type' not in part:
+            raise BadRequest('Each part must be an object with a type')
+    regs = fields.get('regs')
+    if isinstance(regs, str):
+        try:
+            regs = json.loads(regs)
+        except ValueError:
+            raise BadRequest('regs is not valid JSON')
+    if regs != None:
+        regs = [link_regulation(reg, design) for reg in regs]
+    return design, regs, fmt, dpi
+
+
+def link_regulation (reg, design):
+    """ Replace the part indexes (or names) in a regulation with the parts.
+    """
+    if not isinstance(reg, dict):
+        raise BadRequest('Each regulation must be an object')
+    reg = dict(reg)
+    for key in ('from_part', 'to_part'):
+        ref = reg.get(key)
+        if isinstance(ref, int) and 0 <= ref < len(design):
+            reg[key] = design[ref]
+        else:
+            named = [part for part in design if part.get('name') == ref]
+            if len(named) == 0:
+                raise BadRequest('Regulation refers to unknown part: {}'.format(ref))
+            reg[key] = named[0]
+    return reg
+
+
+# Renderer reused by all requests handled by a worker process
+worker_state = {}
+
+
+def init_worker ():
+    """ Warm a worker process: import matplotlib, create the renderer and draw
+    a small design so that fonts and caches are loaded before the first request.
+    """
+    worker_state['renderer'] = dpl.quick_renderer(glyph_cache=dpl.GlyphCache())
+    render_design(dpl.load_design_from_quick('p.gray r.green c.orange.A t.purple'),
+                  None, 'png', 72)
+
+
+def render_design (design, regs, fmt, dpi):
+    """ Render a design (as for apps/quick.py, see render_quick_design) and 
+    return the file bytes.
+    """
+    if 'renderer' not in worker_state:
+        init_worker()
+    return dpl.render_quick_design(design, regs, fmt=fmt, dpi=dpi, 
+                                   metadata=deterministic_metadata.get(fmt), 
+                                   rc=deterministic_rc, renderer=worker_state['renderer'])
+
+
+class ThreadingWSGIServer (ThreadingMixIn, WSGIServer):
+    """ WSGI server handling each request in its own thread (renders still take
+    place in the worker processes).
+    """
+    daemon_threads = True
+
+
+class RenderApp:
+    """ WSGI application that renders designs using a pool of worker processes.
+    """
+
+    def __init__ (self, processes=None, cache=None, executor=None):
+        """ Constructor to start the worker processes.
+
+        Parameters
+        ----------
+        processes : int (default=None)
+            Number of worker processes (None for the number of CPUs).
+
+        cache : RenderCache (default=None)
+            Cache of rendered files. Cached designs are returned without using a
+            worker.
+
+        executor : concurrent.futures.Executor (default=None)
+            Executor to render with, rather than starting a process pool.
+        """
+        if executor == None:
+            if processes == None:
+                processes = multiprocessing.cpu_count()
+            executor = concurrent.futures.ProcessPoolExecutor(processes, initializer=init_worker)
+            # Workers are otherwise only started (and warmed) by the first requests
+            concurrent.futures.wait([executor.submit(int) for i in range(processes)])
+        self.executor = executor
+        self.cache = cache
+        self.lock = threading.Lock()
+        self.served = 0
+        self.errors = 0
+
+    def close (self):
+        """ Stop the worker processes.
+        """
+        self.executor.shutdown()
+
+    def read_fields (self, environ):
+        """ Return the fields of a request (query string, form or JSON body).
+        """
+        fields = dict((k, v[-1]) for k, v in parse_qs(environ.get('QUERY_STRING', '')).items())
+        try:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            raise BadRequest('Invalid Content-Length')
+        if length > max_request_bytes:
+            raise BadRequest('Request too large')
+        if length > 0:
+            body = environ['wsgi.input'].read(length)
+            content_type = environ.get('CONTENT_TYPE', '')
+            if content_type.startswith('application/json'):
+                try:
+                    data = json.loads(body.decode('utf-8'))
+                except ValueError:
+                    raise BadRequest('Body is not valid JSON')
+                if not isinstance(data, dict):
+                    raise BadRequest('JSON body must be an object')
+                fields.update(data)
+            else:
+                form = parse_qs(body.decode('utf-8'))
+                fields.update((k, v[-1]) for k, v in form.items())
+        return fields
+
+    def render (self, fields):
+        """ Render the design in the fields of a request and return the file bytes
+        and its format.
+        """
+        design, regs, fmt, dpi = parse_request(fields)
+        key = None
+        if self.cache != None:
+            key = dpl.design_key([design], [regs], fmt=fmt, dpi=dpi, helper='server')
+        if key != None:
+            data = self.cache.get(key, fmt)
+            if data != None:
+                return data, fmt
+        data = self.executor.submit(render_design, design, regs, fmt, dpi).result()
+        if key != None:
+            self.cache.put(key, fmt, data)
+        return data, fmt
+
+    def health (self):
+        """ Return the request counts and cache statistics (as JSON).
+        """
+        info = {'served': self.served, 'errors': self.errors}
+        if self.cache != None:
+            info['cache'] = self.cache.info()
+        return json.dumps(info).encode('utf-8')
+
+    def __call__ (self, environ, start_response):
+        path = environ.get('PATH_INFO', '/')
+        method = environ.get('REQUEST_METHOD', 'GET')
+        if path == '/health':
+            start_response('200 OK', [('Content-Type', 'application/json')])
+            return [self.health()]
+        if path != '/render':
+            start_response('404 Not Found', [('Content-Type', 'text/plain')])
+            return [b'Not found']
+        if method not in ('GET', 'POST'):
+            start_response('405 Method Not Allowed', [('Content-Type', 'text/plain')])
+            return [b'Method not allowed']
+        try:
+            data, fmt = self.render(self.read_fields(environ))
+        except BadRequest as error:
+            with self.lock:
+                self.errors += 1
+            start_response('400 Bad Request', [('Content-Type', 'text/plain')])
+            return [str(error).encode('utf-8')]
+        except Exception:
+            with self.lock:
+                self.errors += 1
+            # Details are logged (to the server's error stream), not sent to clients
+            errors = environ.get('wsgi.errors', sys.stderr)
+            errors.write('Render failed:\n' + traceback.format_exc())
+            errors.flush()
+            start_response('500 Internal Server Error', [('Content-Type', 'text/plain')])
+            return [b'Render failed']
+        with self.lock:
+            self.served += 1
+        start_response('200 OK', [('Content-Type', content_types[fmt]),
+                                  ('Content-Length', str(len(data)))])
+        return [data]
+
+
+def serve (host='127.0.0.1', port=8000, processes=None, cache_dir=None):
+    """ Run a render server until interrupted.
+    """
+    cache = None
+    if cache_dir != None:
+        cache = dpl.RenderCache(cache_dir)
+    app = RenderApp(processes=processes, cache=cache)
+    server = make_server(host, port, app, server_class=ThreadingWSGIServer)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        app.close()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="DNAplotlib render server")
+    parser.add_argument("-host", dest="host", default='127.0.0.1', help="address to listen on")
+    parser.add_argument("-port", dest="port", type=int, default=8000, help="port to listen on")
+    parser.add_argument("-processes", dest="processes", type=int, default=None,
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("-cache", dest="cache_dir", default=None,
+                        help="directory to cache rendered files in")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.processes, args.cache_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -66,8 +66,7 @@ dr.annotate(ax_dna, part_renderers, rbs3_f)
 plt.subplots_adjust(left=0.01, right=0.99, top=0.99, bottom=0.01)
 
 # Save the figure
-fig.savefig('annotate_design.pdf', transparent=True)
-fig.savefig('annotate_design.png', dpi=300)
+dpl.save_figure_formats(fig, [('annotate_design.pdf', {'transparent':True}), ('annotate_design.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
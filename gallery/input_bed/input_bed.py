@@ -44,8 +44,7 @@ ax_profile.axis('off')
 plt.subplots_adjust(hspace=0.001, left=0.01, right=0.99, top=0.99, bottom=0.01)
 
 # Save the figure
-fig.savefig('input_bed.pdf', transparent=True)
-fig.savefig('input_bed.png', dpi=300)
+dpl.save_figure_formats(fig, [('input_bed.pdf', {'transparent':True}), ('input_bed.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
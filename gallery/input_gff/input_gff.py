@@ -35,8 +35,7 @@ ax_dna.axis('off')
 plt.subplots_adjust(left=0.01, right=0.99, top=0.99, bottom=0.01)
 
 # Save the figure
-fig.savefig('input_gff.pdf', transparent=True)
-fig.savefig('input_gff.png', dpi=300)
+dpl.save_figure_formats(fig, [('input_gff.pdf', {'transparent':True}), ('input_gff.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
@@ -174,8 +174,7 @@ ax_dna.axis('off')
 plt.subplots_adjust(hspace=.08, left=.12, right=.99, top=0.99, bottom=0.02)
 
 # Save the figure
-fig.savefig('multiple_traces.pdf', transparent=True)
-fig.savefig('multiple_traces.png', dpi=300)
+dpl.save_figure_formats(fig, [('multiple_traces.pdf', {'transparent':True}), ('multiple_traces.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
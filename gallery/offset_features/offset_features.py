@@ -87,8 +87,7 @@ def plot_trace_3_axes (designs, output_prefix):
 
 	plt.subplots_adjust(hspace=.001, left=.01, right=.99, top=0.99, bottom=0.01)
 	# Save the figure
-	fig.savefig(output_prefix+'.pdf', transparent=True)
-	fig.savefig(output_prefix+'.png', dpi=300)
+	dpl.save_figure_formats(fig, [(output_prefix+'.pdf', {'transparent':True}), (output_prefix+'.png', {'dpi':300})])
 	# Clear the plotting cache
 	plt.close('all')
 
@@ -135,8 +134,7 @@ def plot_trace_y_offset (designs, output_prefix):
 
 	plt.subplots_adjust(hspace=.001, left=.01, right=.99, top=0.99, bottom=0.01)
 	# Save the figure
-	fig.savefig(output_prefix+'.pdf', transparent=True)
-	fig.savefig(output_prefix+'.png', dpi=300)
+	dpl.save_figure_formats(fig, [(output_prefix+'.pdf', {'transparent':True}), (output_prefix+'.png', {'dpi':300})])
 	# Clear the plotting cache
 	plt.close('all')
 
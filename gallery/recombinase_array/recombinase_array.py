@@ -334,8 +334,7 @@ ax_dna4.axis('off')
 plt.subplots_adjust(hspace=0.01, left=0.05, right=0.95, top=0.99, bottom=0.01)
 
 # Save the figure
-fig.savefig('recombinase_array.pdf', transparent=True)
-fig.savefig('recombinase_array.png', dpi=300)
+dpl.save_figure_formats(fig, [('recombinase_array.pdf', {'transparent':True}), ('recombinase_array.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
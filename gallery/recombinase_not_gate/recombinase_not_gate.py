@@ -274,8 +274,7 @@ ax_dna3.axis('off')
 plt.subplots_adjust(hspace=0.01, left=0.05, right=0.95, top=0.92, bottom=0.01)
 
 # Save the figure
-fig.savefig('recombinase_not_gate.pdf', transparent=True)
-fig.savefig('recombinase_not_gate.png', dpi=300)
+dpl.save_figure_formats(fig, [('recombinase_not_gate.pdf', {'transparent':True}), ('recombinase_not_gate.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
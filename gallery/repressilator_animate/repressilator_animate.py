@@ -147,8 +147,8 @@ def main():
 	plt.subplots_adjust(hspace=0.1, wspace=0.05, left=0.01, right=0.99, top=0.99, bottom=0.01)
 	
 	# Save the figure
-	plt.savefig('repressilator_fig.pdf', transparent=True)
-	plt.savefig('repressilator_fig.png', dpi=300)
+	dnaplotlib.save_figure_formats(plt.gcf(), [('repressilator_fig.pdf', {'transparent':True}), 
+	                                             ('repressilator_fig.png', {'dpi':300})])
 	
 if __name__ == '__main__':
 	main()
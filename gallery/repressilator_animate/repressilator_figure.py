@@ -76,10 +76,10 @@ def rescale(val, lims):
     new_val = (val*(lims[1]-lims[0])) + lims[0]
     return new_val
     
-def plot_construct(ax, t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma):
+def set_construct(t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma):
+	"""Set the colors of the CDSs and the regulation to their values at time t"""
 	tind = int(t*10)
 	exp_lims = (1.0, 4.0)
-	ax.set_title('t = {}'.format(t), fontsize=8)
 	# Set color for each of the CDSs
 	tetr['opts']['color'] = [rescale(1 - expression(ymtet[tind], exp_lims), (1.0, 1.0)),
 								rescale(1 - expression(ymtet[tind], exp_lims), (0.75, 1.0)),
@@ -101,34 +101,77 @@ def plot_construct(ax, t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma):
 	lac_repress['opts']['linewidth'] = rescale(repression(ylac[tind], 2.0, 8), (0.5, 2.0))						
 	gamma_repress['opts']['linewidth'] = rescale(repression(ygamma[tind], 2.0, 8), (0.5, 2.0))							
 	tet_repress['opts']['linewidth'] = rescale(repression(ytet[tind], 2.0, 8), (0.5, 2.0))
+
+def plot_construct(ax, t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma):
+	"""Draw the construct at time t and return its handles (see update_construct)"""
+	ax.set_title('t = {}'.format(t), fontsize=8)
+	set_construct(t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma)
+	handles = []
 	dnaplotlib.plot_sbol_designs([ax], [[plac, rbs1, tetr, term1, pgamma, rbs2, laci, term2, ptet, rbs3, gamma, term3]],
-				[[lac_repress, gamma_repress, tet_repress]])
+				[[lac_repress, gamma_repress, tet_repress]], handles=handles)
 	ax.set_ylim([-10, 31])
-	
+	return handles[0]
+
+def update_construct(handles, t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma):
+	"""Update a drawn construct to time t (without drawing it again) and return
+	the artists that changed"""
+	set_construct(t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma)
+	changed = []
+	for part in [tetr, laci, gamma]:
+		changed += handles.update_part(part['name'], color=part['opts']['color'])
+	for i, reg in enumerate([lac_repress, gamma_repress, tet_repress]):
+		color = reg['opts']['color']
+		changed += handles.update_reg(i, color=color[:3], alpha=color[3], linewidth=reg['opts']['linewidth'])
+	return changed
+
 def movie(ts, ymtet, ymlac, ymgamma, ytet, ylac, ygamma):
+	plt.close()
+	fig = plt.figure(figsize=(4, 3.5), dpi=300)
+	gs = gridspec.GridSpec(3, 1, height_ratios=[2, 0.5, 1])
+
+	# Traces (and current points) are filled in for each frame
+	ys = [ytet, ylac, ygamma]
+	colors = [[1.00, 0.75, 0.17], [0.38, 0.82, 0.32], [0.38, 0.65, 0.87]]
+	trace_ax = plt.subplot(gs[0])
+	lines = [plt.plot([], [], color=color)[0] for color in colors]
+	plt.xlim([0, 30])
+	plt.ylim([1,4])
+	trace_ax.tick_params(axis='both', labelsize=8, width=0.8, length=3)
+	trace_ax.yaxis.tick_left()
+	trace_ax.xaxis.tick_bottom()
+	trace_ax.set_xlabel('Time', fontsize=8, labelpad=3)
+	trace_ax.set_ylabel('Protein Concentration', fontsize=8, labelpad=4)
+	plt.legend(['tetR', 'lacI', 'gamma'], frameon=False, fontsize=8, labelspacing=0.15, loc=(0.03,0.65))
+	points = [plt.plot([], [], '.', color=color, markersize=6.0)[0] for color in colors]
+	ax = plt.subplot(gs[2])
+	handles = plot_construct(ax, ts[0], ymtet, ymlac, ymgamma, ytet, ylac, ygamma)
+
+	def update(t):
+		"""Update the figure to time t and return the artists that changed"""
+		tind = int(t*10)
+		ax.set_title('t = {}'.format(t), fontsize=8)
+		for y, line, point in zip(ys, lines, points):
+			line.set_data(ts[:tind+1], y[:tind+1])
+			point.set_data([ts[tind]], [y[tind]])
+		return [ax.title] + lines + points + update_construct(handles, t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma)
+
+	# Draw everything that doesn't change once, then blit the changed artists
+	# (and the spines drawn over the traces) on to it for each frame, in the 
+	# order matplotlib draws them (by zorder, then in the order added)
+	children = trace_ax.get_children() + ax.get_children()
+	order = dict((id(a), i) for i, a in enumerate(children))
+	changed = update(ts[0]) + list(trace_ax.spines.values())
+	changed.sort(key=lambda a: (a.get_zorder(), order[id(a)]))
+	for a in changed:
+		a.set_animated(True)
+	fig.canvas.draw()
+	background = fig.canvas.copy_from_bbox(fig.bbox)
 	for t in ts:
-		plt.close()
-		plt.figure(figsize=(4, 3.5))
-		gs = gridspec.GridSpec(3, 1, height_ratios=[2, 0.5, 1])
-
-		ax = plt.subplot(gs[0])
-		plt.plot(ts[:int(t*10)+1], ytet[:int(t*10)+1], color=[1.00, 0.75, 0.17])
-		plt.plot(ts[:int(t*10)+1], ylac[:int(t*10)+1], color=[0.38, 0.82, 0.32])
-		plt.plot(ts[:int(t*10)+1], ygamma[:int(t*10)+1], color=[0.38, 0.65, 0.87])
-		plt.xlim([0, 30])
-		plt.ylim([1,4])
-		ax.tick_params(axis='both', labelsize=8, width=0.8, length=3)
-		ax.yaxis.tick_left()
-		ax.xaxis.tick_bottom()
-		ax.set_xlabel('Time', fontsize=8, labelpad=3)
-		ax.set_ylabel('Protein Concentration', fontsize=8, labelpad=4)
-		plt.legend(['tetR', 'lacI', 'gamma'], frameon=False, fontsize=8, labelspacing=0.15, loc=(0.03,0.65))
-		plt.plot(ts[int(t*10)], ytet[int(t*10)], '.', color=[1.00, 0.75, 0.17], markersize=6.0)
-		plt.plot(ts[int(t*10)], ylac[int(t*10)], '.', color=[0.38, 0.82, 0.32], markersize=6.0)
-		plt.plot(ts[int(t*10)], ygamma[int(t*10)], '.', color=[0.38, 0.65, 0.87], markersize=6.0)
-		ax = plt.subplot(gs[2])
-		plot_construct(ax, t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma)
-		plt.savefig("repressilator_t{}.jpg".format(t), dpi=300)
+		update(t)
+		fig.canvas.restore_region(background)
+		for a in changed:
+			fig.draw_artist(a)
+		plt.imsave("repressilator_t{}.jpg".format(t), np.asarray(fig.canvas.buffer_rgba()))
 	
 def main():
 	t = np.arange(0, 30.1, 0.1)
@@ -177,8 +220,8 @@ def main():
 	plt.subplots_adjust(hspace=0.4, left=0.12, right=0.95, top=0.99, bottom=0.01)
 	
 	# Save the figure
-	plt.savefig('repressilator_animate.pdf', transparent=True)
-	plt.savefig('repressilator_animate.png', dpi=300)
+	dnaplotlib.save_figure_formats(plt.gcf(), [('repressilator_animate.pdf', {'transparent':True}), 
+	                                             ('repressilator_animate.png', {'dpi':300})])
 	
 	# Generate the movie frames
 	movie(t, ymtet, ymlac, ymgamma, ytet, ylac, ygamma)
@@ -196,8 +196,7 @@ ax_data.set_xlim([start, end])
 plt.subplots_adjust(hspace=.04, wspace=.04, left=.01, right=.99, top=0.99, bottom=0.01)
 
 # Save the figure
-fig.savefig('rotated_design.pdf', transparent=True)
-fig.savefig('rotated_design.png', dpi=300)
+dpl.save_figure_formats(fig, [('rotated_design.pdf', {'transparent':True}), ('rotated_design.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
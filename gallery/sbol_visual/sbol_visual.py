@@ -39,8 +39,7 @@ ax.set_yticks([])
 ax.axis("off")
 
 # Save the figure
-fig.savefig("sbol_visual.pdf", transparent=True)
-fig.savefig("sbol_visual.png", dpi=300)
+dpl.save_figure_formats(fig, [("sbol_visual.pdf", {'transparent':True}), ("sbol_visual.png", {'dpi':300})])
 
 # Clear the plotting cache
 # plt.close('all')
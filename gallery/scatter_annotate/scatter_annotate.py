@@ -139,8 +139,7 @@ ax_dna3.axis('off')
 plt.subplots_adjust(hspace=0.01, left=0.13, right=0.95, top=0.93, bottom=0.13)
 
 # Save the figure
-fig.savefig('scatter_annotate.pdf', transparent=True)
-fig.savefig('scatter_annotate.png', dpi=300)
+dpl.save_figure_formats(fig, [('scatter_annotate.pdf', {'transparent':True}), ('scatter_annotate.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
@@ -139,8 +139,7 @@ ax_dna.axis('off')
 plt.subplots_adjust(left=0.01, right=0.99, top=0.99, bottom=0.01)
 
 # Save the figure
-fig.savefig('sequence_features.pdf', transparent=True)
-fig.savefig('sequence_features.png', dpi=300)
+dpl.save_figure_formats(fig, [('sequence_features.pdf', {'transparent':True}), ('sequence_features.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
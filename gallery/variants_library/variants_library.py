@@ -214,7 +214,7 @@ def plot_dna (dna_designs, dna_design_order, out_filename, plot_params, perf_dat
 
 	# Save the figure
 	plt.subplots_adjust(hspace=0.001, wspace=0.05, top=0.99, bottom=0.01, left=0.06, right=0.99)
-	fig.savefig(out_filename, transparent=True, dpi=300)
+	dpl.save_figure(fig, out_filename, transparent=True, dpi=300)
 	
 	# Clear the plotting cache
 	plt.close('all')
@@ -174,8 +174,7 @@ ax_dna4.set_yticks([])
 ax_dna4.axis('off')
 
 # Save the figure
-fig.savefig('xnor_truthtable.pdf', transparent=True)
-fig.savefig('xnor_truthtable.png', dpi=300)
+dpl.save_figure_formats(fig, [('xnor_truthtable.pdf', {'transparent':True}), ('xnor_truthtable.png', {'dpi':300})])
 
 # Clear the plotting cache
 plt.close('all')
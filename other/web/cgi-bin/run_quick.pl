@@ -2,13 +2,29 @@
 
 use Getopt::Long;
 use CGI qw/param/;
+use LWP::UserAgent;
 
-my $HOME = "/Users/peng";
+# Render server started with: python -m dnaplotlib.server -port 8000
+my $SERVER = $ENV{'DNAPLOTLIB_SERVER'} || "http://127.0.0.1:8000";
 
 my $in_text = param ('in_text');
 my $out_pdf = param ('out_pdf');
+$out_pdf =~ s/[^A-Za-z0-9_.-]/_/g;
 
-my $result = qx{$HOME/anaconda/bin/python $HOME/MIT-BroadFoundry/dnaplotlib/quick.py -input '$in_text' -output ../results/$out_pdf};
-
+my $ua = LWP::UserAgent->new;
+my $response = $ua->post("$SERVER/render", {spec => $in_text, format => 'pdf'});
 
+if ($response->is_success) {
+	open (my $out, '>', "../results/$out_pdf") or die "Cannot write ../results/$out_pdf: $!";
+	binmode $out;
+	print $out $response->content;
+	close $out;
+	print "Content-Type: text/plain\n\n";
+	print "OK\n";
+} else {
+	print STDERR "run_quick.pl: render failed: ", $response->status_line, "\n", $response->decoded_content, "\n";
+	print "Status: 502 Bad Gateway\n";
+	print "Content-Type: text/plain\n\n";
+	print "Rendering failed\n";
+}
 